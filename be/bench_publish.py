@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+End-to-end publish benchmark against mock_platform_server.py.
+
+Drives publish_to_platform_task or cross_post_article at a configurable
+concurrency and reports throughput plus p50/p95/p99 latency per platform.
+
+Usage:
+    # 1. Start the stand-in platforms
+    python mock_platform_server.py --port 9000 --latency-ms 150
+
+    # 2. Point the backend at them and run a benchmark
+    export DEVTO_API_BASE_URL=http://localhost:9000/devto/api
+    export HASHNODE_API_BASE_URL=http://localhost:9000/hashnode
+    python bench_publish.py --mode task --platforms dev.to hashnode --requests 200 --concurrency 20
+    python bench_publish.py --mode cross-post --requests 50 --concurrency 10
+
+Modes:
+    task        run publish_to_platform_task in-process (eagerly) from a thread pool;
+                add --shared-loop to run them the way the asyncio worker profile does
+    celery      dispatch publish_to_platform_task through the broker and wait for
+                results (needs a worker started with the same base URL variables)
+    cross-post  run posting_service.cross_post_article on one event loop
+
+Set RATE_LIMIT_ENABLED=false / CIRCUIT_BREAKER_ENABLED=false to measure the
+raw pipeline without the shared limiter and breaker.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import database
+import models
+from services import http_client
+
+BENCH_EMAIL = "bench@example.com"
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def ensure_mock_targets(allow_real):
+    """Refuse to benchmark against the real platforms unless explicitly allowed"""
+    real = [url for url in http_client.PLATFORM_BASE_URLS.values() if "localhost" not in url and "127.0.0.1" not in url]
+    if real and not allow_real:
+        print(f"❌ Platform base URLs point at real hosts: {real}")
+        print("   Set DEVTO_API_BASE_URL / HASHNODE_API_BASE_URL to the mock server, or pass --allow-real-platforms")
+        sys.exit(1)
+
+
+def setup_fixtures(post_count):
+    """Create the benchmark user, mock credentials and one fresh post per request"""
+    models.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+    try:
+        user = db.query(models.User).filter(models.User.email == BENCH_EMAIL).first()
+        if not user:
+            user = models.User(email=BENCH_EMAIL, hashed_password="!benchmark-user-no-login")
+            db.add(user)
+            db.commit()
+
+        for platform, fields in {
+            "dev.to": {"api_key": "bench-devto-key"},
+            "hashnode": {"api_key": "bench-hashnode-key", "publication_id": "mock-publication"},
+            "medium": {"access_token": "bench-medium-token", "platform_user_id": "bench-medium-user"},
+        }.items():
+            cred = db.query(models.PlatformCredential).filter_by(user_id=user.id, platform_name=platform).first()
+            if not cred:
+                cred = models.PlatformCredential(user_id=user.id, platform_name=platform)
+                db.add(cred)
+            for key, value in fields.items():
+                setattr(cred, key, value)
+
+        run_id = uuid.uuid4().hex[:8]
+        posts = [
+            models.Post(
+                title=f"Benchmark post {run_id}-{i}",
+                content_markdown=f"# Benchmark {run_id}-{i}\n\n" + "Lorem ipsum dolor sit amet. " * 40,
+                author_id=user.id,
+            )
+            for i in range(post_count)
+        ]
+        db.add_all(posts)
+        db.commit()
+        return user.id, [post.id for post in posts]
+    finally:
+        db.close()
+
+
+def run_tasks(args, user_id, post_ids):
+    """Run publish_to_platform_task for every (post, platform) pair"""
+    from tasks import publish_to_platform_task
+    from routers.posts import get_canonical_url
+
+    if args.mode == "task":
+        from celery_utils import celery_app
+        celery_app.conf.task_always_eager = True
+        if args.shared_loop:
+            http_client.enable_shared_loop(args.concurrency)
+
+    jobs = [(post_id, platform) for post_id in post_ids for platform in args.platforms]
+
+    def run_one(job):
+        post_id, platform = job
+        started = time.perf_counter()
+        canonical_url = get_canonical_url(post_id, platform)
+        try:
+            if args.mode == "task":
+                result = publish_to_platform_task.apply(args=(user_id, post_id, platform, canonical_url)).result
+            else:
+                result = publish_to_platform_task.delay(user_id, post_id, platform, canonical_url).get(timeout=args.timeout)
+            ok = isinstance(result, dict) and result.get("status") == "success"
+        except Exception as e:
+            result, ok = str(e), False
+        return platform, ok, (time.perf_counter() - started) * 1000
+
+    samples = []
+    wall_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for sample in pool.map(run_one, jobs):
+            samples.append(sample)
+    return samples, time.perf_counter() - wall_started
+
+
+def run_cross_post(args, user_id, post_ids):
+    """Run cross_post_article once per post, args.concurrency at a time"""
+    from services import posting_service
+
+    async def main():
+        semaphore = asyncio.Semaphore(args.concurrency)
+        samples = []
+
+        async def run_one(post_id):
+            async with semaphore:
+                db = database.SessionLocal()
+                try:
+                    post = db.get(models.Post, post_id)
+                    started = time.perf_counter()
+                    results = await posting_service.cross_post_article(
+                        db, user_id, post.title, post.content_markdown, concurrent=not args.sequential
+                    )
+                    total_ms = (time.perf_counter() - started) * 1000
+                finally:
+                    db.close()
+            for platform, result in results.items():
+                samples.append((platform, result.get("success", False), result.get("elapsed_ms", 0.0)))
+            samples.append(("cross_post_article", all(r.get("success") for r in results.values()), total_ms))
+
+        wall_started = time.perf_counter()
+        await asyncio.gather(*(run_one(post_id) for post_id in post_ids))
+        wall = time.perf_counter() - wall_started
+        await http_client.aclose_all()
+        return samples, wall
+
+    return asyncio.run(main())
+
+
+def report(samples, wall_seconds, as_json=False):
+    by_platform = defaultdict(list)
+    for platform, ok, latency_ms in samples:
+        by_platform[platform].append((ok, latency_ms))
+
+    rows = []
+    for platform, entries in sorted(by_platform.items()):
+        latencies = sorted(latency for _, latency in entries)
+        rows.append({
+            "platform": platform,
+            "requests": len(entries),
+            "ok": sum(1 for ok, _ in entries if ok),
+            "errors": sum(1 for ok, _ in entries if not ok),
+            "throughput_per_s": round(len(entries) / wall_seconds, 2) if wall_seconds else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+        })
+
+    if as_json:
+        print(json.dumps({"wall_seconds": round(wall_seconds, 3), "platforms": rows}, indent=2))
+        return
+
+    print(f"\n⏱️  Wall time: {wall_seconds:.2f}s")
+    header = f"{'platform':<20}{'requests':>9}{'ok':>7}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['platform']:<20}{row['requests']:>9}{row['ok']:>7}{row['errors']:>8}"
+              f"{row['throughput_per_s']:>9}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the publish pipeline against the mock platform server")
+    parser.add_argument("--mode", choices=["task", "celery", "cross-post"], default="task")
+    parser.add_argument("--platforms", nargs="+", default=["dev.to", "hashnode"], help="Platforms for task/celery modes")
+    parser.add_argument("--requests", type=int, default=100, help="Posts to publish")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--shared-loop", action="store_true", help="task mode: one shared event loop, as in the asyncio worker profile")
+    parser.add_argument("--sequential", action="store_true", help="cross-post mode: use the sequential fan-out")
+    parser.add_argument("--timeout", type=float, default=120, help="celery mode: seconds to wait per result")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--allow-real-platforms", action="store_true")
+    args = parser.parse_args()
+
+    ensure_mock_targets(args.allow_real_platforms)
+    user_id, post_ids = setup_fixtures(args.requests)
+    print(f"🚀 {args.mode}: {len(post_ids)} posts, concurrency {args.concurrency}")
+
+    if args.mode == "cross-post":
+        samples, wall = run_cross_post(args, user_id, post_ids)
+    else:
+        samples, wall = run_tasks(args, user_id, post_ids)
+        http_client.close_sync_loops()
+    report(samples, wall, as_json=args.json)
+
+
+if __name__ == "__main__":
+    main()
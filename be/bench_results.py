@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Result backend memory benchmark for publish task results.
+
+Builds the results publish_to_platform_task stores for a dev.to and a
+Hashnode publish, in the compact and the full (TASK_RESULT_FORMAT=full)
+format, and measures what one result costs in the result backend. The
+platform responses mirror the real APIs: dev.to echoes the whole article
+(markdown and HTML), Hashnode returns both GraphQL payloads.
+
+Usage:
+    python bench_results.py                              # encoded size per result
+    python bench_results.py --content-kb 40 --per-hour 20000
+    python bench_results.py --redis redis://localhost:6379/15 --results 2000
+
+With --redis, that many results of each kind are written to the given
+database with the Celery backend, and Redis' own accounting (MEMORY USAGE
+per key, used_memory before/after) is reported. The keys are deleted
+afterwards; use a scratch database.
+"""
+import argparse
+import json
+import os
+import sys
+import uuid
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from celery import states
+from celery_utils import celery_app, CELERY_RESULT_EXPIRES
+import tasks
+
+BENCH_KEY_PREFIX = "bench-result-"
+
+
+def sample_responses(content_kb):
+    """(platform, api_response, post_data) as returned by tasks._send_to_platform"""
+    markdown = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20 + "\n\n") * max(1, int(content_kb * 1024 / 1160))
+    html = "".join(f"<p>{paragraph}</p>\n" for paragraph in markdown.split("\n\n") if paragraph)
+    devto = {
+        "type_of": "article", "id": 1843271, "title": "Benchmark post", "description": markdown[:140],
+        "readable_publish_date": "May 1", "slug": "benchmark-post-4h2k", "path": "/bench/benchmark-post-4h2k",
+        "url": "https://dev.to/bench/benchmark-post-4h2k", "comments_count": 0, "public_reactions_count": 0,
+        "published_timestamp": "2024-05-01T12:00:00Z", "canonical_url": "https://example.com/blog/1",
+        "tag_list": "python, webdev", "tags": ["python", "webdev"], "body_html": html, "body_markdown": markdown,
+        "user": {"name": "Bench", "username": "bench", "twitter_username": None, "github_username": "bench",
+                 "profile_image": "https://media.dev.to/profile/bench.png"},
+    }
+    draft = {"draft": {"id": "6632f0c4e1a9b2d3f4a5b6c7", "slug": "benchmark-post", "title": "Benchmark post"}}
+    published = {"post": {"id": "6632f0c9e1a9b2d3f4a5b6c8", "slug": "benchmark-post", "title": "Benchmark post",
+                          "url": "https://bench.hashnode.dev/benchmark-post", "publishedAt": "2024-05-01T12:00:00.000Z"}}
+    hashnode = {
+        "success": True, "post_id": published["post"]["id"], "post_url": published["post"]["url"],
+        "draft_id": draft["draft"]["id"], "resumed_from_draft": False,
+        "full_response": {"createDraft": draft, "publishDraft": published},
+    }
+    return [
+        ("dev.to", devto, devto),
+        ("hashnode", hashnode, {"id": hashnode["post_id"], "url": hashnode["post_url"]}),
+    ]
+
+
+def build_result(result_format, platform_name, api_response, post_data):
+    """The success result publish_to_platform_task returns in the given format"""
+    tasks.TASK_RESULT_FORMAT = result_format
+    return tasks._platform_result(
+        "success", platform_name, 1, elapsed=0.4213,
+        post_url=post_data.get("url"), platform_post_id=post_data.get("id"), api_response=api_response
+    )
+
+
+def encoded_size(result):
+    """Bytes the result backend writes for one task result (meta with status, result, date_done...)"""
+    backend = celery_app.backend
+    meta = backend._get_result_meta(result, states.SUCCESS, None, None)
+    meta["task_id"] = str(uuid.uuid4())
+    return len(backend.encode(meta))
+
+
+def measure_redis(redis_url, samples, count):
+    """Store count results per sample with the Celery backend and read Redis' memory accounting"""
+    import redis
+
+    client = redis.Redis.from_url(redis_url)
+    celery_app.conf.result_backend = redis_url
+    backend = celery_app.backend
+    rows = {}
+    try:
+        for (result_format, platform_name), result in samples.items():
+            before = client.info("memory")["used_memory"]
+            task_ids = [f"{BENCH_KEY_PREFIX}{uuid.uuid4()}" for _ in range(count)]
+            for task_id in task_ids:
+                backend.store_result(task_id, result, states.SUCCESS)
+            after = client.info("memory")["used_memory"]
+            keys = [backend.get_key_for_task(task_id) for task_id in task_ids[:50]]
+            usage = [client.memory_usage(key) or 0 for key in keys]
+            rows[(result_format, platform_name)] = {
+                "memory_usage_per_key": round(sum(usage) / len(usage)),
+                "used_memory_delta_per_result": round((after - before) / count),
+            }
+            client.delete(*[backend.get_key_for_task(task_id) for task_id in task_ids])
+    finally:
+        for key in client.scan_iter(f"celery-task-meta-{BENCH_KEY_PREFIX}*"):
+            client.delete(key)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure result backend memory per publish task result")
+    parser.add_argument("--content-kb", type=float, default=8, help="Size of the article body")
+    parser.add_argument("--per-hour", type=int, default=10000, help="Publish results per hour, for the projection")
+    parser.add_argument("--redis", help="Redis URL (scratch database) to measure real memory use")
+    parser.add_argument("--results", type=int, default=1000, help="--redis: results stored per format and platform")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    samples = {}
+    for platform_name, api_response, post_data in sample_responses(args.content_kb):
+        for result_format in ("compact", "full"):
+            samples[(result_format, platform_name)] = build_result(result_format, platform_name, api_response, post_data)
+
+    # Results live for result_expires, so the steady state holds per_hour * expires/3600 of them
+    resident = args.per_hour * CELERY_RESULT_EXPIRES / 3600
+    redis_rows = measure_redis(args.redis, samples, args.results) if args.redis else {}
+    rows = []
+    for (result_format, platform_name), result in samples.items():
+        size = encoded_size(result)
+        row = {
+            "format": result_format,
+            "platform": platform_name,
+            "encoded_bytes": size,
+            "resident_mb": round(size * resident / 1024 / 1024, 1),
+        }
+        row.update(redis_rows.get((result_format, platform_name), {}))
+        rows.append(row)
+
+    if args.json:
+        print(json.dumps({"content_kb": args.content_kb, "resident_results": int(resident), "results": rows}, indent=2))
+        return
+
+    print(f"\n📦 {args.content_kb:g} KB articles, {args.per_hour}/h kept {CELERY_RESULT_EXPIRES}s "
+          f"-> ~{int(resident)} results resident")
+    header = f"{'format':<10}{'platform':<12}{'bytes/result':>14}{'resident MB':>13}"
+    if redis_rows:
+        header += f"{'MEMORY USAGE':>14}{'used_memory Δ':>15}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        line = f"{row['format']:<10}{row['platform']:<12}{row['encoded_bytes']:>14}{row['resident_mb']:>13}"
+        if redis_rows:
+            line += f"{row['memory_usage_per_key']:>14}{row['used_memory_delta_per_result']:>15}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
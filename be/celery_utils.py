@@ -1,11 +1,198 @@
 # backend/celery_utils.py
 import os
 from celery import Celery
+from kombu import Queue
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
+from celery.worker.control import inspect_command
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Worker profiles, picked with CELERY_WORKER_PROFILE:
+#   dev      solo pool, one task at a time (default; works on Windows)
+#   io       thread pool with high concurrency; each thread runs its own event loop
+#   asyncio  thread pool whose tasks all run their platform calls on one shared
+#            event loop per process, at most PUBLISH_MAX_IN_FLIGHT concurrently
+#   prefork  process pool with autoscaling and recycled children (Linux)
+WORKER_PROFILES = {
+    'dev': {
+        'pool': 'solo',
+        'concurrency': 1,
+        'prefetch_multiplier': 1,
+        'acks_late': True,
+        'max_tasks_per_child': None,
+    },
+    'io': {
+        'pool': 'threads',
+        'concurrency': 32,
+        'prefetch_multiplier': 4,
+        'acks_late': True,
+        'max_tasks_per_child': None,  # threads can't be recycled
+    },
+    'asyncio': {
+        'pool': 'threads',
+        # Threads only block waiting on the shared loop, so they are cheap;
+        # one per allowed in-flight publish keeps the loop saturated
+        'concurrency': None,  # PUBLISH_MAX_IN_FLIGHT
+        'prefetch_multiplier': 2,
+        'acks_late': True,
+        'max_tasks_per_child': None,
+    },
+    'prefork': {
+        'pool': 'prefork',
+        'concurrency': os.cpu_count() or 2,
+        'autoscale': f"{(os.cpu_count() or 2) * 4},{os.cpu_count() or 2}",
+        'prefetch_multiplier': 1,
+        'acks_late': True,
+        'max_tasks_per_child': 500,
+    },
+}
+PROFILE_ALIASES = {'solo': 'dev', 'threads': 'io'}
+
+PUBLISH_MAX_IN_FLIGHT = int(os.getenv('PUBLISH_MAX_IN_FLIGHT', '100'))
+
+
+def get_worker_profile(name: str = None) -> dict:
+    """
+    Resolve a worker profile, applying environment overrides
+
+    Args:
+        name: Profile name (defaults to CELERY_WORKER_PROFILE, then 'dev')
+
+    Returns:
+        dict: pool, concurrency, autoscale, prefetch_multiplier, acks_late, max_tasks_per_child
+    """
+    name = (name or os.getenv('CELERY_WORKER_PROFILE', 'dev')).lower()
+    name = PROFILE_ALIASES.get(name, name)
+    if name not in WORKER_PROFILES:
+        print(f"⚠️ Unknown worker profile '{name}', using dev")
+        name = 'dev'
+
+    profile = {'name': name, 'autoscale': None, **WORKER_PROFILES[name]}
+    if name == 'asyncio':
+        profile['concurrency'] = PUBLISH_MAX_IN_FLIGHT
+
+    if os.getenv('CELERY_WORKER_CONCURRENCY') and name != 'dev':
+        profile['concurrency'] = int(os.getenv('CELERY_WORKER_CONCURRENCY'))
+    if os.getenv('CELERY_AUTOSCALE') and name == 'prefork':
+        profile['autoscale'] = os.getenv('CELERY_AUTOSCALE')  # "max,min"
+    if os.getenv('CELERY_PREFETCH_MULTIPLIER'):
+        profile['prefetch_multiplier'] = int(os.getenv('CELERY_PREFETCH_MULTIPLIER'))
+    if os.getenv('CELERY_ACKS_LATE'):
+        profile['acks_late'] = os.getenv('CELERY_ACKS_LATE').lower() in ('1', 'true', 'yes')
+    if os.getenv('CELERY_MAX_TASKS_PER_CHILD') and name == 'prefork':
+        profile['max_tasks_per_child'] = int(os.getenv('CELERY_MAX_TASKS_PER_CHILD'))
+    return profile
+
+
+def worker_cli_options(profile: dict) -> list:
+    """Worker command-line options for a profile (autoscale has no config setting)"""
+    options = ['-P', profile['pool']]
+    if profile['autoscale']:
+        options.append(f"--autoscale={profile['autoscale']}")
+    else:
+        options.extend(['-c', str(profile['concurrency'])])
+    return options
+
+
+WORKER_PROFILE = get_worker_profile()
+
+# Queues: every platform gets its own, so a backlog of slow Hashnode publishes
+# doesn't hold up dev.to. Batch publishes (all platforms of a post) share one.
+# With CELERY_PRIORITY_LANES, publishes sent with apply_async(lane='bulk')
+# go to a parallel '.bulk' queue so interactive publishes never wait behind them.
+DEFAULT_QUEUE = 'celery'
+POSTS_QUEUE = 'publish.posts'
+PLATFORM_QUEUES = {
+    'dev.to': 'publish.devto',
+    'hashnode': 'publish.hashnode',
+    'medium': 'publish.medium',
+}
+BULK_LANE = 'bulk'
+# How often beat runs the sweeper that dispatches publishes whose scheduled retry is due
+RETRY_SWEEP_INTERVAL = float(os.getenv('RETRY_SWEEP_INTERVAL', '15'))
+# ...and the dispatcher that sends scheduled publishes (publish_at) once they are due
+PUBLISH_SCHEDULE_INTERVAL = float(os.getenv('PUBLISH_SCHEDULE_INTERVAL', '15'))
+CELERY_PRIORITY_LANES = os.getenv('CELERY_PRIORITY_LANES', 'false').lower() in ('1', 'true', 'yes')
+
+# Task results: 'compact' keeps status, platform, ids, URL and timing; 'full' also keeps
+# the platform's API response (both GraphQL payloads for Hashnode) in the result backend
+TASK_RESULT_FORMAT = os.getenv('TASK_RESULT_FORMAT', 'compact').lower()
+# Keep full API responses in published_posts.platform_response instead
+STORE_PLATFORM_RESPONSES = os.getenv('STORE_PLATFORM_RESPONSES', 'false').lower() in ('1', 'true', 'yes')
+CELERY_RESULT_EXPIRES = int(os.getenv('CELERY_RESULT_EXPIRES', '3600'))
+
+# Where publishes run: 'celery' (broker and workers) or 'local', the API process's own
+# bounded executor (services/local_executor.py) for small deployments without Redis
+PUBLISH_EXECUTOR = os.getenv('PUBLISH_EXECUTOR', 'celery').lower()
+
+
+def lane_queue(queue: str, lane: str = None) -> str:
+    """Queue name for a lane ('bulk' or the default interactive lane)"""
+    if lane == BULK_LANE and CELERY_PRIORITY_LANES:
+        return f"{queue}.{BULK_LANE}"
+    return queue
+
+
+def all_queues() -> list:
+    publish_queues = [POSTS_QUEUE, *PLATFORM_QUEUES.values()]
+    if CELERY_PRIORITY_LANES:
+        publish_queues += [lane_queue(queue, BULK_LANE) for queue in publish_queues]
+    return [DEFAULT_QUEUE, *publish_queues]
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Celery router: per-platform queues for publishes, the default queue for everything else
+
+    The lane comes from apply_async(lane='bulk'); retries stay on the queue they came from.
+    """
+    lane = options.get('lane')
+    if name == 'tasks.publish_to_platform_task':
+        platform_name = (kwargs or {}).get('platform_name') or (args[2] if args and len(args) > 2 else None)
+        return {'queue': lane_queue(PLATFORM_QUEUES.get(platform_name, POSTS_QUEUE), lane)}
+    if name == 'tasks.publish_post_task':
+        return {'queue': lane_queue(POSTS_QUEUE, lane)}
+    return {'queue': DEFAULT_QUEUE}
+
+
+def lane_of(request) -> str:
+    """Lane a running task was delivered on, so work it spawns can stay in that lane"""
+    routing_key = (request.delivery_info or {}).get('routing_key') or ''
+    return BULK_LANE if routing_key.endswith(f".{BULK_LANE}") else None
+
+
+def resolve_queues(names: list, lane: str = None) -> list:
+    """
+    Expand worker queue selections into queue names
+
+    Args:
+        names: Platform names ('dev.to'), 'posts', 'default' or literal queue names
+        lane: 'interactive' or 'bulk' to consume only that lane; both when None
+
+    Returns:
+        list: Queue names for `celery worker -Q`
+    """
+    queues = []
+    for name in names:
+        if name in PLATFORM_QUEUES:
+            base = [PLATFORM_QUEUES[name]]
+        elif name == 'posts':
+            base = [POSTS_QUEUE]
+        elif name == 'default':
+            queues.append(DEFAULT_QUEUE)
+            continue
+        else:
+            queues.append(name)
+            continue
+        for queue in base:
+            if lane != BULK_LANE:
+                queues.append(queue)
+            if lane != 'interactive' and CELERY_PRIORITY_LANES:
+                queues.append(lane_queue(queue, BULK_LANE))
+    return list(dict.fromkeys(queues))
+
 def create_celery_app():
     """
     Create and configure Celery app with proper auto-discovery
@@ -34,26 +221,39 @@ def create_celery_app():
         task_time_limit=30 * 60,  # 30 minutes
         task_soft_time_limit=25 * 60,  # 25 minutes
         
-        # Windows and Python 3.13 compatibility settings
-        worker_pool='solo',  # Use solo pool instead of prefork for better Windows compatibility
-        worker_concurrency=1,  # Single process for solo pool
-        worker_prefetch_multiplier=1,
-        task_acks_late=True,
+        # Pool, prefetch and ack behaviour come from the worker profile
+        worker_pool=WORKER_PROFILE['pool'],
+        worker_concurrency=WORKER_PROFILE['concurrency'],
+        worker_prefetch_multiplier=WORKER_PROFILE['prefetch_multiplier'],
+        worker_max_tasks_per_child=WORKER_PROFILE['max_tasks_per_child'],
+        task_acks_late=WORKER_PROFILE['acks_late'],
         worker_hijack_root_logger=False,
         worker_log_color=True,
         
         # Simplified auto-discovery
         include=['tasks'],
         
-        # Task routing
-        task_routes={
-            'tasks.*': {'queue': 'celery'},
+        # Task routing; a worker started without -Q consumes every queue
+        task_default_queue=DEFAULT_QUEUE,
+        task_queues=[Queue(name, routing_key=name) for name in all_queues()],
+        task_routes=(route_task,),
+
+        # Periodic tasks (run `celery beat`, or start_worker.py embeds it)
+        beat_schedule={
+            'sweep-due-publish-retries': {
+                'task': 'tasks.sweep_due_retries_task',
+                'schedule': RETRY_SWEEP_INTERVAL,
+            },
+            'dispatch-scheduled-publishes': {
+                'task': 'tasks.dispatch_scheduled_publishes_task',
+                'schedule': PUBLISH_SCHEDULE_INTERVAL,
+            },
         },
         
         # Additional worker settings for stability
         worker_disable_rate_limits=True,
         task_ignore_result=False,
-        result_expires=3600,  # 1 hour
+        result_expires=CELERY_RESULT_EXPIRES,  # 1 hour by default
         
         # Python 3.13 compatibility
         worker_send_task_events=True,
@@ -65,6 +265,43 @@ def create_celery_app():
     
     return celery_app
 
+@worker_init.connect
+def _configure_worker_profile(**kwargs):
+    print(f"⚙️ Worker profile '{WORKER_PROFILE['name']}': {WORKER_PROFILE['pool']} pool, "
+          f"{WORKER_PROFILE['autoscale'] or WORKER_PROFILE['concurrency']} concurrency")
+    # asyncio profile: every task's platform calls go to one shared event loop
+    if WORKER_PROFILE['name'] == 'asyncio':
+        from services import http_client
+        http_client.enable_shared_loop(PUBLISH_MAX_IN_FLIGHT)
+        print(f"🔁 Shared event loop, {PUBLISH_MAX_IN_FLIGHT} publishes in flight max")
+    # Workers take their database connections from the worker pool profile, not the API's
+    import database
+    # Every thread of a thread pool may be in a database phase at once; prefork children run one task each
+    threads = WORKER_PROFILE['concurrency'] if WORKER_PROFILE['pool'] == 'threads' else 1
+    database.configure_pool_role(os.getenv('DB_POOL_ROLE') or 'worker', threads=threads)
+    print(f"🗄️ Database pool: {database.DB_POOL_ROLE} profile, {database.DB_POOL_MODE} mode")
+
+# Pooled platform HTTP clients: start clean in each worker child and close on exit
+@worker_process_init.connect
+def _reset_http_clients(**kwargs):
+    from services import http_client
+    http_client.reset_after_fork()
+    # Connections the parent opened belong to the parent; the child opens its own
+    import database
+    database.engine.dispose(close=False)
+
+# `celery -A celery_utils inspect db_pool`: each worker's database pool usage
+@inspect_command()
+def db_pool(state):
+    import database
+    return database.pool_stats()
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_http_clients(**kwargs):
+    from services import http_client
+    http_client.close_sync_loops()
+
 # Create the global Celery app instance
 # This ensures all parts of the application use the same instance
 celery_app = create_celery_app()
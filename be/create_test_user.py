@@ -38,15 +38,12 @@ def main():
             print(f"\n✅ Test user already exists: {existing_user.email}")
         
         # Test token generation
-        from security import create_access_token
+        from security import create_user_token
         from datetime import timedelta
         
         user = crud.get_user_by_email(db, test_email)
         if user:
-            token = create_access_token(
-                data={"sub": user.email}, 
-                expires_delta=timedelta(minutes=30)
-            )
+            token = create_user_token(user, expires_delta=timedelta(minutes=30))
             print(f"\n✅ Generated token: {token[:50]}...")
             print(f"✅ Token for user: {user.email}")
         
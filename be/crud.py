@@ -1,4 +1,6 @@
 # backend/crud.py
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import models, schemas, security
 
@@ -32,6 +34,11 @@ def update_post(db: Session, post_id: int, user_id: int, post_update: schemas.Po
     if db_post:
         for key, value in post_update.model_dump().items():
             setattr(db_post, key, value)
+        # Drafts saved by unfinished publishes hold the old content; don't resume them
+        db.query(models.PublishedPost).filter(
+            models.PublishedPost.original_post_id == post_id,
+            models.PublishedPost.publish_step == "draft_created"
+        ).update({"publish_step": None, "platform_draft_id": None}, synchronize_session=False)
         db.commit()
         db.refresh(db_post)
     return db_post
@@ -53,4 +60,77 @@ def get_platform_credential(db: Session, user_id: int, platform_name: str):
     return db.query(models.PlatformCredential).filter_by(user_id=user_id, platform_name=platform_name).first()
 
 def get_user_connections(db: Session, user_id: int):
-    return db.query(models.PlatformCredential).filter_by(user_id=user_id).all()
\ No newline at end of file
+    return db.query(models.PlatformCredential).filter_by(user_id=user_id).all()
+
+# Async versions for `async def` routes, on database.get_async_db sessions
+async def get_user_by_email_async(db: AsyncSession, email: str):
+    return await db.scalar(select(models.User).where(models.User.email == email))
+
+async def get_user_async(db: AsyncSession, user_id: int):
+    return await db.get(models.User, user_id)
+
+async def get_post_async(db: AsyncSession, post_id: int, user_id: int):
+    return await db.scalar(select(models.Post).where(models.Post.id == post_id, models.Post.author_id == user_id))
+
+async def get_platform_credential_async(db: AsyncSession, user_id: int, platform_name: str):
+    return await db.scalar(select(models.PlatformCredential).filter_by(user_id=user_id, platform_name=platform_name))
+
+async def get_user_connections_async(db: AsyncSession, user_id: int):
+    return (await db.scalars(select(models.PlatformCredential).filter_by(user_id=user_id))).all()
+
+async def create_or_update_platform_credential_async(db: AsyncSession, cred: schemas.PlatformCredentialCreate, user_id: int):
+    db_cred = await get_platform_credential_async(db, user_id, cred.platform_name)
+    if db_cred: # Update
+        db_cred.access_token = cred.access_token
+        db_cred.api_key = cred.api_key
+    else: # Create
+        db_cred = models.PlatformCredential(**cred.model_dump(), user_id=user_id)
+        db.add(db_cred)
+    await db.commit()
+    await db.refresh(db_cred)
+    return db_cred
+
+def create_published_post(db: Session, post_id: int, platform_name: str, status: str = "pending") -> int:
+    """Insert a PublishedPost row and return its id (caller commits)"""
+    entry = models.PublishedPost(original_post_id=post_id, platform_name=platform_name, status=status)
+    db.add(entry)
+    db.flush()
+    return entry.id
+
+def update_published_posts(db: Session, updates: list):
+    """
+    Write several PublishedPost rows by primary key in one bulk UPDATE (caller commits)
+
+    Args:
+        updates: [{"id": published_post_id, column: value, ...}, ...]
+    """
+    if updates:
+        db.execute(update(models.PublishedPost), updates)
+
+def set_post_publish_status(db: Session, post_id: int, publish_status: str):
+    """Set a post's aggregate publish status without touching updated_at (caller commits)"""
+    db.query(models.Post).filter(models.Post.id == post_id).update(
+        {"publish_status": publish_status, "updated_at": models.Post.updated_at}, synchronize_session=False
+    )
+
+def aggregate_publish_status(statuses: list):
+    """Fold per-platform PublishedPost statuses into one post-level status"""
+    if not statuses:
+        return None
+    if any(status in ("pending", "processing") for status in statuses):
+        return "publishing"
+    if any(status == "scheduled" for status in statuses):
+        return "scheduled"
+    if all(status == "success" for status in statuses):
+        return "published"
+    if all(status == "failed" for status in statuses):
+        return "failed"
+    return "partial"
+
+def refresh_post_publish_status(db: Session, post_id: int):
+    """Recompute and store a post's aggregate publish status from its PublishedPost rows"""
+    statuses = [status for (status,) in db.query(models.PublishedPost.status).filter_by(original_post_id=post_id)]
+    publish_status = aggregate_publish_status(statuses)
+    set_post_publish_status(db, post_id, publish_status)
+    db.commit()
+    return publish_status
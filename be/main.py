@@ -1,12 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from database import SessionLocal, engine, Base
+from sqlalchemy import text
+from database import AsyncSessionLocal, engine, async_engine, Base
 import models
 import os
+from services import http_client, publish_events, local_executor
 
 # Import routers
-from routers import auth, posts, connections, tasks
+from routers import auth, posts, connections, tasks, admin
 
 app = FastAPI(
     title="CrossPost API",
@@ -44,12 +46,24 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️ Database setup error: {e}")
         print("💡 Continuing with mock data for now...")
+    # In-process publish executor (PUBLISH_EXECUTOR=local, and /api/posts/publish-direct)
+    await local_executor.start()
+
+# Stop the local executor, close pooled platform HTTP clients, the publish event consumer and the async engine on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    await local_executor.stop()
+    await http_client.aclose_all()
+    http_client.close_sync_loops()
+    publish_events.stop()
+    await async_engine.dispose()
 
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(posts.router, prefix="/api/posts", tags=["Posts"])
 app.include_router(connections.router, prefix="/api/connections", tags=["Connections"])
 app.include_router(tasks.router, prefix="/api/tasks", tags=["Tasks"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
 
 @app.get("/")
 async def root():
@@ -59,9 +73,8 @@ async def root():
 async def health_check():
     try:
         # Test database connection
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SELECT 1"))
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         return {"status": "unhealthy", "database": f"error: {str(e)}"}
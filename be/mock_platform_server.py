@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the dev.to and Hashnode APIs, for load testing the
+publish pipeline without touching the real platforms.
+
+Implements:
+    dev.to   POST /devto/api/articles, PUT /devto/api/articles/{id}
+    Hashnode POST /hashnode/ (GraphQL: createDraft, publishDraft, draft, updatePost,
+             me.publications, publication(host), publication(id).posts)
+
+Usage:
+    python mock_platform_server.py --port 9000 --latency-ms 150 --error-rate 0.02 --rate-limit-rate 0.05
+
+Then point the backend (API and workers) at it:
+    DEVTO_API_BASE_URL=http://localhost:9000/devto/api
+    HASHNODE_API_BASE_URL=http://localhost:9000/hashnode
+
+Behaviour can be changed while running:
+    POST /_mock/config  {"latency_ms": 500, "error_rate": 0.5}
+    GET  /_mock/stats
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import time
+from datetime import datetime, timezone
+from collections import Counter
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="Mock Platforms")
+
+# Injected behaviour; overridable from the environment, the CLI or /_mock/config
+config = {
+    "latency_ms": float(os.getenv("MOCK_LATENCY_MS", "100")),
+    "latency_jitter_ms": float(os.getenv("MOCK_LATENCY_JITTER_MS", "50")),
+    "error_rate": float(os.getenv("MOCK_ERROR_RATE", "0")),  # share of requests answered with 503
+    "rate_limit_rate": float(os.getenv("MOCK_RATE_LIMIT_RATE", "0")),  # share of requests answered with 429
+    "retry_after": int(os.getenv("MOCK_RETRY_AFTER", "5")),
+}
+
+stats = Counter()
+_ids = itertools.count(1)
+# Hashnode drafts not yet published, and published posts newest first (for resume lookups)
+_drafts = {}
+_posts = []
+_POSTS_KEPT = 1000
+
+
+def _object_id():
+    """Hashnode ids are MongoDB ObjectIds: creation time in epoch seconds, then a unique part"""
+    return f"{int(time.time()):08x}{next(_ids):016x}"
+
+
+def _not_found(message: str):
+    return {"data": None, "errors": [{"message": message, "extensions": {"code": "NOT_FOUND"}}]}
+
+
+async def _inject(platform: str, operation: str):
+    """Apply configured latency and failures; returns an error response or None"""
+    stats[f"{platform}.{operation}.requests"] += 1
+    delay = config["latency_ms"] + random.uniform(-1, 1) * config["latency_jitter_ms"]
+    await asyncio.sleep(max(0.0, delay) / 1000)
+
+    roll = random.random()
+    if roll < config["rate_limit_rate"]:
+        stats[f"{platform}.{operation}.429"] += 1
+        return JSONResponse(
+            {"error": "Rate limit reached", "status": 429},
+            status_code=429,
+            headers={"Retry-After": str(config["retry_after"]), "X-RateLimit-Remaining": "0"},
+        )
+    if roll < config["rate_limit_rate"] + config["error_rate"]:
+        stats[f"{platform}.{operation}.503"] += 1
+        return JSONResponse({"error": "Service Unavailable", "status": 503}, status_code=503)
+    return None
+
+
+# --- dev.to ---
+@app.post("/devto/api/articles")
+async def devto_create_article(request: Request):
+    error = await _inject("dev.to", "create")
+    if error:
+        return error
+    article = (await request.json()).get("article", {})
+    article_id = next(_ids)
+    return JSONResponse({
+        "id": article_id,
+        "title": article.get("title"),
+        "url": f"https://dev.to/mock/article-{article_id}",
+        "canonical_url": article.get("canonical_url"),
+        "tags": article.get("tags", []),
+        "published": article.get("published", True),
+    }, status_code=201)
+
+
+@app.put("/devto/api/articles/{article_id}")
+async def devto_update_article(article_id: int, request: Request):
+    error = await _inject("dev.to", "update")
+    if error:
+        return error
+    article = (await request.json()).get("article", {})
+    return {
+        "id": article_id,
+        "title": article.get("title"),
+        "url": f"https://dev.to/mock/article-{article_id}",
+        "canonical_url": article.get("canonical_url"),
+        "tags": article.get("tags", []),
+    }
+
+
+# --- Hashnode ---
+@app.post("/hashnode/")
+async def hashnode_graphql(request: Request):
+    body = await request.json()
+    query = body.get("query", "")
+    variables = body.get("variables") or {}
+    post_input = variables.get("input") or {}
+
+    if "createDraft" in query:
+        error = await _inject("hashnode", "createDraft")
+        if error:
+            return error
+        draft_id = _object_id()
+        _drafts[draft_id] = {"id": draft_id, "slug": draft_id, "title": post_input.get("title")}
+        return {"data": {"createDraft": {"draft": _drafts[draft_id]}}}
+
+    if "publishDraft" in query:
+        error = await _inject("hashnode", "publishDraft")
+        if error:
+            return error
+        draft = _drafts.pop(post_input.get("draftId"), None)
+        if draft is None:
+            return _not_found("Draft not found")
+        post_id = _object_id()
+        post = {
+            "id": post_id,
+            "slug": post_id,
+            "title": draft["title"],
+            "url": f"https://mock.hashnode.dev/{post_id}",
+            "publishedAt": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+        }
+        _posts.insert(0, post)
+        del _posts[_POSTS_KEPT:]
+        return {"data": {"publishDraft": {"post": post}}}
+
+    if "draft(" in query:
+        error = await _inject("hashnode", "draft")
+        if error:
+            return error
+        draft = _drafts.get(variables.get("id"))
+        return {"data": {"draft": draft}} if draft else _not_found("Draft not found")
+
+    if "updatePost" in query:
+        error = await _inject("hashnode", "updatePost")
+        if error:
+            return error
+        post_id = post_input.get("id")
+        return {"data": {"updatePost": {"post": {
+            "id": post_id,
+            "slug": post_id,
+            "title": post_input.get("title"),
+            "url": f"https://mock.hashnode.dev/{post_id}",
+        }}}}
+
+    if "publications" in query and "me" in query:
+        error = await _inject("hashnode", "publications")
+        if error:
+            return error
+        return {"data": {"me": {"publications": {"edges": [{"node": {
+            "id": "mock-publication",
+            "title": "Mock Blog",
+            "displayTitle": "Mock Blog",
+            "url": "https://mock.hashnode.dev",
+            "isTeam": False,
+        }}]}}}}
+
+    if "publication(" in query and "posts(" in query:
+        error = await _inject("hashnode", "posts")
+        if error:
+            return error
+        first = variables.get("first") or 20
+        return {"data": {"publication": {"posts": {"edges": [{"node": post} for post in _posts[:first]]}}}}
+
+    if "publication(" in query:
+        error = await _inject("hashnode", "publication")
+        if error:
+            return error
+        return {"data": {"publication": {
+            "id": "mock-publication",
+            "title": "Mock Blog",
+            "displayTitle": "Mock Blog",
+            "url": f"https://{variables.get('host')}",
+        }}}
+
+    return JSONResponse({"errors": [{"message": "Operation not supported by mock"}]}, status_code=400)
+
+
+# --- Control ---
+@app.get("/_mock/config")
+async def get_config():
+    return config
+
+
+@app.post("/_mock/config")
+async def update_config(request: Request):
+    updates = await request.json()
+    for key, value in updates.items():
+        if key in config:
+            config[key] = type(config[key])(value)
+    return config
+
+
+@app.get("/_mock/stats")
+async def get_stats():
+    return dict(stats)
+
+
+@app.post("/_mock/stats/reset")
+async def reset_stats():
+    stats.clear()
+    return {"message": "Stats reset"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock dev.to / Hashnode API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=config["latency_ms"])
+    parser.add_argument("--latency-jitter-ms", type=float, default=config["latency_jitter_ms"])
+    parser.add_argument("--error-rate", type=float, default=config["error_rate"])
+    parser.add_argument("--rate-limit-rate", type=float, default=config["rate_limit_rate"])
+    parser.add_argument("--retry-after", type=int, default=config["retry_after"])
+    args = parser.parse_args()
+
+    config.update(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
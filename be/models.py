@@ -1,5 +1,5 @@
 # backend/models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, JSON, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -22,6 +22,7 @@ class Post(Base):
     author_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    publish_status = Column(String, nullable=True) # scheduled, publishing, published, partial, failed (across all platforms)
 
     # Fields for aggregated list (can be JSON or separate columns)
     # For simplicity, let's assume you'll store a JSONB for flexible platform-specific metadata
@@ -31,6 +32,7 @@ class Post(Base):
 
     author = relationship("User", back_populates="posts")
     published_posts = relationship("PublishedPost", back_populates="original_post")
+    scheduled_publishes = relationship("ScheduledPublish", back_populates="post")
 
 
 class PlatformCredential(Base):
@@ -63,4 +65,85 @@ class PublishedPost(Base): # To track where each post was published
     error_message = Column(Text, nullable=True)
     published_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    original_post = relationship("Post", back_populates="published_posts")
\ No newline at end of file
+    # Last completed step of a multi-step publish (Hashnode: draft_created -> published),
+    # so a retry resumes from there instead of starting over
+    publish_step = Column(String, nullable=True)
+    platform_draft_id = Column(String, nullable=True) # Draft created by the platform, if any
+    content_hash = Column(String, nullable=True) # Fingerprint of the content last published successfully
+
+    # Retry scheduling: a transient failure sets next_retry_at and the retry sweeper
+    # re-dispatches the row once it is due (see services/retry_scheduler.py)
+    retry_count = Column(Integer, nullable=True, default=0)
+    next_retry_at = Column(DateTime(timezone=True), nullable=True)
+    error_details = Column(JSON, nullable=True) # Last failure plus the task arguments needed to retry it
+    platform_response = Column(JSON, nullable=True) # Full API response of the last publish (STORE_PLATFORM_RESPONSES)
+    task_id = Column(String, nullable=True, index=True) # Task id handed out for the latest publish, for status polling
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    original_post = relationship("Post", back_populates="published_posts")
+
+    __table_args__ = (
+        # Only rows waiting for a retry are indexed, so the sweeper's scan stays tiny
+        Index(
+            "ix_published_posts_next_retry_at", "next_retry_at",
+            postgresql_where=text("next_retry_at IS NOT NULL"),
+            sqlite_where=text("next_retry_at IS NOT NULL"),
+        ),
+    )
+
+class ScheduledPublish(Base): # A publish requested for later, dispatched by the publish scheduler
+    __tablename__ = "scheduled_publishes"
+    id = Column(Integer, primary_key=True, index=True)
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    publish_at = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String, nullable=False, default="scheduled") # scheduled, dispatched, cancelled
+
+    # publish_post_task arguments, fixed when the publish was requested
+    canonical_urls = Column(JSON, nullable=False) # {platform_name: canonical URL}
+    tags = Column(JSON, nullable=True)
+    hashnode_publication_id = Column(String, nullable=True)
+    task_ids = Column(JSON, nullable=True) # {platform_name: task_id} handed out when scheduling
+    # {platform_name: PublishedPost fields the schedule overwrote, null for rows it created},
+    # so cancelling puts existing rows back instead of deleting them
+    replaced_rows = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)
+
+    post = relationship("Post", back_populates="scheduled_publishes")
+
+    __table_args__ = (
+        # Only jobs still waiting are indexed, in due order, for the scheduler's claim query
+        Index(
+            "ix_scheduled_publishes_due", "publish_at",
+            postgresql_where=text("status = 'scheduled'"),
+            sqlite_where=text("status = 'scheduled'"),
+        ),
+    )
+
+class DeadLetter(Base): # A publish that was given up on, kept with everything needed to replay it
+    __tablename__ = "dead_letters"
+    id = Column(Integer, primary_key=True, index=True)
+    published_post_id = Column(Integer, ForeignKey("published_posts.id"), nullable=True)
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    platform_name = Column(String, nullable=False)
+    task_name = Column(String, nullable=False)
+    task_args = Column(JSON, nullable=False) # Full arguments of the task that failed
+    error_message = Column(Text, nullable=True)
+    error_details = Column(JSON, nullable=True) # Exception type, HTTP status, response body, retry history
+    status_code = Column(Integer, nullable=True) # HTTP status of the final failure, if any
+    attempts = Column(Integer, nullable=True)
+    failed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    replay_count = Column(Integer, nullable=False, default=0)
+    replayed_at = Column(DateTime(timezone=True), nullable=True)
+    replay_task_id = Column(String, nullable=True) # Task id of the latest replay, for status polling
+
+    __table_args__ = (
+        # Replays filter by platform and failure time ("all Hashnode failures from the last hour")
+        Index("ix_dead_letters_platform_failed_at", "platform_name", "failed_at"),
+        Index("ix_dead_letters_failed_at", "failed_at"),
+    )
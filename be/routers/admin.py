@@ -0,0 +1,116 @@
+# backend/routers/admin.py
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+import schemas, models, security, database
+from services import dead_letters
+
+router = APIRouter()
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive filter times as UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def _dead_letter_summary(letter: models.DeadLetter, full: bool = False) -> dict:
+    summary = {
+        "id": letter.id,
+        "post_id": letter.post_id,
+        "user_id": letter.user_id,
+        "platform_name": letter.platform_name,
+        "error_message": letter.error_message,
+        "status_code": letter.status_code,
+        "attempts": letter.attempts,
+        "failed_at": letter.failed_at,
+        "replay_count": letter.replay_count,
+        "replayed_at": letter.replayed_at,
+        "replay_task_id": letter.replay_task_id,
+    }
+    if full:
+        summary.update(task_name=letter.task_name, task_args=letter.task_args, error_details=letter.error_details)
+    return summary
+
+@router.get("/dead-letters")
+def list_dead_letters(
+    platform_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    post_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    status_code: Optional[int] = None,
+    include_replayed: bool = False,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(database.get_db),
+    admin: security.Principal = Depends(security.get_current_admin_user),
+):
+    """List publishes that were given up on, oldest failure first"""
+    query = dead_letters.find(
+        db, platform_name=platform_name, since=_utc(since), until=_utc(until), post_id=post_id,
+        user_id=user_id, status_code=status_code, include_replayed=include_replayed
+    )
+    return {
+        "total": query.order_by(None).count(),
+        "dead_letters": [_dead_letter_summary(letter) for letter in query.offset(skip).limit(min(limit, 500)).all()],
+    }
+
+@router.get("/dead-letters/{dead_letter_id}")
+def get_dead_letter(
+    dead_letter_id: int,
+    db: Session = Depends(database.get_db),
+    admin: security.Principal = Depends(security.get_current_admin_user),
+):
+    """One dead letter with its full task arguments and error details"""
+    letter = db.get(models.DeadLetter, dead_letter_id)
+    if letter is None:
+        raise HTTPException(status_code=404, detail="Dead letter not found")
+    return _dead_letter_summary(letter, full=True)
+
+@router.post("/dead-letters/replay")
+def replay_dead_letters(
+    replay_request: schemas.DeadLetterReplayRequest,
+    db: Session = Depends(database.get_db),
+    admin: security.Principal = Depends(security.get_current_admin_user),
+):
+    """
+    Replay the dead letters matching the filters in throttled batches
+
+    The publishes go back on the retry schedule: the first batch is due right
+    away and each following batch batch_interval seconds later, so the retry
+    sweeper releases them at a steady rate. Each gets a fresh task id to poll.
+    """
+    filters = replay_request.model_dump(
+        include={"ids", "platform_name", "since", "until", "post_id", "user_id", "status_code"}, exclude_none=True
+    )
+    if not filters:
+        raise HTTPException(status_code=400, detail="Give at least one filter (ids, platform_name, since, until, post_id, user_id or status_code)")
+
+    limit = min(replay_request.limit or dead_letters.REPLAY_MAX, dead_letters.REPLAY_MAX)
+    letters = dead_letters.find(
+        db, platform_name=replay_request.platform_name, since=_utc(replay_request.since), until=_utc(replay_request.until),
+        post_id=replay_request.post_id, user_id=replay_request.user_id, status_code=replay_request.status_code,
+        ids=replay_request.ids, include_replayed=replay_request.include_replayed
+    ).limit(limit).with_for_update(skip_locked=True).all()  # two concurrent replays never pick the same letter
+
+    if replay_request.dry_run:
+        db.rollback()
+        return {"dry_run": True, "matched": len(letters), "dead_letters": [_dead_letter_summary(letter) for letter in letters]}
+
+    print(f"♻️ {admin.email} replaying {len(letters)} dead letters matching {filters}")
+    replayed = dead_letters.replay(db, letters, batch_size=replay_request.batch_size, batch_interval=replay_request.batch_interval)
+    return {
+        "replayed": len(replayed["task_ids"]),
+        "batches": replayed["batches"],
+        "last_batch_at": replayed["last_batch_at"],
+        "task_ids": replayed["task_ids"],
+    }
+
+@router.get("/db-pool")
+def get_db_pool_stats(admin: security.Principal = Depends(security.get_current_admin_user)):
+    """
+    This API process's database connection pools: checked-out and overflow
+    connections, checkout wait times and timeouts (workers: `celery inspect db_pool`)
+    """
+    return database.pool_stats()
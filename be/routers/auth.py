@@ -1,6 +1,8 @@
 # backend/routers/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import timedelta
 import schemas, crud, security, database, models  # Fixed imports
@@ -15,20 +17,19 @@ def register_user(user: schemas.UserCreate, db: Session = Depends(database.get_d
     return crud.create_user(db=db, user=user)
 
 @router.post("/token", response_model=schemas.Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
-    user = crud.get_user_by_email(db, email=form_data.username) # form_data.username is the email
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(database.get_async_db)):
+    user = await crud.get_user_by_email_async(db, email=form_data.username) # form_data.username is the email
+    # bcrypt is deliberately slow; verify in the threadpool, not on the event loop
+    if not user or not await run_in_threadpool(security.verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     access_token_expires = timedelta(minutes=security.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = security.create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
+    access_token = security.create_user_token(user, expires_delta=access_token_expires)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/users/me", response_model=schemas.User)
-async def read_users_me(current_user: models.User = Depends(security.get_current_active_user)):
+async def read_users_me(current_user: security.Principal = Depends(security.get_current_active_user)):
     return current_user
\ No newline at end of file
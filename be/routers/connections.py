@@ -1,7 +1,7 @@
 # backend/routers/connections.py
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import httpx # For making external API calls (OAuth)
 import os
@@ -18,7 +18,7 @@ MEDIUM_CLIENT_SECRET = os.getenv("MEDIUM_CLIENT_SECRET")
 MEDIUM_REDIRECT_URI = os.getenv("MEDIUM_REDIRECT_URI", "http://localhost:8000/connect/medium/callback") # Your backend callback
 
 @router.get("/medium/login")
-async def medium_login(current_user: models.User = Depends(security.get_current_active_user)):
+async def medium_login(current_user: security.Principal = Depends(security.get_current_active_user)):
     # Store user_id in session or pass as state if needed, for linking back after callback
     # For simplicity, we assume user is logged in and we link to current_user
     scope = "basicProfile,publishPost"
@@ -28,9 +28,9 @@ async def medium_login(current_user: models.User = Depends(security.get_current_
 
 @router.get("/medium/callback")
 async def medium_callback(code: str, state: str, # 'state' should be user_id passed earlier
-                          db: Session = Depends(database.get_db)):
+                          db: AsyncSession = Depends(database.get_async_db)):
     user_id = int(state) # Make sure to validate state
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await crud.get_user_async(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found for state")
 
@@ -55,7 +55,7 @@ async def medium_callback(code: str, state: str, # 'state' should be user_id pas
         refresh_token=token_data.get("refresh_token"),
         # expires_at might need calculation based on expires_in
     )
-    crud.create_or_update_platform_credential(db, cred=cred_data, user_id=user.id)
+    await crud.create_or_update_platform_credential_async(db, cred=cred_data, user_id=user.id)
     # Redirect user back to a frontend page
     return RedirectResponse(url="http://localhost:3000/dashboard/connections?status=medium_connected")
 
@@ -64,8 +64,8 @@ async def medium_callback(code: str, state: str, # 'state' should be user_id pas
 @router.post("/save_key", response_model=schemas.PlatformCredential)
 async def save_api_key(
     cred_data: schemas.PlatformCredentialCreate, # Frontend sends platform_name and api_key
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: security.Principal = Depends(security.get_current_active_user),
 ):
     if cred_data.platform_name not in ["dev.to", "hashnode"]:
         raise HTTPException(status_code=400, detail="Invalid platform for API key.")
@@ -77,7 +77,8 @@ async def save_api_key(
     if cred_data.platform_name == "hashnode":
         try:
             # Get user's publications to find their primary publication
-            user_publications = await get_hashnode_user_publications(cred_data.api_key)
+            # Cached per key, so re-saving or re-validating the same key doesn't hit Hashnode again
+            user_publications = await get_hashnode_user_publications(cred_data.api_key, background_refresh=True)
             if user_publications:
                 # Use the first (primary) publication
                 publication_id = user_publications[0]["id"]
@@ -94,7 +95,7 @@ async def save_api_key(
 
     # Create or update the credential with publication_id for Hashnode
     try:
-        credential = crud.get_platform_credential(db, user_id=current_user.id, platform_name=cred_data.platform_name)
+        credential = await crud.get_platform_credential_async(db, user_id=current_user.id, platform_name=cred_data.platform_name)
         
         if credential:
             # Update existing credential
@@ -111,12 +112,12 @@ async def save_api_key(
             )
             db.add(credential)
         
-        db.commit()
-        db.refresh(credential)
+        await db.commit()
+        await db.refresh(credential)
         
         return credential
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to save credential: {str(e)}"
@@ -125,36 +126,33 @@ async def save_api_key(
 @router.post("/{platform}/revoke")
 async def revoke_connection(
     platform: str,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user)
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: security.Principal = Depends(security.get_current_active_user)
 ):
     if platform not in ["dev.to", "hashnode", "medium"]:
         raise HTTPException(status_code=400, detail="Invalid platform.")
     
     # Find and delete the platform credential
-    cred = db.query(models.PlatformCredential).filter_by(
-        user_id=current_user.id, 
-        platform_name=platform
-    ).first()
+    cred = await crud.get_platform_credential_async(db, user_id=current_user.id, platform_name=platform)
     
     if not cred:
         raise HTTPException(status_code=404, detail=f"No connection found for {platform}")
     
-    db.delete(cred)
-    db.commit()
+    await db.delete(cred)
+    await db.commit()
     
     return {"message": f"Successfully revoked connection to {platform}"}
 
 @router.get("/")
 async def get_connections(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user)
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: security.Principal = Depends(security.get_current_active_user)
 ):
     # Define all available platforms
     available_platforms = ["dev.to", "hashnode", "medium"]
     
     # Get user's credentials
-    user_credentials = db.query(models.PlatformCredential).filter_by(user_id=current_user.id).all()
+    user_credentials = await crud.get_user_connections_async(db, user_id=current_user.id)
     creds_by_platform = {cred.platform_name: cred for cred in user_credentials}
     
     # Build response with connection status
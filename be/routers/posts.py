@@ -4,10 +4,11 @@ from sqlalchemy.orm import Session
 from typing import List
 import httpx
 import schemas, crud, models, security, database  # Fixed imports
-from services.posting_service import post_to_devto, post_to_hashnode, post_to_medium
-from tasks import publish_to_platform_task
-import asyncio
+from services.posting_service import content_fingerprint
+from services import renditions, publish_scheduler, local_executor
+from tasks import publish_post_task
 import os
+import uuid
 
 router = APIRouter()
 
@@ -16,29 +17,61 @@ def get_canonical_url(post_id: int, platform_name: str = None) -> str:
     Generate canonical URL based on environment and platform requirements.
     For development with localhost, we skip canonical URLs for platforms that don't accept them.
     """
-    base_url = os.getenv("FRONTEND_BASE_URL", "http://localhost:3000")
-    canonical_url = f"{base_url}/blog/{post_id}"
-    
-    # Skip canonical URL for Hashnode when using localhost (it rejects localhost URLs)
-    if platform_name == "hashnode" and "localhost" in canonical_url:
-        return None
-    
-    return canonical_url
+    return renditions.canonical_url_for(post_id, platform_name)
+
+def get_published_entries(db: Session, post_id: int) -> dict:
+    """Load every PublishedPost row for a post in one query, keyed by platform"""
+    entries = db.query(models.PublishedPost).filter_by(original_post_id=post_id).all()
+    return {entry.platform_name: entry for entry in entries}
+
+def is_already_published(entry: models.PublishedPost, db_post: models.Post, tags: list, canonical_url: str) -> bool:
+    """
+    Whether the platform already shows exactly this title, body, tags and canonical URL,
+    in which case publishing again would be a no-op and no task needs to be queued
+    """
+    if not entry or not entry.platform_post_id or not entry.content_hash:
+        return False
+    fingerprint = content_fingerprint(db_post.title, db_post.content_markdown, tags=tags, canonical_url=canonical_url)
+    return entry.content_hash == fingerprint
+
+def dispatch_publish(db: Session, user_id: int, post_id: int, canonical_urls: dict, task_ids: dict,
+                     tags: list = None, hashnode_publication_id: str = None):
+    """
+    Start publishing a post: on the Celery workers, or on the API process's own
+    executor with PUBLISH_EXECUTOR=local (no broker needed)
+    """
+    if local_executor.enabled():
+        local_executor.submit(db, local_executor.platform_jobs(
+            user_id, post_id, canonical_urls, task_ids, tags=tags, hashnode_publication_id=hashnode_publication_id
+        ))
+        return
+    # The task prefers the publication stored on the Hashnode credential
+    publish_post_task.apply_async(
+        args=(user_id, post_id, canonical_urls),
+        kwargs={
+            "hashnode_publication_id": hashnode_publication_id,
+            "tags": tags,
+            "platform_task_ids": task_ids,
+        },
+    )
 
 @router.post("/", response_model=schemas.Post)
 def create_post(
     post: schemas.PostCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.Principal = Depends(security.get_current_active_user),
 ):
-    return crud.create_user_post(db=db, post=post, user_id=current_user.id)
+    db_post = crud.create_user_post(db=db, post=post, user_id=current_user.id)
+    # Warm this process's rendition cache for publishes run in the API (publish-direct, local executor)
+    renditions.precompute(db_post.id, db_post.title, db_post.content_markdown)
+    return db_post
 
 @router.get("/", response_model=List[schemas.Post])
 def read_posts(
     skip: int = 0,
     limit: int = 10,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.Principal = Depends(security.get_current_active_user),
 ):
     posts = crud.get_posts_by_user(db, user_id=current_user.id, skip=skip, limit=limit)
     return posts
@@ -47,7 +80,7 @@ def read_posts(
 def read_post(
     post_id: int,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.Principal = Depends(security.get_current_active_user),
 ):
     db_post = crud.get_post(db, post_id=post_id, user_id=current_user.id)
     if db_post is None:
@@ -59,18 +92,19 @@ def update_post(
     post_id: int,
     post: schemas.PostCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.Principal = Depends(security.get_current_active_user),
 ):
     db_post = crud.update_post(db, post_id=post_id, user_id=current_user.id, post_update=post)
     if db_post is None:
         raise HTTPException(status_code=404, detail="Post not found")
+    renditions.precompute(db_post.id, db_post.title, db_post.content_markdown)
     return db_post
 
 @router.get("/{post_id}/publish-history")
 def get_publish_history(
     post_id: int,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.Principal = Depends(security.get_current_active_user),
 ):
     # Verify user owns the post
     db_post = crud.get_post(db, post_id=post_id, user_id=current_user.id)
@@ -79,18 +113,23 @@ def get_publish_history(
     
     # Get publishing history
     published_posts = db.query(models.PublishedPost).filter_by(original_post_id=post_id).all()
+    scheduled = publish_scheduler.get_pending(db, post_id)
     
     return {
         "post_id": post_id,
         "post_title": db_post.title,
+        "publish_at": scheduled.publish_at if scheduled else None,
         "publish_history": [
             {
                 "platform_name": pp.platform_name,
                 "status": pp.status,
+                "publish_step": pp.publish_step,
                 "platform_post_id": pp.platform_post_id,
                 "platform_post_url": pp.platform_post_url,
                 "published_at": pp.published_at,
-                "error_message": pp.error_message
+                "error_message": pp.error_message,
+                "retry_count": pp.retry_count,
+                "next_retry_at": pp.next_retry_at
             }
             for pp in published_posts
         ]
@@ -100,68 +139,91 @@ def get_publish_history(
 def publish_post_to_platforms_celery(
     request_data: schemas.PostToPlatformsRequest,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.Principal = Depends(security.get_current_active_user),
 ):
     db_post = crud.get_post(db, post_id=request_data.post_id, user_id=current_user.id)
     if not db_post:
         raise HTTPException(status_code=404, detail="Post not found")
 
+    publish_at = publish_scheduler.due_time(request_data.publish_at)
+    # A new publish request replaces whatever was scheduled for this post before
+    publish_scheduler.cancel_pending(db, db_post.id)
+    existing_entries = get_published_entries(db, db_post.id)
+
+    canonical_urls = {}
     task_ids = {}
+    replaced_rows = {}
+    skipped_platforms = []
     for platform_name in request_data.platforms:
+        # Generate appropriate canonical URL for this platform
+        canonical_url = get_canonical_url(db_post.id, platform_name)
+
+        # Nothing to do if this exact content is already live on the platform
+        # (a scheduled publish checks this when it goes out, since the post may change until then)
+        published_post_entry = existing_entries.get(platform_name)
+        if not publish_at and is_already_published(published_post_entry, db_post, request_data.tags, canonical_url):
+            published_post_entry.status = "success"
+            published_post_entry.error_message = None
+            skipped_platforms.append(platform_name)
+            continue
+
+        if publish_at:
+            # Cancelling the schedule puts the row back as it is now
+            replaced_rows[platform_name] = publish_scheduler.replaced_state(published_post_entry)
         # Ensure PublishedPost entry exists or create it with 'pending' status
-        published_post_entry = db.query(models.PublishedPost).filter_by(
-            original_post_id=db_post.id,
-            platform_name=platform_name
-        ).first()
         if not published_post_entry:
             published_post_entry = models.PublishedPost(
                 original_post_id=db_post.id,
                 platform_name=platform_name,
-                status="pending"
+                status="scheduled" if publish_at else "pending"
             )
             db.add(published_post_entry)
-            db.commit()
         else:  # If retrying or re-publishing
-            published_post_entry.status = "pending"
+            published_post_entry.status = "scheduled" if publish_at else "pending"
             published_post_entry.error_message = None
-            db.commit()
-
-        # Special handling for Hashnode publication ID
-        hashnode_pub_id = None
-        if platform_name == "hashnode":
-            # Fetch from PlatformCredential
-            hn_cred = crud.get_platform_credential(db, user_id=current_user.id, platform_name="hashnode")
-            if hn_cred:
-                # Try to get from publication_id column first
-                if hasattr(hn_cred, 'publication_id') and hn_cred.publication_id:
-                    hashnode_pub_id = hn_cred.publication_id
-                # Fallback to extra_data if available
-                elif hasattr(hn_cred, 'extra_data') and hn_cred.extra_data and "publication_id" in hn_cred.extra_data:
-                    hashnode_pub_id = hn_cred.extra_data["publication_id"]
-                # Fallback to request data
-                if not hashnode_pub_id and request_data.hashnode_publication_id:
-                    hashnode_pub_id = request_data.hashnode_publication_id
+            # A fresh publish replaces any retry still scheduled for this platform
+            published_post_entry.retry_count = 0
+            published_post_entry.next_retry_at = None
+        canonical_urls[platform_name] = canonical_url
+        # One task publishes to every platform; each platform still gets its own
+        # task id to poll, which a deferred retry of that platform keeps using
+        task_ids[platform_name] = published_post_entry.task_id = str(uuid.uuid4())
 
-        # Generate appropriate canonical URL for this platform
-        canonical_url = get_canonical_url(db_post.id, platform_name)
+    if publish_at and canonical_urls:
+        publish_scheduler.schedule_publish(
+            db, current_user.id, db_post.id, publish_at, canonical_urls,
+            tags=request_data.tags,
+            hashnode_publication_id=request_data.hashnode_publication_id,
+            task_ids=task_ids,
+            replaced_rows=replaced_rows,
+        )
+        db_post.publish_status = "scheduled"
+    elif canonical_urls:
+        db_post.publish_status = "publishing"
+    db.commit()
+    if not canonical_urls:
+        crud.refresh_post_publish_status(db, db_post.id)
 
-        task = publish_to_platform_task.delay(
-            current_user.id,
-            db_post.id,
-            platform_name,
-            canonical_url,
-            hashnode_publication_id=hashnode_pub_id
+    if canonical_urls and not publish_at:
+        dispatch_publish(
+            db, current_user.id, db_post.id, canonical_urls, task_ids,
+            tags=request_data.tags, hashnode_publication_id=request_data.hashnode_publication_id,
         )
-        task_ids[platform_name] = task.id
 
-    return {"message": "Publishing tasks dispatched.", "task_ids": task_ids}
+    return {
+        "message": "Publishing scheduled." if publish_at and task_ids else "Publishing tasks dispatched.",
+        "task_ids": task_ids,
+        "platforms_queued": list(task_ids.keys()),
+        "skipped_platforms": skipped_platforms,
+        "publish_at": publish_at if task_ids else None,
+    }
 
 @router.post("/{post_id}/publish")
 def publish_post(
     post_id: int,
     publish_request: schemas.PublishRequest,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.Principal = Depends(security.get_current_active_user),
 ):
     # Get the post
     db_post = crud.get_post(db, post_id=post_id, user_id=current_user.id)
@@ -178,74 +240,123 @@ def publish_post(
     if not valid_platforms:
         raise HTTPException(status_code=400, detail="No valid connected platforms selected")
     
-    # Dispatch Celery tasks for each platform
+    publish_at = publish_scheduler.due_time(publish_request.publish_at)
+    # A new publish request replaces whatever was scheduled for this post before
+    publish_scheduler.cancel_pending(db, post_id)
+    existing_entries = get_published_entries(db, post_id)
+
+    canonical_urls = {}
     task_ids = {}
+    replaced_rows = {}
+    skipped_platforms = []
     
     for platform in valid_platforms:
-        credential = connected_platforms[platform]
+        # Generate appropriate canonical URL for this platform
+        canonical_url = get_canonical_url(post_id, platform)
+        # Use explicit None check to ensure localhost URLs don't get passed to Hashnode
+        if publish_request.canonical_url is not None:
+            final_canonical_url = publish_request.canonical_url
+        else:
+            final_canonical_url = canonical_url  # This will be None for Hashnode+localhost
         
-        # Create PublishedPost entry for tracking
-        published_post_entry = db.query(models.PublishedPost).filter_by(
-            original_post_id=post_id,
-            platform_name=platform
-        ).first()
+        # Nothing to do if this exact content is already live on the platform
+        # (a scheduled publish checks this when it goes out, since the post may change until then)
+        published_post_entry = existing_entries.get(platform)
+        if not publish_at and is_already_published(published_post_entry, db_post, publish_request.tags, final_canonical_url):
+            published_post_entry.status = "success"
+            published_post_entry.error_message = None
+            skipped_platforms.append(platform)
+            continue
         
+        if publish_at:
+            # Cancelling the schedule puts the row back as it is now
+            replaced_rows[platform] = publish_scheduler.replaced_state(published_post_entry)
+        # Create PublishedPost entry for tracking
         if not published_post_entry:
             published_post_entry = models.PublishedPost(
                 original_post_id=post_id,
                 platform_name=platform,
-                status="pending"
+                status="scheduled" if publish_at else "pending"
             )
             db.add(published_post_entry)
+            existing_entries[platform] = published_post_entry
         else:
-            published_post_entry.status = "pending"
+            published_post_entry.status = "scheduled" if publish_at else "pending"
             published_post_entry.error_message = None
-        
-        db.commit()
-        
-        # Generate appropriate canonical URL for this platform
-        canonical_url = get_canonical_url(post_id, platform)
-        # Use explicit None check to ensure localhost URLs don't get passed to Hashnode
-        if publish_request.canonical_url is not None:
-            final_canonical_url = publish_request.canonical_url
-        else:
-            final_canonical_url = canonical_url  # This will be None for Hashnode+localhost
-        
-        # Dispatch Celery task
+            # A fresh publish replaces any retry still scheduled for this platform
+            published_post_entry.retry_count = 0
+            published_post_entry.next_retry_at = None
+        canonical_urls[platform] = final_canonical_url
+        # One Celery task for all platforms, with a task id per platform for status polling
+        task_ids[platform] = published_post_entry.task_id = str(uuid.uuid4())
+    
+    if publish_at and canonical_urls:
+        publish_scheduler.schedule_publish(
+            db, current_user.id, post_id, publish_at, canonical_urls,
+            tags=publish_request.tags, task_ids=task_ids, replaced_rows=replaced_rows,
+        )
+        db_post.publish_status = "scheduled"
+    elif canonical_urls:
+        db_post.publish_status = "publishing"
+    db.commit()
+    if not canonical_urls:
+        crud.refresh_post_publish_status(db, post_id)
+    
+    if canonical_urls and not publish_at:
         try:
-            hashnode_publication_id = credential.publication_id if platform == "hashnode" else None
-            task = publish_to_platform_task.delay(
-                user_id=current_user.id,
-                post_id=post_id,
-                platform_name=platform,
-                canonical_url_on_your_site=final_canonical_url,
-                hashnode_publication_id=hashnode_publication_id
-            )
-            task_ids[platform] = task.id
+            dispatch_publish(db, current_user.id, post_id, canonical_urls, task_ids, tags=publish_request.tags)
         except Exception as e:
-            # If task dispatch fails, update the PublishedPost entry
-            published_post_entry.status = "failed"
-            published_post_entry.error_message = f"Task dispatch failed: {str(e)[:500]}"
+            # If task dispatch fails, update the PublishedPost entries
+            db.rollback()
+            error_message = f"Task dispatch failed: {str(e)[:500]}"
+            crud.update_published_posts(db, [
+                {"id": existing_entries[platform].id, "status": "failed", "error_message": error_message}
+                for platform in canonical_urls
+            ])
             db.commit()
+            crud.refresh_post_publish_status(db, post_id)
+            task_ids = {}
     
     return {
         "success": True,
         "post_id": post_id,
-        "message": "Publishing tasks dispatched successfully",
+        "message": "Publishing scheduled successfully" if publish_at and task_ids else "Publishing tasks dispatched successfully",
         "task_ids": task_ids,
         "platforms_queued": list(task_ids.keys()),
+        "skipped_platforms": skipped_platforms,
+        "publish_at": publish_at if task_ids else None,
         "note": "Publishing is happening in the background. Check publish history for results."
     }
 
-@router.post("/publish-direct", summary="Publish directly without background tasks (for development)")
+@router.delete("/{post_id}/schedule")
+def cancel_scheduled_publish(
+    post_id: int,
+    db: Session = Depends(database.get_db),
+    current_user: security.Principal = Depends(security.get_current_active_user),
+):
+    """Cancel a publish scheduled with publish_at that hasn't gone out yet"""
+    db_post = crud.get_post(db, post_id=post_id, user_id=current_user.id)
+    if db_post is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    if not publish_scheduler.cancel_pending(db, post_id):
+        db.rollback()
+        raise HTTPException(status_code=404, detail="No scheduled publish for this post")
+    db.commit()
+    publish_status = crud.refresh_post_publish_status(db, post_id)
+    return {"post_id": post_id, "message": "Scheduled publish cancelled", "publish_status": publish_status}
+
+@router.post("/publish-direct", summary="Publish in the API process, without a broker")
 def publish_post_direct(
     request_data: schemas.PostToPlatformsRequest,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.Principal = Depends(security.get_current_active_user),
 ):
     """
-    Direct publishing without Celery tasks - useful for development/testing
-    when Redis/Celery is not available
+    Publishing without Celery - for development, or when Redis/Celery is not available.
+    The publish is queued on the API process's own bounded executor and the request
+    returns right away with a task id per platform, as /publish does; track it with
+    /api/tasks/status/bulk or /api/tasks/stream/post/{post_id}.
     """
     db_post = crud.get_post(db, post_id=request_data.post_id, user_id=current_user.id)
     if not db_post:
@@ -261,83 +372,47 @@ def publish_post_direct(
     if not valid_platforms:
         raise HTTPException(status_code=400, detail="No valid connected platforms selected")
     
-    results = {}
+    # A new publish request replaces whatever was scheduled for this post before
+    publish_scheduler.cancel_pending(db, db_post.id)
+    existing_entries = get_published_entries(db, db_post.id)
     
+    canonical_urls = {}
+    task_ids = {}
     for platform_name in valid_platforms:
-        try:
-            credential = connected_platforms[platform_name]
-            
-            # Create or update PublishedPost entry
-            published_post_entry = db.query(models.PublishedPost).filter_by(
+        # Create or update PublishedPost entry
+        published_post_entry = existing_entries.get(platform_name)
+        if not published_post_entry:
+            published_post_entry = models.PublishedPost(
                 original_post_id=db_post.id,
-                platform_name=platform_name
-            ).first()
-            
-            if not published_post_entry:
-                published_post_entry = models.PublishedPost(
-                    original_post_id=db_post.id,
-                    platform_name=platform_name,
-                    status="processing"
-                )
-                db.add(published_post_entry)
-            else:
-                published_post_entry.status = "processing"
-                published_post_entry.error_message = None
-            
-            db.commit()
-            
-            # Generate appropriate canonical URL for this platform
-            canonical_url = get_canonical_url(db_post.id, platform_name)
-            
-            # Direct API calls (synchronous)
-            if platform_name == "dev.to" and credential.api_key:
-                api_response = asyncio.run(post_to_devto(
-                    credential.api_key,
-                    db_post.title,
-                    db_post.content_markdown,
-                    canonical_url=canonical_url
-                ))
-                
-                # Update success
-                published_post_entry.platform_post_id = str(api_response.get("id"))
-                published_post_entry.platform_post_url = api_response.get("url")
-                published_post_entry.status = "success"
-                results[platform_name] = {"success": True, "data": api_response}
-                
-            elif platform_name == "hashnode" and credential.api_key:
-                # Get publication ID
-                hashnode_pub_id = request_data.hashnode_publication_id or credential.publication_id
-                if not hashnode_pub_id:
-                    raise ValueError("Hashnode Publication ID required")
-                
-                api_response = asyncio.run(post_to_hashnode(
-                    credential.api_key,
-                    hashnode_pub_id,
-                    db_post.title,
-                    db_post.content_markdown,
-                    canonical_url=canonical_url  # This will be None for localhost, which is what we want
-                ))
-                
-                # Update success
-                if api_response.get("post_id"):
-                    published_post_entry.platform_post_id = str(api_response["post_id"])
-                if api_response.get("post_url"):
-                    published_post_entry.platform_post_url = api_response["post_url"]
-                published_post_entry.status = "success"
-                results[platform_name] = {"success": True, "data": api_response}
-                
-        except Exception as e:
-            # Update failure
-            published_post_entry.status = "failed"
-            published_post_entry.error_message = str(e)[:500]
-            results[platform_name] = {"success": False, "error": str(e)}
+                platform_name=platform_name,
+                status="pending"
+            )
+            db.add(published_post_entry)
+        else:
+            published_post_entry.status = "pending"
+            published_post_entry.error_message = None
+            published_post_entry.retry_count = 0
+            published_post_entry.next_retry_at = None
         
-        db.commit()
+        # Generate appropriate canonical URL for this platform
+        canonical_urls[platform_name] = get_canonical_url(db_post.id, platform_name)
+        task_ids[platform_name] = published_post_entry.task_id = str(uuid.uuid4())
+    
+    db_post.publish_status = "publishing"
+    db.commit()
+    
+    local_executor.submit(db, local_executor.platform_jobs(
+        current_user.id, db_post.id, canonical_urls, task_ids,
+        tags=request_data.tags, hashnode_publication_id=request_data.hashnode_publication_id,
+    ))
     
     return {
         "success": True,
-        "results": results,
-        "note": "Direct publishing completed (synchronous)"
+        "post_id": db_post.id,
+        "message": "Publishing queued in the API process.",
+        "task_ids": task_ids,
+        "platforms_queued": list(task_ids.keys()),
+        "note": "Direct publishing runs in the background without a broker. Check publish history for results."
     }
 
 # Add PUT for update and DELETE for deletion
\ No newline at end of file
@@ -1,16 +1,106 @@
 # backend/routers/tasks.py
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import os
+import time
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import schemas, crud, models, security, database
 from celery_utils import celery_app
-from celery.result import AsyncResult
+from celery import states
+from services import circuit_breaker, publish_events, local_executor
 
 router = APIRouter()
 
+# Most task ids one bulk status request may ask about
+BULK_STATUS_MAX_TASKS = 500
+# Live progress streams are closed after this long; EventSource reconnects on its own
+STREAM_MAX_SECONDS = float(os.getenv("STREAM_MAX_SECONDS", "600"))
+STREAM_KEEPALIVE_SECONDS = 15
+
+def _fetch_task_metas(task_ids: list) -> dict:
+    """
+    Result backend state of several tasks in one round trip
+
+    Key-value backends (Redis) are read with a single MGET; other backends
+    fall back to one lookup per task. Tasks run by the in-process executor
+    are answered by it, and with PUBLISH_EXECUTOR=local there is no backend
+    to ask. Unknown ids come back as PENDING.
+
+    Returns:
+        dict: {task_id: {"status": ..., "result": ...}}
+    """
+    if not task_ids:
+        return {}
+    pending = {"status": states.PENDING, "result": None}
+    metas = local_executor.task_metas(task_ids)
+    remaining = [task_id for task_id in task_ids if task_id not in metas]
+    if not remaining or local_executor.enabled():
+        return {task_id: metas.get(task_id, pending) for task_id in task_ids}
+
+    backend = celery_app.backend
+    if not hasattr(backend, "mget"):
+        metas.update({task_id: backend.get_task_meta(task_id) for task_id in remaining})
+    else:
+        values = backend.mget([backend.get_key_for_task(task_id) for task_id in remaining])
+        metas.update({
+            task_id: backend.decode_result(value) if value else pending
+            for task_id, value in zip(remaining, values)
+        })
+    return {task_id: metas[task_id] for task_id in task_ids}
+
+def _task_info(task_id: str, meta: dict) -> dict:
+    """Client-facing view of one task's backend state"""
+    status = meta.get("status", states.PENDING)
+    ready = status in states.READY_STATES
+    result = meta.get("result") if ready else None
+    task_info = {
+        "task_id": task_id,
+        "status": status,
+        "result": result if status != states.FAILURE else None,
+        "ready": ready,
+        "successful": status == states.SUCCESS if ready else None,
+        "failed": status == states.FAILURE if ready else None,
+    }
+    
+    # A publish whose retry was scheduled in the database isn't finished; the
+    # sweeper re-dispatches it later under this same task id
+    if isinstance(result, dict) and result.get("status") == "retry_scheduled":
+        task_info.update(status="RETRY", ready=False, successful=None, failed=None)
+        task_info["retry_at"] = result.get("retry_at")
+    
+    # Add error information if task failed
+    if status == states.FAILURE:
+        task_info["error"] = str(result)
+    
+    # Platform results carry the platform they were published to
+    if isinstance(result, dict) and "platform" in result:
+        task_info["platform_info"] = {
+            "platform": result["platform"],
+            "data": result.get("data", {})
+        }
+    return task_info
+
+def _published_post_status(pp: models.PublishedPost) -> dict:
+    return {
+        "platform_name": pp.platform_name,
+        "status": pp.status,
+        "publish_step": pp.publish_step,
+        "platform_post_id": pp.platform_post_id,
+        "platform_post_url": pp.platform_post_url,
+        "published_at": pp.published_at,
+        "error_message": pp.error_message,
+        "retry_count": pp.retry_count,
+        "next_retry_at": pp.next_retry_at,
+        "updated_at": pp.updated_at
+    }
+
 @router.get("/status/{task_id}")
 def get_task_status(
     task_id: str, 
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.Principal = Depends(security.get_current_active_user),
     db: Session = Depends(database.get_db)
 ):
     """
@@ -18,46 +108,66 @@ def get_task_status(
     Returns both Celery task status and related PublishedPost status if available.
     """
     try:
-        task_result = AsyncResult(task_id, app=celery_app)
-        
-        # Get basic task information
-        task_info = {
-            "task_id": task_id,
-            "status": task_result.status,
-            "result": task_result.result if task_result.ready() else None,
-            "ready": task_result.ready(),
-            "successful": task_result.successful() if task_result.ready() else None,
-            "failed": task_result.failed() if task_result.ready() else None,
-        }
-        
-        # Add error information if task failed
-        if task_result.failed():
-            task_info["error"] = str(task_result.info)
-        
-        # Try to find related PublishedPost entries for additional context
-        # Note: This requires that the task result contains platform and post info
-        published_posts = []
-        if task_result.result and isinstance(task_result.result, dict):
-            result_data = task_result.result
-            if "platform" in result_data:
-                platform_name = result_data["platform"]
-                # Try to find the PublishedPost entry
-                # We'd need to know the post_id to do this effectively
-                # For now, we'll just include the task result data
-                task_info["platform_info"] = {
-                    "platform": platform_name,
-                    "data": result_data.get("data", {})
-                }
-        
-        return task_info
-        
+        return _task_info(task_id, _fetch_task_metas([task_id])[task_id])
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid task ID or error retrieving task: {str(e)}")
 
+@router.post("/status/bulk")
+def get_bulk_task_status(
+    status_request: schemas.BulkTaskStatusRequest,
+    current_user: security.Principal = Depends(security.get_current_active_user),
+    db: Session = Depends(database.get_db)
+):
+    """
+    Get the status of many tasks at once, for dashboards.
+    Pass task ids, post ids (every platform task of those posts), or both. All
+    backend states are read in one round trip and merged with the matching
+    PublishedPost rows of the current user's posts, loaded in one query.
+    Only tasks of the user's own publish rows are looked up; other task ids are
+    listed under "unknown".
+    """
+    if not status_request.task_ids and not status_request.post_ids:
+        raise HTTPException(status_code=400, detail="Give task_ids and/or post_ids")
+    
+    # The user's publish rows for the requested tasks and posts, in one query
+    conditions = []
+    if status_request.task_ids:
+        conditions.append(models.PublishedPost.task_id.in_(status_request.task_ids))
+    if status_request.post_ids:
+        conditions.append(models.PublishedPost.original_post_id.in_(status_request.post_ids))
+    rows = (
+        db.query(models.PublishedPost)
+        .join(models.Post, models.Post.id == models.PublishedPost.original_post_id)
+        .filter(models.Post.author_id == current_user.id, or_(*conditions))
+        .all()
+    )
+    rows_by_task = {pp.task_id: pp for pp in rows if pp.task_id}
+    
+    requested = list(dict.fromkeys(list(status_request.task_ids) + list(rows_by_task)))
+    if len(requested) > BULK_STATUS_MAX_TASKS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_STATUS_MAX_TASKS} tasks per request")
+    # Task results hold platform responses; never read them for someone else's publish
+    task_ids = [task_id for task_id in requested if task_id in rows_by_task]
+    unknown = [task_id for task_id in requested if task_id not in rows_by_task]
+    try:
+        metas = _fetch_task_metas(task_ids)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Task states unavailable: {str(e)}")
+    
+    tasks = {}
+    for task_id in task_ids:
+        pp = rows_by_task[task_id]
+        task_info = _task_info(task_id, metas[task_id])
+        task_info["post_id"] = pp.original_post_id
+        task_info["published_post"] = _published_post_status(pp)
+        tasks[task_id] = task_info
+    
+    return {"tasks": tasks, "unknown": unknown}
+
 @router.get("/status/post/{post_id}")
 def get_post_publishing_status(
     post_id: int,
-    current_user: models.User = Depends(security.get_current_active_user),
+    current_user: security.Principal = Depends(security.get_current_active_user),
     db: Session = Depends(database.get_db)
 ):
     """
@@ -75,19 +185,80 @@ def get_post_publishing_status(
     publishing_status = {
         "post_id": post_id,
         "post_title": db_post.title,
+        "publish_status": db_post.publish_status,
         "platforms": []
     }
     
     for pp in published_posts:
-        platform_status = {
-            "platform_name": pp.platform_name,
-            "status": pp.status,
-            "platform_post_id": pp.platform_post_id,
-            "platform_post_url": pp.platform_post_url,
-            "published_at": pp.published_at,
-            "error_message": pp.error_message,
-            "updated_at": pp.updated_at
+        publishing_status["platforms"].append(dict(_published_post_status(pp), task_id=pp.task_id))
+    
+    return publishing_status
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@router.get("/stream/post/{post_id}")
+async def stream_post_progress(
+    post_id: int,
+    request: Request,
+    current_user: security.Principal = Depends(security.get_current_user_for_stream),
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    """
+    Server-Sent Events stream of a post's publishing progress.
+    Starts with a 'snapshot' event holding the post's PublishedPost rows, then
+    sends a 'progress' event per platform step as workers report it (started,
+    draft_created, success, error, retry_scheduled, deferred). All streams of
+    an API process share one Celery event consumer.
+    Browsers can pass the token as ?access_token=..., since EventSource can't set headers.
+    """
+    # Subscribe before reading the snapshot, so no step that happens in between is missed.
+    # A step may then show up in the snapshot and again as an event; each event carries
+    # the platform's state, so applying it twice changes nothing.
+    subscription = publish_events.subscribe(post_id)
+    try:
+        db_post = await crud.get_post_async(db, post_id=post_id, user_id=current_user.id)
+        if not db_post:
+            raise HTTPException(status_code=404, detail="Post not found")
+        published_posts = await db.scalars(select(models.PublishedPost).filter_by(original_post_id=post_id))
+        snapshot = {
+            "post_id": post_id,
+            "publish_status": db_post.publish_status,
+            "platforms": [dict(_published_post_status(pp), task_id=pp.task_id) for pp in published_posts],
         }
-        publishing_status["platforms"].append(platform_status)
+    except BaseException:
+        publish_events.unsubscribe(subscription)
+        raise
+    # Don't hold a pooled connection for the life of the stream
+    await db.close()
     
-    return publishing_status 
\ No newline at end of file
+    async def events():
+        try:
+            yield _sse("snapshot", snapshot)
+            closes_at = time.monotonic() + STREAM_MAX_SECONDS
+            while time.monotonic() < closes_at:
+                event = await subscription.get(timeout=STREAM_KEEPALIVE_SECONDS)
+                if await request.is_disconnected():
+                    break
+                yield _sse("progress", event) if event is not None else ": ping\n\n"
+        finally:
+            publish_events.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/circuits")
+def get_circuit_states(
+    current_user: security.Principal = Depends(security.get_current_active_user)
+):
+    """
+    Get the circuit breaker state for each publishing platform.
+    Tasks for a platform whose circuit is open are deferred instead of sent.
+    """
+    try:
+        return {"circuits": circuit_breaker.get_all_states()}
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Circuit breaker state unavailable: {str(e)}")
@@ -37,6 +37,7 @@ class Post(PostBase):
     author_id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+    publish_status: Optional[str] = None
     class Config:
         orm_mode = True
 
@@ -45,6 +46,7 @@ class PublishRequest(BaseModel):
     platforms: List[str]  # e.g., ["dev.to", "hashnode", "medium"]
     canonical_url: Optional[str] = None
     tags: Optional[List[str]] = None
+    publish_at: Optional[datetime] = None  # publish later instead of now (naive times are UTC)
 
 # PlatformCredential Schemas
 class PlatformCredentialBase(BaseModel):
@@ -69,4 +71,27 @@ class PostToPlatformsRequest(BaseModel):
     platforms: List[str]
     canonical_url: Optional[str] = None
     tags: Optional[List[str]] = None
-    hashnode_publication_id: Optional[str] = None
\ No newline at end of file
+    hashnode_publication_id: Optional[str] = None
+    publish_at: Optional[datetime] = None  # publish later instead of now (naive times are UTC)
+
+# Task Status Schemas
+class BulkTaskStatusRequest(BaseModel):
+    task_ids: List[str] = []
+    post_ids: List[int] = []  # every platform task of these posts
+
+# Dead-letter Schemas
+class DeadLetterReplayRequest(BaseModel):
+    # Filters; at least one is required so a replay is never "everything" by accident
+    ids: Optional[List[int]] = None
+    platform_name: Optional[str] = None
+    since: Optional[datetime] = None  # failed at or after (naive times are UTC)
+    until: Optional[datetime] = None  # failed before
+    post_id: Optional[int] = None
+    user_id: Optional[int] = None
+    status_code: Optional[int] = None
+    include_replayed: bool = False
+    # Throttling
+    limit: Optional[int] = None  # at most this many (capped by REPLAY_MAX)
+    batch_size: Optional[int] = None  # publishes released per batch (default REPLAY_BATCH_SIZE)
+    batch_interval: Optional[float] = None  # seconds between batches (default REPLAY_BATCH_INTERVAL)
+    dry_run: bool = False  # only report what would be replayed
@@ -1,21 +1,33 @@
 # backend/security.py
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-import models, schemas, database
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+import models, schemas, database, crud
 import os
 
 # Security Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")  # In production, use environment variable
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# Users allowed to use the /api/admin endpoints (comma-separated emails)
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+# Verified tokens kept per API process, so repeat requests skip the users query.
+# A change to a user drops its entries here; other processes see it within AUTH_CACHE_TTL.
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))  # seconds; 0 turns the cache off
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+# Event streams: EventSource can't send headers, so the token may come as a query parameter
+optional_security = HTTPBearer(auto_error=False)
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -33,26 +45,132 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(database.get_db)):
+def create_user_token(user, expires_delta: Optional[timedelta] = None):
+    """Access token for a user; the id claim lets authentication look the user up by primary key"""
+    return create_access_token(data={"sub": user.email, "uid": user.id}, expires_delta=expires_delta)
+
+
+class Principal:
+    """The authenticated user as routes see it: the User columns they read, detached from any session"""
+    __slots__ = ("id", "email", "created_at")
+
+    def __init__(self, id: int, email: str, created_at=None):
+        self.id = id
+        self.email = email
+        self.created_at = created_at
+
+    @classmethod
+    def from_user(cls, user: models.User):
+        return cls(user.id, user.email, user.created_at)
+
+
+_principals = OrderedDict()  # token -> (Principal, cached until)
+_tokens_by_user = {}  # user id -> tokens cached for that user
+_principals_lock = threading.Lock()
+
+
+def _cached_principal(token: str):
+    with _principals_lock:
+        entry = _principals.get(token)
+        if entry is None:
+            return None
+        principal, cached_until = entry
+        if cached_until <= time.time():
+            _forget(token)
+            return None
+        _principals.move_to_end(token)
+        return principal
+
+
+def _cache_principal(token: str, principal: Principal, expires_at: float):
+    if AUTH_CACHE_TTL <= 0:
+        return
+    with _principals_lock:
+        _principals[token] = (principal, min(time.time() + AUTH_CACHE_TTL, expires_at))
+        _principals.move_to_end(token)
+        _tokens_by_user.setdefault(principal.id, set()).add(token)
+        while len(_principals) > AUTH_CACHE_SIZE:
+            _forget(next(iter(_principals)))
+
+
+def _forget(token: str):
+    """Drop one cached token; hold _principals_lock"""
+    principal, _ = _principals.pop(token)
+    tokens = _tokens_by_user.get(principal.id)
+    if tokens is not None:
+        tokens.discard(token)
+        if not tokens:
+            del _tokens_by_user[principal.id]
+
+
+def invalidate_user(user_id: int):
+    """Forget every cached token of a user, so its next request loads it again"""
+    with _principals_lock:
+        for token in list(_tokens_by_user.get(user_id, ())):
+            _forget(token)
+
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    # ORM changes to a user (email, password, deletion) reach every request of this process at once;
+    # bulk query.update()/delete() bypass this and should call invalidate_user themselves
+    invalidate_user(target.id)
+
+
+async def _user_from_token(token: str, db: AsyncSession) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    if not token:
+        raise credentials_exception
+    # Only verified tokens are cached, so a hit needs neither the signature check nor a query
+    principal = _cached_principal(token)
+    if principal is not None:
+        return principal
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
         token_data = schemas.TokenData(email=username)
     except JWTError:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
+    # Tokens from before the id claim are looked up by email
+    user_id = payload.get("uid")
+    if user_id is not None:
+        user = await crud.get_user_async(db, user_id=user_id)
+        if user is not None and user.email != token_data.email:
+            user = None  # the email changed since the token was issued
+    else:
+        user = await crud.get_user_by_email_async(db, email=token_data.email)
     if user is None:
         raise credentials_exception
-    return user
+    principal = Principal.from_user(user)
+    _cache_principal(token, principal, payload.get("exp") or 0)
+    return principal
+
+# Async, so authenticating a request never blocks the event loop on a query.
+# Returns a Principal (id, email, created_at); load the User itself where a route needs more.
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(database.get_async_db)) -> Principal:
+    return await _user_from_token(credentials.credentials, db)
 
-def get_current_active_user(current_user: models.User = Depends(get_current_user)):
+async def get_current_user_for_stream(
+    access_token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(database.get_async_db)
+) -> Principal:
+    """Like get_current_user, but also accepts ?access_token=... for EventSource clients"""
+    return await _user_from_token(credentials.credentials if credentials else access_token, db)
+
+def get_current_active_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     # if current_user.disabled: # If you add a disabled flag
     #     raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
\ No newline at end of file
+    return current_user
+
+def get_current_admin_user(current_user: Principal = Depends(get_current_active_user)) -> Principal:
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
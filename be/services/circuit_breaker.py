@@ -0,0 +1,313 @@
+# backend/services/circuit_breaker.py
+"""
+Per-platform circuit breaker with state shared across workers in Redis.
+
+closed    -> calls flow; outcomes are counted in a rolling window and the
+             breaker opens once the error or slow-call ratio crosses its threshold
+open      -> calls are refused until CIRCUIT_OPEN_SECONDS have passed
+half_open -> a limited number of probe calls go through; if they all succeed
+             the breaker closes, any failure opens it again
+
+Like the rate limiter, the breaker fails open when Redis is unreachable, and
+keeps its state in this process when redis_store.SHARED_STATE_IN_PROCESS is set.
+"""
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+import httpx
+import redis
+from services.redis_store import get_redis, SHARED_STATE_IN_PROCESS
+
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() in ("1", "true", "yes")
+CIRCUIT_FAILURE_RATIO = float(os.getenv("CIRCUIT_FAILURE_RATIO", "0.5"))
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "15"))
+CIRCUIT_SLOW_CALL_RATIO = float(os.getenv("CIRCUIT_SLOW_CALL_RATIO", "0.5"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+CIRCUIT_WINDOW_SECONDS = float(os.getenv("CIRCUIT_WINDOW_SECONDS", "60"))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+CIRCUIT_HALF_OPEN_PROBES = int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "2"))
+
+# Platforms that have a breaker (Medium is a dummy implementation)
+PLATFORMS = ["dev.to", "hashnode"]
+
+KEY_PREFIX = "circuit"
+
+# Decide whether a call may go through.
+# ARGV: open_seconds, max_probes. Returns {allowed, state, retry_in}.
+_ALLOW_SCRIPT = """
+local open_seconds = tonumber(ARGV[1])
+local max_probes = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local s = redis.call('HMGET', KEYS[1], 'state', 'opened_at', 'probe_window_start', 'probes')
+local state = s[1] or 'closed'
+if state == 'closed' then
+    return {1, 'closed', '0'}
+end
+if state == 'open' then
+    local remaining = (tonumber(s[2]) or now) + open_seconds - now
+    if remaining > 0 then
+        return {0, 'open', tostring(remaining)}
+    end
+    redis.call('HSET', KEYS[1], 'state', 'half_open', 'changed_at', now, 'probe_window_start', now, 'probes', 0, 'probe_successes', 0)
+    s[3] = now
+    s[4] = 0
+end
+-- half_open: hand out probe slots; slots free up again after open_seconds so a
+-- probe that never reports back can't wedge the breaker
+local window_start = tonumber(s[3]) or now
+local probes = tonumber(s[4]) or 0
+if now - window_start > open_seconds then
+    window_start = now
+    probes = 0
+end
+if probes < max_probes then
+    redis.call('HSET', KEYS[1], 'probe_window_start', window_start, 'probes', probes + 1)
+    return {1, 'half_open', '0'}
+end
+return {0, 'half_open', tostring(window_start + open_seconds - now)}
+"""
+
+# Record the outcome of a call.
+# ARGV: failed, slow, failure_ratio, slow_ratio, min_calls, window_seconds, max_probes
+_RECORD_SCRIPT = """
+local failed = tonumber(ARGV[1])
+local slow = tonumber(ARGV[2])
+local failure_ratio = tonumber(ARGV[3])
+local slow_ratio = tonumber(ARGV[4])
+local min_calls = tonumber(ARGV[5])
+local window_seconds = tonumber(ARGV[6])
+local max_probes = tonumber(ARGV[7])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local s = redis.call('HMGET', KEYS[1], 'state', 'window_start', 'calls', 'failures', 'slow_calls', 'probe_successes', 'trips')
+local state = s[1] or 'closed'
+local trips = tonumber(s[7]) or 0
+
+local function trip(reason)
+    redis.call('HSET', KEYS[1], 'state', 'open', 'opened_at', now, 'changed_at', now,
+        'trip_reason', reason, 'trips', trips + 1, 'probes', 0, 'probe_successes', 0)
+    return 'open'
+end
+
+if state == 'open' then
+    return 'open'
+end
+
+if state == 'half_open' then
+    if failed == 1 then
+        return trip('half-open probe failed')
+    end
+    if slow == 1 then
+        return trip('half-open probe too slow')
+    end
+    local successes = (tonumber(s[6]) or 0) + 1
+    if successes >= max_probes then
+        redis.call('HSET', KEYS[1], 'state', 'closed', 'changed_at', now,
+            'window_start', now, 'calls', 0, 'failures', 0, 'slow_calls', 0)
+        return 'closed'
+    end
+    redis.call('HSET', KEYS[1], 'probe_successes', successes)
+    return 'half_open'
+end
+
+local window_start = tonumber(s[2]) or now
+local calls = tonumber(s[3]) or 0
+local failures = tonumber(s[4]) or 0
+local slow_calls = tonumber(s[5]) or 0
+if now - window_start > window_seconds then
+    window_start = now
+    calls = 0
+    failures = 0
+    slow_calls = 0
+end
+calls = calls + 1
+failures = failures + failed
+slow_calls = slow_calls + slow
+redis.call('HSET', KEYS[1], 'state', 'closed', 'window_start', window_start,
+    'calls', calls, 'failures', failures, 'slow_calls', slow_calls)
+if calls >= min_calls then
+    if failures / calls >= failure_ratio then
+        return trip('error rate ' .. failures .. '/' .. calls)
+    end
+    if slow_calls / calls >= slow_ratio then
+        return trip('slow calls ' .. slow_calls .. '/' .. calls)
+    end
+end
+return 'closed'
+"""
+
+
+def circuit_key(platform: str) -> str:
+    return f"{KEY_PREFIX}:{platform}"
+
+
+# In-process breakers, same fields as the Redis hashes: {key: {state, opened_at, ...}}
+_local_circuits = {}
+_local_lock = threading.Lock()
+
+
+def _allow_in_process(key: str):
+    """_ALLOW_SCRIPT against the in-process breakers"""
+    now = time.time()
+    with _local_lock:
+        circuit = _local_circuits.setdefault(key, {})
+        state = circuit.get("state", "closed")
+        if state == "closed":
+            return True, 0.0
+        if state == "open":
+            remaining = circuit.get("opened_at", now) + CIRCUIT_OPEN_SECONDS - now
+            if remaining > 0:
+                return False, remaining
+            circuit.update(state="half_open", changed_at=now, probe_window_start=now, probes=0, probe_successes=0)
+        # half_open: hand out probe slots, freed again after CIRCUIT_OPEN_SECONDS
+        window_start = circuit.get("probe_window_start", now)
+        probes = circuit.get("probes", 0)
+        if now - window_start > CIRCUIT_OPEN_SECONDS:
+            window_start, probes = now, 0
+        if probes < CIRCUIT_HALF_OPEN_PROBES:
+            circuit.update(probe_window_start=window_start, probes=probes + 1)
+            return True, 0.0
+        return False, window_start + CIRCUIT_OPEN_SECONDS - now
+
+
+def _record_in_process(key: str, failed: bool, slow: bool) -> str:
+    """_RECORD_SCRIPT against the in-process breakers"""
+    now = time.time()
+    with _local_lock:
+        circuit = _local_circuits.setdefault(key, {})
+        state = circuit.get("state", "closed")
+
+        def trip(reason):
+            circuit.update(state="open", opened_at=now, changed_at=now, trip_reason=reason,
+                           trips=circuit.get("trips", 0) + 1, probes=0, probe_successes=0)
+            return "open"
+
+        if state == "open":
+            return "open"
+        if state == "half_open":
+            if failed:
+                return trip("half-open probe failed")
+            if slow:
+                return trip("half-open probe too slow")
+            successes = circuit.get("probe_successes", 0) + 1
+            if successes >= CIRCUIT_HALF_OPEN_PROBES:
+                circuit.update(state="closed", changed_at=now, window_start=now, calls=0, failures=0, slow_calls=0)
+                return "closed"
+            circuit["probe_successes"] = successes
+            return "half_open"
+
+        window_start = circuit.get("window_start", now)
+        calls, failures, slow_calls = circuit.get("calls", 0), circuit.get("failures", 0), circuit.get("slow_calls", 0)
+        if now - window_start > CIRCUIT_WINDOW_SECONDS:
+            window_start, calls, failures, slow_calls = now, 0, 0, 0
+        calls += 1
+        failures += int(failed)
+        slow_calls += int(slow)
+        circuit.update(state="closed", window_start=window_start, calls=calls, failures=failures, slow_calls=slow_calls)
+        if calls >= CIRCUIT_MIN_CALLS:
+            if failures / calls >= CIRCUIT_FAILURE_RATIO:
+                return trip(f"error rate {failures}/{calls}")
+            if slow_calls / calls >= CIRCUIT_SLOW_CALL_RATIO:
+                return trip(f"slow calls {slow_calls}/{calls}")
+        return "closed"
+
+
+def allow(platform: str):
+    """
+    Ask the platform's breaker whether a call may be made now
+
+    Returns:
+        tuple: (allowed, retry_in) - retry_in is the seconds until the caller
+        should try again when the call is refused
+    """
+    if not CIRCUIT_BREAKER_ENABLED or platform not in PLATFORMS:
+        return True, 0.0
+    if SHARED_STATE_IN_PROCESS:
+        return _allow_in_process(circuit_key(platform))
+    try:
+        allowed, _state, retry_in = get_redis().eval(
+            _ALLOW_SCRIPT, 1, circuit_key(platform),
+            CIRCUIT_OPEN_SECONDS, CIRCUIT_HALF_OPEN_PROBES,
+        )
+        return bool(allowed), max(0.0, float(retry_in))
+    except redis.exceptions.RedisError as e:
+        print(f"⚠️ Circuit breaker unavailable, allowing call: {e}")
+        return True, 0.0
+
+
+def record(platform: str, failed: bool, elapsed: float):
+    """Record a call outcome and its duration in seconds"""
+    if not CIRCUIT_BREAKER_ENABLED or platform not in PLATFORMS:
+        return
+    slow = elapsed >= CIRCUIT_SLOW_CALL_SECONDS
+    if SHARED_STATE_IN_PROCESS:
+        state = _record_in_process(circuit_key(platform), failed, slow)
+    else:
+        try:
+            state = get_redis().eval(
+                _RECORD_SCRIPT, 1, circuit_key(platform),
+                int(failed), int(slow),
+                CIRCUIT_FAILURE_RATIO, CIRCUIT_SLOW_CALL_RATIO, CIRCUIT_MIN_CALLS,
+                CIRCUIT_WINDOW_SECONDS, CIRCUIT_HALF_OPEN_PROBES,
+            ).decode()
+        except redis.exceptions.RedisError as e:
+            print(f"⚠️ Circuit breaker unavailable, outcome not recorded: {e}")
+            return
+    if state == "open":
+        print(f"⚠️ Circuit for {platform} is open")
+
+
+def is_platform_failure(exc: Exception) -> bool:
+    """
+    Whether an exception says the platform itself is unhealthy
+
+    Server errors, timeouts and connection failures count; client errors
+    (bad key, validation, 429s handled by the rate limiter) do not.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500 or exc.response.status_code == 408
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
+
+@contextmanager
+def track(platform: str):
+    """Time the wrapped platform call and record its outcome with the breaker"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record(platform, is_platform_failure(e), time.perf_counter() - started)
+        raise
+    record(platform, False, time.perf_counter() - started)
+
+
+def get_state(platform: str) -> dict:
+    """Current breaker state for a platform, for monitoring"""
+    if SHARED_STATE_IN_PROCESS:
+        with _local_lock:
+            data = {k: str(v) for k, v in _local_circuits.get(circuit_key(platform), {}).items()}
+    else:
+        raw = get_redis().hgetall(circuit_key(platform))
+        data = {k.decode(): v.decode() for k, v in raw.items()}
+    state = data.get("state", "closed")
+    info = {
+        "platform": platform,
+        "state": state,
+        "calls_in_window": int(data.get("calls", 0)),
+        "failures_in_window": int(data.get("failures", 0)),
+        "slow_calls_in_window": int(data.get("slow_calls", 0)),
+        "trips": int(data.get("trips", 0)),
+        "trip_reason": data.get("trip_reason"),
+        "changed_at": float(data["changed_at"]) if "changed_at" in data else None,
+    }
+    if state == "open":
+        info["retry_in"] = max(0.0, float(data.get("opened_at", 0)) + CIRCUIT_OPEN_SECONDS - time.time())
+    return info
+
+
+def get_all_states() -> list:
+    """Breaker state for every platform that has one"""
+    return [get_state(platform) for platform in PLATFORMS]
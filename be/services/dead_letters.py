@@ -0,0 +1,180 @@
+# backend/services/dead_letters.py
+"""
+Dead-letter store for publishes that were given up on.
+
+When a publish fails for good (a non-retryable error, or its retries ran
+out) the full task arguments and error details are kept in the
+dead_letters table, not just the truncated error_message on PublishedPost.
+Dead letters can then be replayed in bulk, e.g. every Hashnode failure from
+the last hour once an outage is over. A replay hands the publishes back to
+the retry scheduler with their due times staggered batch by batch, so the
+retry sweeper sends them out at a controlled rate.
+"""
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+import httpx
+from sqlalchemy.orm import Session
+import crud, models
+
+DEAD_LETTER_MAX_BODY = int(os.getenv("DEAD_LETTER_MAX_BODY", "10000"))  # characters of response body kept
+REPLAY_BATCH_SIZE = int(os.getenv("REPLAY_BATCH_SIZE", "50"))
+REPLAY_BATCH_INTERVAL = float(os.getenv("REPLAY_BATCH_INTERVAL", "30"))
+REPLAY_MAX = int(os.getenv("REPLAY_MAX", "5000"))  # dead letters one replay request may touch
+
+# Response headers worth keeping for diagnosis; anything else may carry session data
+_KEPT_HEADERS = ("content-type", "retry-after", "x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset", "x-request-id")
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def describe_error(exc: Exception) -> dict:
+    """Everything worth keeping about a failed platform call, untruncated where it matters"""
+    details = {"type": type(exc).__name__, "message": str(exc)[:DEAD_LETTER_MAX_BODY]}
+    if isinstance(exc, httpx.HTTPStatusError):
+        response = exc.response
+        details.update(
+            status_code=response.status_code,
+            method=exc.request.method,
+            url=str(exc.request.url),
+            response_headers={name: value for name, value in response.headers.items() if name.lower() in _KEPT_HEADERS},
+            response_body=response.text[:DEAD_LETTER_MAX_BODY],
+        )
+    return details
+
+
+def record(db: Session, post_id: int, platform_name: str, task_args: dict, error_message: str,
+           details: dict = None, status_code: int = None, attempts: int = None, published_post_id: int = None,
+           task_name: str = "tasks.publish_to_platform_task"):
+    """
+    Keep a publish that was given up on; the caller commits
+
+    Args:
+        db: Database session
+        post_id, platform_name: The publish that failed
+        task_args: Arguments that reproduce the publish (as stored for the retry sweeper)
+        error_message: Short description of the final failure
+        details: Output of describe_error() plus any retry history (optional)
+        status_code: HTTP status of the final failure, if any
+        attempts: How many times the publish was tried
+        published_post_id: The PublishedPost row the publish writes to, if known
+        task_name: Task the arguments belong to
+
+    Returns:
+        DeadLetter: The new row
+    """
+    letter = models.DeadLetter(
+        published_post_id=published_post_id,
+        post_id=post_id,
+        user_id=task_args.get("user_id"),
+        platform_name=platform_name,
+        task_name=task_name,
+        task_args=task_args,
+        error_message=error_message,
+        error_details=details,
+        status_code=status_code if status_code is not None else (details or {}).get("status_code"),
+        attempts=attempts,
+        replay_count=0,
+    )
+    db.add(letter)
+    print(f"☠️ Dead-lettered {platform_name} publish of post {post_id}: {(error_message or '')[:120]}")
+    return letter
+
+
+def find(db: Session, platform_name: str = None, since: datetime = None, until: datetime = None,
+         post_id: int = None, user_id: int = None, status_code: int = None, ids: list = None,
+         include_replayed: bool = False):
+    """
+    Query dead letters matching the given filters, oldest failure first
+
+    Returns:
+        Query: Unexecuted query, so callers can count, page or limit it
+    """
+    DeadLetter = models.DeadLetter
+    query = db.query(DeadLetter)
+    if ids:
+        query = query.filter(DeadLetter.id.in_(ids))
+    if platform_name:
+        query = query.filter(DeadLetter.platform_name == platform_name)
+    if since:
+        query = query.filter(DeadLetter.failed_at >= since)
+    if until:
+        query = query.filter(DeadLetter.failed_at < until)
+    if post_id:
+        query = query.filter(DeadLetter.post_id == post_id)
+    if user_id:
+        query = query.filter(DeadLetter.user_id == user_id)
+    if status_code:
+        query = query.filter(DeadLetter.status_code == status_code)
+    if not include_replayed:
+        query = query.filter(DeadLetter.replayed_at.is_(None))
+    return query.order_by(DeadLetter.failed_at, DeadLetter.id)
+
+
+def replay(db: Session, letters: list, batch_size: int = None, batch_interval: float = None, now: datetime = None) -> dict:
+    """
+    Put dead-lettered publishes back on the retry schedule, batch_size at a time
+
+    Batch n is due batch_interval * n seconds from now, so the retry sweeper
+    releases the replay at a steady rate instead of all at once. Every replay
+    gets a fresh task id and a full set of retries, and runs in the bulk lane.
+
+    Returns:
+        dict: {"task_ids": {dead_letter_id: task_id}, "batches": int, "last_batch_at": datetime or None}
+    """
+    batch_size = max(1, batch_size or REPLAY_BATCH_SIZE)
+    batch_interval = REPLAY_BATCH_INTERVAL if batch_interval is None else batch_interval
+    now = now or utcnow()
+
+    # Current PublishedPost row of every (post, platform) being replayed, in one query
+    row_ids = dict(
+        ((post_id, platform_name), published_post_id)
+        for published_post_id, post_id, platform_name in db.query(
+            models.PublishedPost.id, models.PublishedPost.original_post_id, models.PublishedPost.platform_name
+        ).filter(models.PublishedPost.original_post_id.in_({letter.post_id for letter in letters}))
+    ) if letters else {}
+
+    task_ids = {}
+    updates = {}
+    last_batch_at = None
+    for position, letter in enumerate(letters):
+        due_at = now + timedelta(seconds=batch_interval * (position // batch_size))
+        task_id = str(uuid.uuid4())
+        task_args = dict(letter.task_args, task_id=task_id, lane="bulk")
+
+        published_post_id = row_ids.get((letter.post_id, letter.platform_name))
+        if published_post_id is None:
+            published_post_id = crud.create_published_post(db, letter.post_id, letter.platform_name)
+            row_ids[(letter.post_id, letter.platform_name)] = published_post_id
+        # A publish dead-lettered more than once is only replayed once (the latest wins)
+        updates[published_post_id] = {
+            "id": published_post_id,
+            "status": "pending",
+            "error_message": None,
+            "retry_count": 0,
+            "next_retry_at": due_at,
+            "task_id": task_id,
+            "error_details": {"replay_of": letter.id, "task": task_args},
+        }
+
+        letter.published_post_id = published_post_id
+        letter.replay_count = (letter.replay_count or 0) + 1
+        letter.replayed_at = now
+        letter.replay_task_id = task_id
+        task_ids[letter.id] = task_id
+        last_batch_at = due_at
+
+    crud.update_published_posts(db, list(updates.values()))
+    for post_id in {letter.post_id for letter in letters}:
+        crud.set_post_publish_status(db, post_id, "publishing")
+    db.commit()
+
+    if letters:
+        print(f"♻️ Replaying {len(letters)} dead-lettered publishes in batches of {batch_size}")
+    return {
+        "task_ids": task_ids,
+        "batches": (len(letters) + batch_size - 1) // batch_size,
+        "last_batch_at": last_batch_at,
+    }
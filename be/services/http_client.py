@@ -0,0 +1,237 @@
+# backend/services/http_client.py
+"""
+Process-wide pooled HTTP clients for outbound platform calls.
+
+One httpx.AsyncClient is kept per (event loop, platform) so keep-alive
+connections to dev.to and Hashnode are reused across publishes instead of
+paying a new TCP/TLS handshake on every call. The FastAPI app closes the
+registry on shutdown and the Celery worker closes it when its process exits.
+
+Synchronous callers go through run_sync(). By default each thread gets its
+own long-lived loop; with enable_shared_loop() (the asyncio worker profile) every
+thread submits to one background loop per process instead, so many publishes
+share a single set of connection pools and run concurrently on it, at most
+PUBLISH_MAX_IN_FLIGHT at a time.
+"""
+import asyncio
+import concurrent.futures
+import os
+import threading
+import weakref
+import httpx
+from services import rate_limiter
+
+# Base URL for each platform host we talk to; override to point at a
+# local stand-in such as mock_platform_server.py
+PLATFORM_BASE_URLS = {
+    "dev.to": os.getenv("DEVTO_API_BASE_URL", "https://dev.to/api"),
+    "hashnode": os.getenv("HASHNODE_API_BASE_URL", "https://gql.hashnode.com"),
+}
+
+# Pool configuration (all overridable from the environment)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_WRITE_TIMEOUT = float(os.getenv("HTTP_WRITE_TIMEOUT", "30"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "10"))
+HTTP_ENABLE_HTTP2 = os.getenv("HTTP_ENABLE_HTTP2", "false").lower() in ("1", "true", "yes")
+
+# HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 without it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+if HTTP_ENABLE_HTTP2 and not HTTP2_AVAILABLE:
+    print("⚠️ HTTP_ENABLE_HTTP2 is set but the 'h2' package is not installed, using HTTP/1.1")
+
+# {event loop: {platform: AsyncClient}}; weak so loops closed elsewhere don't leak
+_clients = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+# Long-lived loops (one per thread) used by synchronous callers such as Celery
+# tasks and sync FastAPI endpoints, so pooled connections survive between calls
+# instead of dying with asyncio.run()
+_thread_state = threading.local()
+_sync_loops = set()
+
+# Shared-loop mode: one background event loop per process for every run_sync() caller
+PUBLISH_MAX_IN_FLIGHT = int(os.getenv("PUBLISH_MAX_IN_FLIGHT", "100"))
+_shared_loop_enabled = False
+_shared_loop = None
+_shared_loop_thread = None
+_in_flight = None  # asyncio.Semaphore owned by the shared loop
+
+
+def _build_client(platform: str) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        connect=HTTP_CONNECT_TIMEOUT,
+        read=HTTP_READ_TIMEOUT,
+        write=HTTP_WRITE_TIMEOUT,
+        pool=HTTP_POOL_TIMEOUT,
+    )
+
+    # Feed 429s and rate-limit headers back into the shared limiter
+    async def observe_rate_limit(response):
+        await rate_limiter.observe_response_async(platform, response)
+
+    return httpx.AsyncClient(
+        base_url=PLATFORM_BASE_URLS.get(platform, ""),
+        limits=limits,
+        timeout=timeout,
+        http2=HTTP_ENABLE_HTTP2 and HTTP2_AVAILABLE,
+        event_hooks={"response": [observe_rate_limit]},
+    )
+
+
+def get_client(platform: str) -> httpx.AsyncClient:
+    """
+    Get the pooled client for a platform on the running event loop
+
+    Args:
+        platform: Platform name ('dev.to', 'hashnode')
+
+    Returns:
+        httpx.AsyncClient: Shared client with keep-alive pool for that host
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        loop_clients = _clients.setdefault(loop, {})
+        client = loop_clients.get(platform)
+        if client is None or client.is_closed:
+            client = _build_client(platform)
+            loop_clients[platform] = client
+    return client
+
+
+async def aclose_all():
+    """Close every client created on the running event loop"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        loop_clients = _clients.pop(loop, {})
+    for client in loop_clients.values():
+        await client.aclose()
+
+
+def enable_shared_loop(max_in_flight: int = None):
+    """
+    Route run_sync() through one background event loop for the whole process
+
+    The loop thread itself is started lazily on first use, so this is safe to
+    call before a worker forks its children.
+
+    Args:
+        max_in_flight: Coroutines allowed to run on the loop at once
+                       (defaults to PUBLISH_MAX_IN_FLIGHT)
+    """
+    global _shared_loop_enabled, PUBLISH_MAX_IN_FLIGHT
+    if max_in_flight:
+        PUBLISH_MAX_IN_FLIGHT = max_in_flight
+    _shared_loop_enabled = True
+
+
+def _get_shared_loop():
+    global _shared_loop, _shared_loop_thread, _in_flight
+    with _lock:
+        if _shared_loop is None or _shared_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=run, name="publish-event-loop", daemon=True)
+            thread.start()
+            ready.wait()
+            _shared_loop, _shared_loop_thread = loop, thread
+            _in_flight = asyncio.Semaphore(PUBLISH_MAX_IN_FLIGHT)
+        return _shared_loop
+
+
+async def _run_limited(coro):
+    async with _in_flight:
+        return await coro
+
+
+def submit(coro) -> concurrent.futures.Future:
+    """
+    Schedule a coroutine on the shared background loop without waiting for it
+
+    Returns:
+        concurrent.futures.Future: Resolves with the coroutine's result
+    """
+    loop = _get_shared_loop()
+    return asyncio.run_coroutine_threadsafe(_run_limited(coro), loop)
+
+
+def run_sync(coro):
+    """
+    Run a coroutine from synchronous code and wait for its result
+
+    Used instead of asyncio.run() so that clients created by get_client()
+    keep their connections warm across Celery tasks and sync endpoints.
+    Runs on the shared background loop when enable_shared_loop() was called,
+    otherwise on this thread's own long-lived loop.
+    """
+    if _shared_loop_enabled:
+        return submit(coro).result()
+
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+        with _lock:
+            _sync_loops.add(loop)
+    return loop.run_until_complete(coro)
+
+
+def close_sync_loops():
+    """Close the clients owned by every run_sync() loop and the loops themselves"""
+    global _shared_loop, _shared_loop_thread
+    with _lock:
+        loops = list(_sync_loops)
+        _sync_loops.clear()
+        shared_loop, shared_thread = _shared_loop, _shared_loop_thread
+        _shared_loop = _shared_loop_thread = None
+
+    if shared_loop is not None and not shared_loop.is_closed():
+        try:
+            asyncio.run_coroutine_threadsafe(aclose_all(), shared_loop).result(timeout=10)
+        except Exception as e:
+            print(f"⚠️ Could not close shared-loop HTTP clients cleanly: {e}")
+        shared_loop.call_soon_threadsafe(shared_loop.stop)
+        shared_thread.join(timeout=10)
+        if not shared_loop.is_running():
+            shared_loop.close()
+
+    for loop in loops:
+        if loop.is_closed() or loop.is_running():
+            continue
+        loop.run_until_complete(aclose_all())
+        loop.close()
+
+
+def reset_after_fork():
+    """
+    Drop clients inherited from a parent process without closing them
+
+    Sockets copied across fork() belong to the parent, so a forked worker
+    child must start with an empty registry.
+    """
+    global _clients, _lock, _thread_state, _sync_loops, _shared_loop, _shared_loop_thread, _in_flight
+    _clients = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+    _thread_state = threading.local()
+    _sync_loops = set()
+    # The loop thread didn't survive fork(); the next run_sync() starts a new one
+    _shared_loop = _shared_loop_thread = _in_flight = None
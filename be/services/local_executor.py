@@ -0,0 +1,266 @@
+# backend/services/local_executor.py
+"""
+Broker-less publishing: the API process runs publishes itself.
+
+With PUBLISH_EXECUTOR=local, publish requests aren't sent to Celery. Every
+platform publish becomes a job on an asyncio queue in the API process, run by
+at most LOCAL_EXECUTOR_CONCURRENCY workers. A job runs the same code as
+publish_to_platform_task (circuit breaker, rate limit, skip-if-unchanged,
+database retries, dead letters), with its platform calls on one shared event
+loop, so a request returns as soon as its jobs are queued.
+
+Jobs are persisted on their PublishedPost row (status 'pending', arguments in
+error_details["task"], as the retry sweeper stores them) before they are
+queued, and rows a restart left pending or processing are queued again at
+startup. A poll loop stands in for Celery beat: it claims due retries and
+scheduled publishes with the same SKIP LOCKED queries.
+
+Task ids and the status API work as with Celery. States come from memory,
+or from the PublishedPost row once a restart has cleared that. Run a single
+API process in this mode: startup recovery assumes no other process is
+working on the jobs.
+
+/api/posts/publish-direct always uses this executor, whatever the mode.
+"""
+import asyncio
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from celery import states
+from sqlalchemy.orm import Session
+from celery_utils import PUBLISH_EXECUTOR
+from database import SessionLocal
+import models
+from services import http_client, retry_scheduler, publish_scheduler, renditions
+
+LOCAL_EXECUTOR_CONCURRENCY = int(os.getenv("LOCAL_EXECUTOR_CONCURRENCY", "4"))
+# How often due retries and scheduled publishes are picked up
+LOCAL_EXECUTOR_POLL_INTERVAL = float(os.getenv("LOCAL_EXECUTOR_POLL_INTERVAL", "15"))
+_RESULTS_MAX = 10000
+
+_loop = None
+_queue = None
+_pool = None
+_tasks = []
+_results = OrderedDict()  # task id -> {"status": ..., "result": ...}, like the result backend's meta
+_results_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    """Whether publishes run in the API process instead of on Celery workers"""
+    return PUBLISH_EXECUTOR == "local"
+
+
+def _record(task_id: str, status: str, result=None):
+    with _results_lock:
+        _results[task_id] = {"status": status, "result": result}
+        _results.move_to_end(task_id)
+        while len(_results) > _RESULTS_MAX:
+            _results.popitem(last=False)
+
+
+def platform_jobs(user_id: int, post_id: int, canonical_urls: dict, task_ids: dict, tags: list = None,
+                  hashnode_publication_id: str = None, lane: str = None) -> list:
+    """One job (publish_to_platform_task arguments) per platform of a publish request"""
+    from tasks import _platform_task_args
+    return [
+        _platform_task_args(
+            user_id, post_id, platform_name, canonical_url, hashnode_publication_id, tags,
+            task_ids.get(platform_name) or str(uuid.uuid4()), lane
+        )
+        for platform_name, canonical_url in canonical_urls.items()
+    ]
+
+
+def submit(db: Session, jobs: list):
+    """
+    Persist jobs on their PublishedPost rows, commit, and queue them
+
+    Call after committing the rows themselves (they must exist).
+    """
+    for job in jobs:
+        db.query(models.PublishedPost).filter_by(original_post_id=job["post_id"], platform_name=job["platform_name"]).update(
+            {"status": "pending", "task_id": job["task_id"], "next_retry_at": None, "error_details": {"task": job}},
+            synchronize_session=False
+        )
+    db.commit()
+    for job in jobs:
+        _enqueue(job)
+
+
+def _enqueue(job: dict):
+    """Thread-safe: queue a persisted job on the executor's loop"""
+    _record(job["task_id"], states.PENDING)
+    if _loop is None or _loop.is_closed():
+        print(f"⚠️ Local executor not running; {job['platform_name']} publish of post {job['post_id']} runs after the next startup")
+        return
+    _loop.call_soon_threadsafe(_queue.put_nowait, job)
+
+
+def _run(job: dict):
+    """Run one job on a pool thread, as publish_to_platform_task would run on a worker"""
+    from tasks import publish_to_platform_task
+    task_id = job["task_id"]
+    _record(task_id, states.STARTED)
+    outcome = publish_to_platform_task.apply(
+        kwargs={
+            "user_id": job.get("user_id"),
+            "post_id": job["post_id"],
+            "platform_name": job["platform_name"],
+            "canonical_url_on_your_site": job.get("canonical_url_on_your_site"),
+            "hashnode_publication_id": job.get("hashnode_publication_id"),
+            "tags": job.get("tags"),
+        },
+        task_id=task_id,
+    )
+    _record(task_id, outcome.state, outcome.result if outcome.successful() else repr(outcome.result))
+
+
+async def _worker():
+    while True:
+        job = await _queue.get()
+        try:
+            await _loop.run_in_executor(_pool, _run, job)
+        except Exception as e:
+            print(f"⚠️ Local publish job {job.get('task_id')} crashed: {e}")
+        finally:
+            _queue.task_done()
+
+
+def _recover() -> int:
+    """Queue the jobs a restart interrupted: pending or processing rows with no retry scheduled"""
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(models.PublishedPost.error_details)
+            .filter(
+                models.PublishedPost.status.in_(("pending", "processing")),
+                models.PublishedPost.next_retry_at.is_(None),
+            )
+            .all()
+        )
+        jobs = [(row.error_details or {}).get("task") for row in rows]
+        jobs = [job for job in jobs if job and job.get("task_id")]
+        for job in jobs:
+            _enqueue(job)
+        return len(jobs)
+    finally:
+        db.close()
+
+
+def _sweep() -> int:
+    """Queue due retries and due scheduled publishes (what beat's tasks do for Celery)"""
+    db = SessionLocal()
+    queued = 0
+    try:
+        # Claimed retries already carry their arguments on the row
+        for published_post_id, post_id, platform_name, author_id, task_args in retry_scheduler.claim_due_retries(db):
+            job = dict(task_args, post_id=post_id, platform_name=platform_name, user_id=task_args.get("user_id") or author_id)
+            job.setdefault("canonical_url_on_your_site", renditions.canonical_url_for(post_id, platform_name))
+            job["task_id"] = job.get("task_id") or str(uuid.uuid4())
+            _enqueue(job)
+            queued += 1
+
+        for scheduled in publish_scheduler.claim_due_publishes(db):
+            jobs = platform_jobs(
+                scheduled["user_id"], scheduled["post_id"], scheduled["canonical_urls"], scheduled["task_ids"] or {},
+                tags=scheduled["tags"], hashnode_publication_id=scheduled["hashnode_publication_id"], lane="bulk",
+            )
+            submit(db, jobs)
+            queued += len(jobs)
+        return queued
+    finally:
+        db.close()
+
+
+async def _poll():
+    while True:
+        await asyncio.sleep(LOCAL_EXECUTOR_POLL_INTERVAL)
+        try:
+            queued = await asyncio.to_thread(_sweep)
+            if queued:
+                print(f"🔁 Local executor queued {queued} due publishes")
+        except Exception as e:
+            print(f"⚠️ Local executor sweep failed: {e}")
+
+
+async def start():
+    """Start the workers on the running loop (API startup); with PUBLISH_EXECUTOR=local also recover and poll"""
+    global _loop, _queue, _pool
+    _loop = asyncio.get_running_loop()
+    _queue = asyncio.Queue()
+    _pool = ThreadPoolExecutor(max_workers=LOCAL_EXECUTOR_CONCURRENCY, thread_name_prefix="local-publish")
+    # Platform calls of all jobs run concurrently on one loop; the pool threads only do database work
+    http_client.enable_shared_loop()
+    _tasks[:] = [asyncio.create_task(_worker()) for _ in range(LOCAL_EXECUTOR_CONCURRENCY)]
+
+    if enabled():
+        _tasks.append(asyncio.create_task(_poll()))
+        try:
+            recovered = await asyncio.to_thread(_recover)
+            if recovered:
+                print(f"♻️ Local executor re-queued {recovered} interrupted publishes")
+        except Exception as e:
+            print(f"⚠️ Local executor could not recover pending publishes: {e}")
+        print(f"✅ Local publish executor running ({LOCAL_EXECUTOR_CONCURRENCY} concurrent publishes, no broker)")
+
+
+async def stop():
+    """Stop taking jobs (API shutdown); jobs still queued or running are recovered at the next startup"""
+    global _loop
+    for task in _tasks:
+        task.cancel()
+    _tasks.clear()
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _loop = None
+
+
+def task_metas(task_ids: list) -> dict:
+    """
+    State of tasks run by this executor, shaped like result backend metas
+
+    Ids this process hasn't seen are looked up on their PublishedPost row in
+    local mode (states survive a restart there); otherwise they are left out.
+
+    Returns:
+        dict: {task_id: {"status": ..., "result": ...}} for the ids known here
+    """
+    with _results_lock:
+        metas = {task_id: _results[task_id] for task_id in task_ids if task_id in _results}
+    missing = [task_id for task_id in task_ids if task_id not in metas]
+    if missing and enabled():
+        metas.update(_metas_from_rows(missing))
+    return metas
+
+
+def _metas_from_rows(task_ids: list) -> dict:
+    from tasks import _platform_result
+    db = SessionLocal()
+    try:
+        rows = db.query(models.PublishedPost).filter(models.PublishedPost.task_id.in_(task_ids)).all()
+    finally:
+        db.close()
+
+    metas = {}
+    for pp in rows:
+        if pp.status == "success":
+            result = _platform_result(
+                "success", pp.platform_name, pp.original_post_id,
+                post_url=pp.platform_post_url, platform_post_id=pp.platform_post_id
+            )
+            metas[pp.task_id] = {"status": states.SUCCESS, "result": result}
+        elif pp.status == "failed":
+            result = _platform_result("error", pp.platform_name, pp.original_post_id, message=pp.error_message)
+            metas[pp.task_id] = {"status": states.SUCCESS, "result": result}
+        elif pp.status == "pending" and pp.next_retry_at:
+            result = _platform_result(
+                "retry_scheduled", pp.platform_name, pp.original_post_id,
+                message=pp.error_message, retry_at=pp.next_retry_at.isoformat()
+            )
+            metas[pp.task_id] = {"status": states.SUCCESS, "result": result}
+        elif pp.status == "processing":
+            metas[pp.task_id] = {"status": states.STARTED, "result": None}
+    return metas
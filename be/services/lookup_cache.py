@@ -0,0 +1,98 @@
+# backend/services/lookup_cache.py
+"""
+In-process TTL cache with single-flight loading for async lookups.
+
+Concurrent callers asking for the same missing key share one in-flight
+load instead of each calling upstream. With background_refresh, an entry
+close to expiry is served from cache while a single refresh runs in the
+background, so hot keys never block on the upstream API.
+Failed loads are not cached.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+
+class AsyncTTLCache:
+    def __init__(self, ttl: float, maxsize: int = 1024, refresh_ahead: float = 0):
+        """
+        Args:
+            ttl: Seconds an entry stays valid
+            maxsize: Entries kept before the least recently used is evicted
+            refresh_ahead: Seconds before expiry when background_refresh kicks in
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.refresh_ahead = min(refresh_ahead, ttl)
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}  # (loop, key) -> Task
+        self._lock = threading.Lock()
+
+    def _get_entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _load(self, key, loader):
+        """Start (or join) the single in-flight load for key on the running loop"""
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            task = self._inflight.get(flight_key)
+            if task is None:
+                task = loop.create_task(self._run_loader(flight_key, key, loader))
+                self._inflight[flight_key] = task
+        return task
+
+    async def _run_loader(self, flight_key, key, loader):
+        try:
+            value = await loader()
+            self._store(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(flight_key, None)
+
+    async def get_or_load(self, key, loader, background_refresh: bool = False):
+        """
+        Return the cached value for key, loading it with loader() if needed
+
+        Args:
+            key: Hashable cache key
+            loader: Zero-argument coroutine function fetching the value
+            background_refresh: Serve entries near expiry from cache and refresh them in the background
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        entry = self._get_entry(key)
+        now = time.monotonic()
+        if entry is not None:
+            expires_at, value = entry
+            if now < expires_at:
+                if background_refresh and now >= expires_at - self.refresh_ahead:
+                    task = self._load(key, loader)
+                    # Nobody awaits a background refresh; don't let its failure go unretrieved
+                    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                return value
+
+        # shield() so one cancelled caller doesn't cancel the load for everyone sharing it
+        return await asyncio.shield(self._load(key, loader))
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
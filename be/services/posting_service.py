@@ -1,4 +1,9 @@
 # backend/services/posting_service.py
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
 import httpx
 from sqlalchemy.orm import Session
 import sys
@@ -7,6 +12,27 @@ import os
 # Add the parent directory to Python path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import PlatformCredential
+from services.http_client import get_client
+from services.lookup_cache import AsyncTTLCache
+from services.rate_limiter import credential_fingerprint
+
+
+class PlatformPostNotFound(Exception):
+    """The article we tried to update no longer exists on the platform"""
+
+
+def content_fingerprint(title: str, markdown_content: str, tags: list = None, canonical_url: str = None) -> str:
+    """
+    Hash of everything that ends up in a published article
+
+    Stored on PublishedPost after a successful publish so re-publishing
+    unchanged content can be skipped.
+    """
+    payload = json.dumps(
+        {"title": title, "body": markdown_content, "tags": list(tags or []), "canonical_url": canonical_url},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 # --- Dev.to Posting ---
@@ -36,36 +62,57 @@ async def post_to_devto(api_key: str, title: str, markdown_content: str, canonic
     if canonical_url:
         payload["article"]["canonical_url"] = canonical_url
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post("https://dev.to/api/articles", json=payload, headers=headers)
+    client = get_client("dev.to")
+    response = await client.post("/articles", json=payload, headers=headers)
     response.raise_for_status()  # Will raise an exception for 4XX/5XX errors
     return response.json()
 
 
-# --- Hashnode Posting ---
-async def post_to_hashnode(api_key: str, publication_id: str, title: str, markdown_content: str, tags_data: list = None, cover_image_url: str = None, canonical_url: str = None):
+async def update_devto_article(api_key: str, article_id: str, title: str, markdown_content: str, canonical_url: str = None, tags: list = None):
     """
-    Post an article to Hashnode - creates a draft and then publishes it
+    Update an existing Dev.to article in place
     
     Args:
-        api_key: Hashnode Personal Access Token
-        publication_id: ID of the Hashnode publication
+        api_key: Dev.to API key
+        article_id: ID of the article returned when it was first published
         title: Article title
         markdown_content: Article content in markdown format
-        tags_data: List of tag objects with name (will be converted to proper format)
-        cover_image_url: Optional cover image URL
         canonical_url: Optional canonical URL for SEO
+        tags: Optional list of tags (max 4 tags allowed by Dev.to)
     
     Returns:
-        dict: Response from Hashnode API
+        dict: Response from Dev.to API containing article details
     """
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-    
-    # Convert simple tag names to proper Hashnode tag format
+    headers = {"api-key": api_key, "Content-Type": "application/json"}
+    payload = {
+        "article": {
+            "title": title,
+            "body_markdown": markdown_content,
+            "published": True,
+            "tags": tags if tags else [],
+        }
+    }
+    if canonical_url:
+        payload["article"]["canonical_url"] = canonical_url
+
+    client = get_client("dev.to")
+    response = await client.put(f"/articles/{article_id}", json=payload, headers=headers)
+    if response.status_code == 404:
+        raise PlatformPostNotFound(f"Dev.to article {article_id} not found")
+    response.raise_for_status()
+    return response.json()
+
+
+# --- Hashnode Posting ---
+def format_hashnode_tags(tags_data: list = None):
+    """Convert simple tag names (or {"name": ...} dicts) to Hashnode's {slug, name} format"""
     formatted_tags = []
     if tags_data:
         for tag in tags_data:
-            if isinstance(tag, dict) and "name" in tag:
+            if isinstance(tag, dict) and "slug" in tag and "name" in tag:
+                # Already in Hashnode format (e.g. from a cached rendition)
+                formatted_tags.append({"slug": tag["slug"], "name": tag["name"]})
+            elif isinstance(tag, dict) and "name" in tag:
                 tag_name = tag["name"]
                 # Create slug from name (lowercase, replace spaces with hyphens)
                 tag_slug = tag_name.lower().replace(" ", "-").replace("_", "-")
@@ -79,8 +126,19 @@ async def post_to_hashnode(api_key: str, publication_id: str, title: str, markdo
                     "slug": tag_slug,
                     "name": tag
                 })
+    return formatted_tags
+
+
+async def create_hashnode_draft(api_key: str, publication_id: str, title: str, markdown_content: str, tags_data: list = None, cover_image_url: str = None, canonical_url: str = None):
+    """
+    Step 1 of a Hashnode publish: create a draft
+    
+    Returns:
+        dict: createDraft payload from the Hashnode API (draft id, slug, title)
+    """
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    formatted_tags = format_hashnode_tags(tags_data)
     
-    # Step 1: Create a draft
     create_draft_query = """
         mutation CreateDraft($input: CreateDraftInput!) {
             createDraft(input: $input) {
@@ -111,9 +169,8 @@ async def post_to_hashnode(api_key: str, publication_id: str, title: str, markdo
     
     create_payload = {"query": create_draft_query, "variables": {"input": post_input}}
 
-    async with httpx.AsyncClient() as client:
-        # Create the draft
-        response = await client.post("https://gql.hashnode.com/", json=create_payload, headers=headers)
+    client = get_client("hashnode")
+    response = await client.post("/", json=create_payload, headers=headers)
     
     # Check for HTTP errors
     if response.status_code != 200:
@@ -132,10 +189,22 @@ async def post_to_hashnode(api_key: str, publication_id: str, title: str, markdo
     if not draft_data or not draft_data.get("id"):
         raise Exception(f"Failed to create draft: {create_data}")
     
-    draft_id = draft_data["id"]
-    print(f"✅ Draft created successfully with ID: {draft_id}")
+    print(f"✅ Draft created successfully with ID: {draft_data['id']}")
+    return create_data["data"]["createDraft"]
+
+
+class HashnodeDraftError(Exception):
+    """publishDraft was rejected by the API (e.g. the draft no longer exists)"""
+
+
+async def publish_hashnode_draft(api_key: str, draft_id: str):
+    """
+    Step 2 of a Hashnode publish: publish an existing draft
     
-    # Step 2: Publish the draft
+    Returns:
+        dict: publishDraft payload from the Hashnode API (post id, slug, url, ...)
+    """
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
     publish_draft_query = """
         mutation PublishDraft($input: PublishDraftInput!) {
             publishDraft(input: $input) {
@@ -156,9 +225,8 @@ async def post_to_hashnode(api_key: str, publication_id: str, title: str, markdo
     
     publish_payload = {"query": publish_draft_query, "variables": {"input": publish_input}}
     
-    async with httpx.AsyncClient() as client:
-        # Publish the draft
-        response = await client.post("https://gql.hashnode.com/", json=publish_payload, headers=headers)
+    client = get_client("hashnode")
+    response = await client.post("/", json=publish_payload, headers=headers)
     
     # Check for HTTP errors
     if response.status_code != 200:
@@ -170,13 +238,179 @@ async def post_to_hashnode(api_key: str, publication_id: str, title: str, markdo
     publish_data = response.json()
     
     if "errors" in publish_data:
-        raise Exception(f"Hashnode Publish Draft API error: {publish_data['errors']}")
+        raise HashnodeDraftError(f"Hashnode Publish Draft API error: {publish_data['errors']}")
     
     # Check if publishing was successful
     post_data = publish_data.get("data", {}).get("publishDraft", {}).get("post")
     if not post_data:
-        raise Exception(f"Failed to publish draft: {publish_data}")
+        raise HashnodeDraftError(f"Failed to publish draft: {publish_data}")
+    
+    return publish_data["data"]["publishDraft"]
+
+
+async def get_hashnode_draft(api_key: str, draft_id: str):
+    """
+    Look up a Hashnode draft
+
+    Returns:
+        dict or None: The draft (id, slug, title), None if it no longer exists
+    """
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    draft_query = """
+        query Draft($id: ObjectId!) {
+            draft(id: $id) {
+                id
+                slug
+                title
+            }
+        }
+    """
+    client = get_client("hashnode")
+    response = await client.post("/", json={"query": draft_query, "variables": {"id": draft_id}}, headers=headers)
+    response.raise_for_status()
+
+    draft_data = response.json()
+    if "errors" in draft_data:
+        if any((error.get("extensions") or {}).get("code") == "NOT_FOUND" for error in draft_data["errors"]):
+            return None
+        raise Exception(f"Hashnode Draft API error: {draft_data['errors']}")
+    return (draft_data.get("data") or {}).get("draft")
+
+
+def object_id_time(object_id: str):
+    """
+    Creation time of a Hashnode id (a MongoDB ObjectId starts with its epoch seconds)
+
+    Returns:
+        datetime or None: UTC creation time, None if the id isn't an ObjectId
+    """
+    if not object_id or len(object_id) != 24:
+        return None
+    try:
+        return datetime.fromtimestamp(int(object_id[:8], 16), tz=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _published_at(post: dict):
+    try:
+        return datetime.fromisoformat(post["publishedAt"].replace("Z", "+00:00"))
+    except (KeyError, AttributeError, ValueError):
+        return None
+
+
+async def find_hashnode_post(api_key: str, publication_id: str, title: str, published_since: datetime):
+    """
+    Most recent post of a publication with this title published since a given time,
+    e.g. the post a draft created at published_since became
+
+    Older posts with the same title are someone else's publish, never this draft's.
+
+    Returns:
+        dict or None: The post (id, slug, title, url, publishedAt), None if there is none
+    """
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    posts_query = """
+        query PublicationPosts($id: ObjectId!, $first: Int!) {
+            publication(id: $id) {
+                posts(first: $first) {
+                    edges {
+                        node {
+                            id
+                            slug
+                            title
+                            url
+                            publishedAt
+                        }
+                    }
+                }
+            }
+        }
+    """
+    client = get_client("hashnode")
+    response = await client.post(
+        "/", json={"query": posts_query, "variables": {"id": publication_id, "first": 20}}, headers=headers
+    )
+    response.raise_for_status()
+
+    posts_data = response.json()
+    if "errors" in posts_data:
+        raise Exception(f"Hashnode Publication Posts API error: {posts_data['errors']}")
+    publication = (posts_data.get("data") or {}).get("publication") or {}
+    for edge in (publication.get("posts") or {}).get("edges", []):
+        post = edge["node"]
+        published_at = _published_at(post)
+        if post.get("title") == title and published_at is not None and published_at >= published_since:
+            return post  # newest first
+    return None
+
+
+async def post_to_hashnode(api_key: str, publication_id: str, title: str, markdown_content: str, tags_data: list = None, cover_image_url: str = None, canonical_url: str = None, draft_id: str = None, on_draft_created=None):
+    """
+    Post an article to Hashnode - creates a draft and then publishes it
+    
+    The two steps can be resumed: pass the draft_id of a draft created by an
+    earlier attempt to skip straight to publishing it, and use on_draft_created
+    to persist the new draft's id before the publish step runs. If the saved
+    draft can't be published, a new one is only created once the draft is
+    confirmed gone; if it turns out to be published already (a post with this
+    title published after the draft was created), that post is returned.
+    
+    Args:
+        api_key: Hashnode Personal Access Token
+        publication_id: ID of the Hashnode publication
+        title: Article title
+        markdown_content: Article content in markdown format
+        tags_data: List of tag objects with name (will be converted to proper format)
+        cover_image_url: Optional cover image URL
+        canonical_url: Optional canonical URL for SEO
+        draft_id: Optional draft created by a previous attempt to publish instead
+        on_draft_created: Optional callback(draft_id) run after step 1 succeeds
     
+    Returns:
+        dict: Response from Hashnode API
+    """
+    create_draft = None
+    resumed = bool(draft_id)
+
+    if resumed:
+        print(f"↪️ Resuming Hashnode publish from draft {draft_id}")
+        try:
+            publish_draft = await publish_hashnode_draft(api_key, draft_id)
+        except HashnodeDraftError as e:
+            if await get_hashnode_draft(api_key, draft_id) is not None:
+                # The draft is still there, so it wasn't published; a fresh draft would only duplicate it
+                raise
+            # Publishing consumes the draft: an earlier attempt may have published it and
+            # died before recording that. Record that post instead of publishing it again,
+            # but only a post published after the draft was created can be it.
+            draft_created_at = object_id_time(draft_id)
+            published_post = draft_created_at and await find_hashnode_post(
+                api_key, publication_id, title, published_since=draft_created_at
+            )
+            if published_post:
+                print(f"↪️ Saved draft {draft_id} was already published as {published_post.get('url')}")
+                publish_draft = {"post": published_post}
+            else:
+                # The saved draft was deleted without being published; start over with a fresh one
+                print(f"⚠️ Saved draft {draft_id} no longer exists, creating a new one: {e}")
+                resumed = False
+
+    if not resumed:
+        # Step 1: Create a draft
+        create_draft = await create_hashnode_draft(
+            api_key, publication_id, title, markdown_content,
+            tags_data=tags_data, cover_image_url=cover_image_url, canonical_url=canonical_url
+        )
+        draft_id = create_draft["draft"]["id"]
+        if on_draft_created:
+            # Callbacks typically write to the DB; keep that off the event loop
+            await asyncio.to_thread(on_draft_created, draft_id)
+
+        # Step 2: Publish the draft
+        publish_draft = await publish_hashnode_draft(api_key, draft_id)
+
+    post_data = publish_draft["post"]
     print(f"🎉 Post published successfully!")
     print(f"   Post ID: {post_data.get('id')}")
     print(f"   Post URL: {post_data.get('url')}")
@@ -185,16 +419,77 @@ async def post_to_hashnode(api_key: str, publication_id: str, title: str, markdo
     # Return combined information
     return {
         "data": {
-            "createDraft": create_data["data"]["createDraft"],
-            "publishDraft": publish_data["data"]["publishDraft"]
+            "createDraft": create_draft,
+            "publishDraft": publish_draft
         },
         "draft_id": draft_id,
+        "resumed_from_draft": resumed,
         "post_id": post_data.get("id"),
         "post_url": post_data.get("url"),
         "published_at": post_data.get("publishedAt")
     }
 
 
+async def update_hashnode_post(api_key: str, post_id: str, title: str, markdown_content: str, tags_data: list = None, canonical_url: str = None):
+    """
+    Update an already published Hashnode post in place
+    
+    Args:
+        api_key: Hashnode Personal Access Token
+        post_id: ID of the published Hashnode post
+        title: Article title
+        markdown_content: Article content in markdown format
+        tags_data: List of tag objects with name (will be converted to proper format)
+        canonical_url: Optional canonical URL for SEO
+    
+    Returns:
+        dict: updatePost payload from the Hashnode API (post id, slug, url)
+    """
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    update_post_query = """
+        mutation UpdatePost($input: UpdatePostInput!) {
+            updatePost(input: $input) {
+                post {
+                    id
+                    slug
+                    title
+                    url
+                }
+            }
+        }
+    """
+
+    post_input = {
+        "id": post_id,
+        "title": title,
+        "contentMarkdown": markdown_content
+    }
+    formatted_tags = format_hashnode_tags(tags_data)
+    if formatted_tags:
+        post_input["tags"] = formatted_tags
+    if canonical_url:
+        post_input["originalArticleURL"] = canonical_url
+
+    payload = {"query": update_post_query, "variables": {"input": post_input}}
+
+    client = get_client("hashnode")
+    response = await client.post("/", json=payload, headers=headers)
+    response.raise_for_status()
+
+    update_data = response.json()
+    if "errors" in update_data:
+        if any((error.get("extensions") or {}).get("code") == "NOT_FOUND" for error in update_data["errors"]):
+            raise PlatformPostNotFound(f"Hashnode post {post_id} not found")
+        raise Exception(f"Hashnode Update Post API error: {update_data['errors']}")
+
+    post_data = (update_data.get("data") or {}).get("updatePost", {}).get("post")
+    if not post_data:
+        raise PlatformPostNotFound(f"Hashnode post {post_id} not found")
+
+    print(f"✏️ Hashnode post {post_id} updated in place")
+    return update_data["data"]["updatePost"]
+
+
 # --- Medium Posting (DUMMY IMPLEMENTATION) ---
 async def post_to_medium(access_token: str, user_id_on_medium: str, title: str, markdown_content: str, canonical_url: str = None, tags: list = None, publish_status: str = "public"):
     """
@@ -258,17 +553,40 @@ async def get_medium_user_id(access_token: str):
     return "mock_medium_user_id_12345"
 
 
+# Publication lookups are cached per API-key fingerprint (and hostname); concurrent
+# lookups for the same key share one upstream call
+HASHNODE_LOOKUP_CACHE_TTL = float(os.getenv("HASHNODE_LOOKUP_CACHE_TTL", "600"))
+HASHNODE_LOOKUP_REFRESH_AHEAD = float(os.getenv("HASHNODE_LOOKUP_REFRESH_AHEAD", "120"))
+hashnode_lookup_cache = AsyncTTLCache(
+    ttl=HASHNODE_LOOKUP_CACHE_TTL,
+    maxsize=int(os.getenv("HASHNODE_LOOKUP_CACHE_SIZE", "1024")),
+    refresh_ahead=HASHNODE_LOOKUP_REFRESH_AHEAD,
+)
+
+
 # Helper to get Hashnode user's publications
-async def get_hashnode_user_publications(api_key: str):
+async def get_hashnode_user_publications(api_key: str, use_cache: bool = True, background_refresh: bool = False):
     """
     Get user's Hashnode publications using their Personal Access Token
     
     Args:
         api_key: Hashnode Personal Access Token
+        use_cache: Serve from / populate the publication lookup cache
+        background_refresh: Refresh entries close to expiry in the background
     
     Returns:
         list: List of user's publications with id, title, and url
     """
+    if not use_cache:
+        return await _fetch_hashnode_user_publications(api_key)
+    return await hashnode_lookup_cache.get_or_load(
+        ("publications", credential_fingerprint(api_key)),
+        lambda: _fetch_hashnode_user_publications(api_key),
+        background_refresh=background_refresh
+    )
+
+
+async def _fetch_hashnode_user_publications(api_key: str):
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
     query = """
         query GetUserPublications {
@@ -289,8 +607,8 @@ async def get_hashnode_user_publications(api_key: str):
     """
     payload = {"query": query}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post("https://gql.hashnode.com/", json=payload, headers=headers)
+    client = get_client("hashnode")
+    response = await client.post("/", json=payload, headers=headers)
     response.raise_for_status()
     
     data = response.json()
@@ -306,17 +624,29 @@ async def get_hashnode_user_publications(api_key: str):
 
 
 # Helper to get Hashnode publication ID
-async def get_hashnode_publication_id(api_key: str, hostname: str):
+async def get_hashnode_publication_id(api_key: str, hostname: str, use_cache: bool = True, background_refresh: bool = False):
     """
     Get Hashnode publication ID by hostname
     
     Args:
         api_key: Hashnode Personal Access Token
         hostname: Publication hostname (e.g., "yourblog.hashnode.dev")
+        use_cache: Serve from / populate the publication lookup cache
+        background_refresh: Refresh entries close to expiry in the background
     
     Returns:
         str: Publication ID
     """
+    if not use_cache:
+        return await _fetch_hashnode_publication_id(api_key, hostname)
+    return await hashnode_lookup_cache.get_or_load(
+        ("publication", credential_fingerprint(api_key), hostname.lower()),
+        lambda: _fetch_hashnode_publication_id(api_key, hostname),
+        background_refresh=background_refresh
+    )
+
+
+async def _fetch_hashnode_publication_id(api_key: str, hostname: str):
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
     query = """
         query GetPublication($host: String!) {
@@ -330,8 +660,8 @@ async def get_hashnode_publication_id(api_key: str, hostname: str):
     """
     payload = {"query": query, "variables": {"host": hostname}}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post("https://gql.hashnode.com/", json=payload, headers=headers)
+    client = get_client("hashnode")
+    response = await client.post("/", json=payload, headers=headers)
     response.raise_for_status()
     
     data = response.json()
@@ -345,8 +675,74 @@ async def get_hashnode_publication_id(api_key: str, hostname: str):
     return publication["id"]
 
 
+# Per-platform and overall time budgets for cross_post_article (seconds)
+CROSS_POST_PLATFORM_TIMEOUT = float(os.getenv("CROSS_POST_PLATFORM_TIMEOUT", "45"))
+CROSS_POST_DEADLINE = float(os.getenv("CROSS_POST_DEADLINE", "90"))
+
+
+async def _post_with_credential(credential: PlatformCredential, title: str, markdown_content: str, canonical_url: str = None, tags: list = None):
+    """
+    Publish to the platform a single credential belongs to
+
+    Returns:
+        dict or None: Result entry for the platform, None if the credential can't post
+    """
+    from services import renditions  # renditions imports this module
+
+    platform = credential.platform_name
+
+    if platform == "dev.to" and credential.api_key:
+        result = await post_to_devto(
+            api_key=credential.api_key,
+            **renditions.get_rendition(platform, title, markdown_content, tags=tags, canonical_url=canonical_url)
+        )
+        return {"success": True, "data": result}
+
+    elif platform == "hashnode" and credential.api_key:
+        # Use the new publication_id field
+        publication_id = credential.publication_id
+        if not publication_id:
+            return {"success": False, "error": "Publication ID not found"}
+
+        result = await post_to_hashnode(
+            api_key=credential.api_key,
+            publication_id=publication_id,
+            **renditions.get_rendition(platform, title, markdown_content, tags=tags, canonical_url=canonical_url)
+        )
+        return {"success": True, "data": result}
+
+    elif platform == "medium" and credential.access_token:
+        # Dummy implementation for Medium
+        result = await post_to_medium(
+            access_token=credential.access_token,
+            user_id_on_medium=credential.platform_user_id,
+            **renditions.get_rendition(platform, title, markdown_content, tags=tags, canonical_url=canonical_url)
+        )
+        return {"success": True, "data": result, "note": "DUMMY IMPLEMENTATION"}
+
+    return None
+
+
+async def _timed_post(credential: PlatformCredential, timeout: float, title: str, markdown_content: str, canonical_url: str = None, tags: list = None):
+    """Run _post_with_credential under a per-platform timeout and record its duration"""
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(
+            _post_with_credential(credential, title, markdown_content, canonical_url, tags),
+            timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        result = {"success": False, "error": f"Timed out after {timeout}s"}
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+
+    if result is not None:
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
 # Main function to cross-post to all connected platforms
-async def cross_post_article(db: Session, user_id: int, title: str, markdown_content: str, canonical_url: str = None, tags: list = None):
+async def cross_post_article(db: Session, user_id: int, title: str, markdown_content: str, canonical_url: str = None, tags: list = None, concurrent: bool = True, platform_timeout: float = None, deadline: float = None, on_result=None):
     """
     Cross-post an article to all connected platforms for a user
     
@@ -357,61 +753,70 @@ async def cross_post_article(db: Session, user_id: int, title: str, markdown_con
         markdown_content: Article content in markdown format
         canonical_url: Optional canonical URL for SEO
         tags: Optional list of tags
+        concurrent: Publish to all platforms at once instead of one after another
+        platform_timeout: Seconds allowed per platform (defaults to CROSS_POST_PLATFORM_TIMEOUT)
+        deadline: Seconds allowed for the whole fan-out (defaults to CROSS_POST_DEADLINE)
+        on_result: Optional callback(platform, result) invoked as each platform finishes
     
     Returns:
-        dict: Results from each platform posting attempt
+        dict: Results from each platform posting attempt, each with its elapsed_ms
     """
+    # An explicit 0 is a real budget (everything times out), not "use the default"
+    platform_timeout = CROSS_POST_PLATFORM_TIMEOUT if platform_timeout is None else platform_timeout
+    deadline = CROSS_POST_DEADLINE if deadline is None else deadline
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + deadline
     results = {}
-    
+
+    def record(platform, result):
+        if result is None:
+            return
+        results[platform] = result
+        if on_result:
+            on_result(platform, result)
+
     # Get user's platform credentials
     credentials = db.query(PlatformCredential).filter(
         PlatformCredential.user_id == user_id
     ).all()
-    
-    for credential in credentials:
-        platform = credential.platform_name
-        
-        try:
-            if platform == "dev.to" and credential.api_key:
-                result = await post_to_devto(
-                    api_key=credential.api_key,
-                    title=title,
-                    markdown_content=markdown_content,
-                    canonical_url=canonical_url,
-                    tags=tags[:4] if tags else None  # Dev.to allows max 4 tags
-                )
-                results[platform] = {"success": True, "data": result}
-                
-            elif platform == "hashnode" and credential.api_key:
-                # Use the new publication_id field
-                publication_id = credential.publication_id
-                if not publication_id:
-                    results[platform] = {"success": False, "error": "Publication ID not found"}
-                    continue
-                    
-                result = await post_to_hashnode(
-                    api_key=credential.api_key,
-                    publication_id=publication_id,
-                    title=title,
-                    markdown_content=markdown_content,
-                    canonical_url=canonical_url,
-                    tags_data=[{"name": tag} for tag in tags] if tags else None
-                )
-                results[platform] = {"success": True, "data": result}
-                
-            elif platform == "medium" and credential.access_token:
-                # Dummy implementation for Medium
-                result = await post_to_medium(
-                    access_token=credential.access_token,
-                    user_id_on_medium=credential.platform_user_id,
-                    title=title,
-                    markdown_content=markdown_content,
-                    canonical_url=canonical_url,
-                    tags=tags
-                )
-                results[platform] = {"success": True, "data": result, "note": "DUMMY IMPLEMENTATION"}
-                
-        except Exception as e:
-            results[platform] = {"success": False, "error": str(e)}
-    
-    return results 
\ No newline at end of file
+
+    if not concurrent:
+        for credential in credentials:
+            remaining = deadline_at - loop.time()
+            if remaining <= 0:
+                record(credential.platform_name, {"success": False, "error": "Cross-post deadline exceeded", "elapsed_ms": 0.0})
+                continue
+            record(credential.platform_name, await _timed_post(
+                credential, min(platform_timeout, remaining), title, markdown_content, canonical_url, tags
+            ))
+        return results
+
+    started = time.perf_counter()
+    pending = {
+        asyncio.create_task(_timed_post(credential, platform_timeout, title, markdown_content, canonical_url, tags)): credential.platform_name
+        for credential in credentials
+    }
+    platforms = dict(pending)
+
+    # Collect results as each platform finishes, up to the global deadline
+    while pending:
+        remaining = deadline_at - loop.time()
+        if remaining <= 0:
+            break
+        done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            pending.pop(task)
+            record(platforms[task], task.result())
+
+    # Anything still running has blown the global deadline
+    for task, platform in pending.items():
+        task.cancel()
+        record(platform, {
+            "success": False,
+            "error": f"Cross-post deadline of {deadline}s exceeded",
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        })
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    return results
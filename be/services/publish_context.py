@@ -0,0 +1,133 @@
+# backend/services/publish_context.py
+"""
+Everything a publish task needs from the database, loaded in one query.
+
+load_publish_context() joins the post, its author, the author's credentials
+for the requested platforms and any existing PublishedPost rows, and copies
+the columns into small immutable snapshots. Nothing in a context is attached
+to a session, so a task can close its session (returning the connection to
+the pool) before it starts the slow platform calls, and write results back
+afterwards by row id.
+"""
+from types import MappingProxyType
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+import models
+
+
+class _Snapshot:
+    """Read-only record: attributes are set once in __init__ and can't change afterwards"""
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__ if name not in self._hidden)
+        return f"{type(self).__name__}({fields})"
+
+    _hidden = ()
+
+
+class PostSnapshot(_Snapshot):
+    __slots__ = ("id", "title", "content_markdown")
+
+
+class CredentialSnapshot(_Snapshot):
+    __slots__ = ("platform_name", "api_key", "access_token", "platform_user_id", "publication_id")
+    _hidden = ("api_key", "access_token")  # keep secrets out of logs
+
+    @property
+    def secret(self):
+        """The key or token requests for this platform are sent with"""
+        return self.api_key or self.access_token
+
+
+class PublishRowSnapshot(_Snapshot):
+    __slots__ = ("id", "platform_post_id", "platform_post_url", "content_hash", "publish_step", "platform_draft_id")
+
+    @property
+    def resume_draft_id(self):
+        """Draft left by an unfinished multi-step publish, if it can be resumed"""
+        return self.platform_draft_id if self.publish_step == "draft_created" else None
+
+
+class PublishContext(_Snapshot):
+    __slots__ = ("user_id", "post", "credentials", "rows")
+    # credentials: read-only {platform_name: CredentialSnapshot}
+    # rows: read-only {platform_name: PublishRowSnapshot} for platforms with a PublishedPost row
+
+
+def load_publish_context(db: Session, user_id: int, post_id: int, platform_names: list):
+    """
+    Load a post with its author's credentials and publish rows in one query
+
+    Args:
+        db: Database session
+        user_id: ID of the user publishing (must own the post)
+        post_id: ID of the post to publish
+        platform_names: Platforms to load credentials and publish rows for
+
+    Returns:
+        PublishContext, or None if the user or post doesn't exist
+    """
+    Post, Credential, Published = models.Post, models.PlatformCredential, models.PublishedPost
+    rows = (
+        db.query(
+            Post.id, Post.title, Post.content_markdown,
+            Credential.platform_name, Credential.api_key, Credential.access_token,
+            Credential.platform_user_id, Credential.publication_id,
+            Published.id.label("published_post_id"), Published.platform_post_id, Published.platform_post_url,
+            Published.content_hash, Published.publish_step, Published.platform_draft_id,
+        )
+        .join(models.User, models.User.id == Post.author_id)
+        .outerjoin(Credential, and_(
+            Credential.user_id == Post.author_id,
+            Credential.platform_name.in_(platform_names),
+        ))
+        .outerjoin(Published, and_(
+            Published.original_post_id == Post.id,
+            Published.platform_name == Credential.platform_name,
+        ))
+        .filter(Post.id == post_id, Post.author_id == user_id)
+        .all()
+    )
+    if not rows:
+        return None
+
+    first = rows[0]
+    credentials = {}
+    publish_rows = {}
+    for row in rows:
+        if row.platform_name is None:
+            continue
+        credentials[row.platform_name] = CredentialSnapshot(
+            platform_name=row.platform_name,
+            api_key=row.api_key,
+            access_token=row.access_token,
+            platform_user_id=row.platform_user_id,
+            publication_id=row.publication_id,
+        )
+        if row.published_post_id is not None:
+            publish_rows[row.platform_name] = PublishRowSnapshot(
+                id=row.published_post_id,
+                platform_post_id=row.platform_post_id,
+                platform_post_url=row.platform_post_url,
+                content_hash=row.content_hash,
+                publish_step=row.publish_step,
+                platform_draft_id=row.platform_draft_id,
+            )
+
+    return PublishContext(
+        user_id=user_id,
+        post=PostSnapshot(id=first.id, title=first.title, content_markdown=first.content_markdown),
+        credentials=MappingProxyType(credentials),
+        rows=MappingProxyType(publish_rows),
+    )
@@ -0,0 +1,172 @@
+# backend/services/publish_events.py
+"""
+Live publish progress for the API's event stream.
+
+Workers send a custom Celery event, 'task-publish-progress', at every step
+of a publish: started, Hashnode draft created, published (or skipped),
+error, retry scheduled, deferred. Each API process runs ONE event receiver in a background
+thread, however many clients are watching, and fans the events out to the
+asyncio queues of the clients subscribed to that post. The thread starts
+with the first subscriber, so forked server workers each get their own.
+With PUBLISH_EXECUTOR=local publishes run in the API process itself and
+hand their events to publish_local() instead; no receiver is started.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+
+PROGRESS_EVENT = "task-publish-progress"
+# Events buffered per client before the oldest are dropped (a slow client mustn't grow memory)
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "100"))
+
+_lock = threading.Lock()
+_subscribers = {}  # post_id -> set of Subscription
+_task_posts = OrderedDict()  # task id -> (post_id, platform), to place task-failed events
+_TASK_POSTS_MAX = 10000
+# Event envelope fields clients don't need
+_INTERNAL_FIELDS = ("type", "uuid", "hostname", "pid", "clock", "local_received", "utcoffset")
+_thread = None
+_receiver = None
+_stopping = False
+
+
+class Subscription:
+    """One client's view of a post's events, delivered on the client's event loop"""
+
+    def __init__(self, post_id: int, loop):
+        self.post_id = post_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+    def _put(self, event: dict):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    def deliver(self, event: dict):
+        """Called from the receiver thread"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # the client's loop is gone; it unsubscribes on its way out
+
+    async def get(self, timeout: float):
+        """Next event, or None after timeout seconds without one"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+def subscribe(post_id: int) -> Subscription:
+    """Start receiving a post's progress events; call from the event loop that will read them"""
+    subscription = Subscription(post_id, asyncio.get_running_loop())
+    with _lock:
+        _subscribers.setdefault(post_id, set()).add(subscription)
+    _ensure_consumer()
+    return subscription
+
+
+def unsubscribe(subscription: Subscription):
+    with _lock:
+        subscribers = _subscribers.get(subscription.post_id)
+        if subscribers:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del _subscribers[subscription.post_id]
+
+
+def _remember(task_id, post_id, platform):
+    if task_id:
+        _task_posts[task_id] = (post_id, platform)
+        _task_posts.move_to_end(task_id)
+        while len(_task_posts) > _TASK_POSTS_MAX:
+            _task_posts.popitem(last=False)
+
+
+def _publish(post_id, event: dict):
+    with _lock:
+        subscribers = list(_subscribers.get(post_id, ()))
+    for subscription in subscribers:
+        subscription.deliver(event)
+
+
+def _on_progress(event: dict):
+    post_id = event.get("post_id")
+    if post_id is None:
+        return
+    with _lock:
+        _remember(event.get("uuid"), post_id, event.get("platform"))
+        _remember(event.get("platform_task_id"), post_id, event.get("platform"))
+    _publish(post_id, {key: value for key, value in event.items() if key not in _INTERNAL_FIELDS})
+
+
+def publish_local(**fields):
+    """Deliver a progress event raised in this process (PUBLISH_EXECUTOR=local)"""
+    _on_progress(dict(fields, type=PROGRESS_EVENT, timestamp=time.time()))
+
+
+def _on_task_failed(event: dict):
+    """A publish task that crashed outright (tasks report their own errors as progress events)"""
+    with _lock:
+        known = _task_posts.get(event.get("uuid"))
+    if known:
+        post_id, platform = known
+        _publish(post_id, {
+            "post_id": post_id,
+            "platform": platform,
+            "state": "failed",
+            "platform_task_id": event.get("uuid"),
+            "message": event.get("exception"),
+            "timestamp": event.get("timestamp"),
+        })
+
+
+def _consume():
+    """Receiver loop; reconnects with backoff until stop() is called"""
+    global _receiver
+    from celery_utils import celery_app
+
+    backoff = 1
+    while not _stopping:
+        try:
+            with celery_app.connection_for_read() as connection:
+                _receiver = celery_app.events.Receiver(connection, handlers={
+                    PROGRESS_EVENT: _on_progress,
+                    "task-failed": _on_task_failed,
+                })
+                print("📡 Publish event consumer connected")
+                backoff = 1
+                _receiver.capture(limit=None, timeout=None, wakeup=False)
+        except Exception as e:
+            if _stopping:
+                break
+            print(f"⚠️ Publish event consumer disconnected, retrying in {backoff}s: {e}")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+
+def _ensure_consumer():
+    global _thread, _stopping
+    from celery_utils import PUBLISH_EXECUTOR
+    if PUBLISH_EXECUTOR == "local":
+        return
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _stopping = False
+        _thread = threading.Thread(target=_consume, name="publish-event-consumer", daemon=True)
+        _thread.start()
+
+
+def stop():
+    """Stop the receiver thread (on API shutdown)"""
+    global _thread, _stopping
+    _stopping = True
+    if _receiver is not None:
+        _receiver.should_stop = True
+    if _thread is not None:
+        _thread.join(timeout=5)
+        _thread = None
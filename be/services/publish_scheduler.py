@@ -0,0 +1,186 @@
+# backend/services/publish_scheduler.py
+"""
+Scheduled publishing: publishes requested with a publish_at in the future.
+
+The request is stored as a ScheduledPublish row holding everything
+publish_post_task needs, and its platforms' PublishedPost rows are marked
+'scheduled'. A periodic dispatcher (tasks.dispatch_scheduled_publishes_task)
+claims due rows in publish_at order with SKIP LOCKED and dispatches them,
+so several scheduler replicas never send the same publish twice, and a big
+content drop can be spread over time instead of hitting the platforms and
+workers at once.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+import models
+
+PUBLISH_SCHEDULE_BATCH = int(os.getenv("PUBLISH_SCHEDULE_BATCH", "100"))
+# publish_at values closer than this are published right away
+PUBLISH_SCHEDULE_MIN_LEAD = float(os.getenv("PUBLISH_SCHEDULE_MIN_LEAD", "5"))
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def due_time(publish_at: datetime):
+    """
+    When a requested publish should go out, or None to publish now
+
+    Naive datetimes are taken as UTC.
+    """
+    if publish_at is None:
+        return None
+    if publish_at.tzinfo is None:
+        publish_at = publish_at.replace(tzinfo=timezone.utc)
+    if publish_at <= utcnow() + timedelta(seconds=PUBLISH_SCHEDULE_MIN_LEAD):
+        return None
+    return publish_at
+
+
+# PublishedPost fields a schedule overwrites when it reuses a platform's row
+REPLACED_FIELDS = ("status", "error_message", "retry_count", "next_retry_at", "task_id")
+
+
+def replaced_state(row):
+    """
+    What scheduling a publish is about to overwrite on a platform's PublishedPost row
+
+    Returns:
+        dict or None: REPLACED_FIELDS of the row (JSON-ready), None if there is no row yet
+    """
+    if row is None:
+        return None
+    state = {field: getattr(row, field) for field in REPLACED_FIELDS}
+    if state["next_retry_at"] is not None:
+        state["next_retry_at"] = state["next_retry_at"].isoformat()
+    return state
+
+
+def schedule_publish(db: Session, user_id: int, post_id: int, publish_at: datetime, canonical_urls: dict,
+                     tags: list = None, hashnode_publication_id: str = None, task_ids: dict = None,
+                     replaced_rows: dict = None):
+    """
+    Store a publish to be dispatched at publish_at; the caller commits
+
+    Args:
+        db: Database session
+        user_id: ID of the user publishing (owner of the post)
+        post_id: ID of the post to publish
+        publish_at: When to publish (timezone-aware)
+        canonical_urls: {platform_name: canonical URL} for every platform to publish to
+        tags: Tags to publish with (optional)
+        hashnode_publication_id: Publication ID for Hashnode if the credential has none (optional)
+        task_ids: {platform_name: task_id} handed out to the client for status polling
+        replaced_rows: {platform_name: replaced_state() of its row before it was marked 'scheduled'}
+
+    Returns:
+        ScheduledPublish: The new (pending) row
+    """
+    scheduled = models.ScheduledPublish(
+        post_id=post_id,
+        user_id=user_id,
+        publish_at=publish_at,
+        status="scheduled",
+        canonical_urls=canonical_urls,
+        tags=tags,
+        hashnode_publication_id=hashnode_publication_id,
+        task_ids=task_ids,
+        replaced_rows=replaced_rows,
+    )
+    db.add(scheduled)
+    return scheduled
+
+
+def get_pending(db: Session, post_id: int):
+    """The post's publish still waiting to be dispatched, if any"""
+    return (
+        db.query(models.ScheduledPublish)
+        .filter_by(post_id=post_id, status="scheduled")
+        .order_by(models.ScheduledPublish.publish_at)
+        .first()
+    )
+
+
+def cancel_pending(db: Session, post_id: int) -> int:
+    """
+    Cancel the post's scheduled publishes and undo their 'scheduled' PublishedPost rows; the caller commits
+
+    Rows the schedule created are removed. Rows it reused (an earlier success, a
+    failure waiting for retry, a saved Hashnode draft) get back the status, error,
+    retry schedule and task id they had, as recorded in replaced_rows.
+
+    Returns:
+        int: Number of scheduled publishes cancelled
+    """
+    pending = db.query(models.ScheduledPublish).filter_by(post_id=post_id, status="scheduled").all()
+    for scheduled in pending:
+        scheduled.status = "cancelled"
+        replaced_rows = scheduled.replaced_rows or {}
+        rows = db.query(models.PublishedPost).filter(
+            models.PublishedPost.original_post_id == post_id,
+            models.PublishedPost.platform_name.in_(list(scheduled.canonical_urls)),
+            models.PublishedPost.status == "scheduled",
+        )
+        for row in rows:
+            previous = replaced_rows.get(row.platform_name)
+            if previous is None:
+                db.delete(row)
+                continue
+            for field in REPLACED_FIELDS:
+                setattr(row, field, previous.get(field))
+            if previous.get("next_retry_at"):
+                row.next_retry_at = datetime.fromisoformat(previous["next_retry_at"])
+    # Callers read the rows back right away, and sessions don't autoflush
+    db.flush()
+    return len(pending)
+
+
+def claim_due_publishes(db: Session, limit: int = None, now: datetime = None) -> list:
+    """
+    Claim up to limit scheduled publishes that are due, earliest first
+
+    Rows are locked with SKIP LOCKED and marked 'dispatched' in the same
+    transaction, so concurrent schedulers never claim the same publish twice.
+
+    Returns:
+        list: Dicts with id, user_id, post_id, canonical_urls, tags, hashnode_publication_id, task_ids
+    """
+    now = now or utcnow()
+    limit = limit or PUBLISH_SCHEDULE_BATCH
+    due = (
+        db.query(
+            models.ScheduledPublish.id,
+            models.ScheduledPublish.user_id,
+            models.ScheduledPublish.post_id,
+            models.ScheduledPublish.canonical_urls,
+            models.ScheduledPublish.tags,
+            models.ScheduledPublish.hashnode_publication_id,
+            models.ScheduledPublish.task_ids,
+        )
+        .filter(models.ScheduledPublish.status == "scheduled", models.ScheduledPublish.publish_at <= now)
+        .order_by(models.ScheduledPublish.publish_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not due:
+        db.commit()
+        return []
+
+    db.query(models.ScheduledPublish).filter(models.ScheduledPublish.id.in_([row.id for row in due])).update(
+        {"status": "dispatched", "dispatched_at": now}, synchronize_session=False
+    )
+    db.commit()
+    return [dict(row._mapping) for row in due]
+
+
+def release(db: Session, scheduled_ids: list, delay: float):
+    """Put claimed publishes back on the schedule, e.g. when dispatching them failed"""
+    if scheduled_ids:
+        db.query(models.ScheduledPublish).filter(models.ScheduledPublish.id.in_(scheduled_ids)).update(
+            {"status": "scheduled", "dispatched_at": None, "publish_at": utcnow() + timedelta(seconds=delay)},
+            synchronize_session=False
+        )
+        db.commit()
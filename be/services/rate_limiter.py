@@ -0,0 +1,279 @@
+# backend/services/rate_limiter.py
+"""
+Distributed token-bucket rate limiter for outbound platform calls.
+
+Buckets live in the shared Redis (the Celery broker by default, see redis_store) and are
+keyed by platform and a fingerprint of the credential, so every worker shares
+the same budget per account. Responses feed back into the bucket: a 429 with
+Retry-After (or an exhausted X-RateLimit-Remaining) blocks the bucket until
+the platform says we may send again.
+
+The limiter fails open: if Redis is unreachable requests are allowed through.
+With PUBLISH_EXECUTOR=local and no SHARED_STATE_REDIS_URL the buckets are kept
+in this process instead (redis_store.SHARED_STATE_IN_PROCESS).
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import redis
+from services.redis_store import get_redis, SHARED_STATE_IN_PROCESS
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Longest a task will sleep in-process for a token before rescheduling itself instead
+RATE_LIMIT_MAX_INLINE_WAIT = float(os.getenv("RATE_LIMIT_MAX_INLINE_WAIT", "5"))
+
+# (tokens per second, burst size) per platform; platforms not listed are unlimited
+PLATFORM_LIMITS = {
+    "dev.to": (
+        float(os.getenv("DEVTO_RATE_LIMIT_PER_SEC", "0.3")),
+        int(os.getenv("DEVTO_RATE_LIMIT_BURST", "9")),
+    ),
+    "hashnode": (
+        float(os.getenv("HASHNODE_RATE_LIMIT_PER_SEC", "5")),
+        int(os.getenv("HASHNODE_RATE_LIMIT_BURST", "10")),
+    ),
+}
+
+KEY_PREFIX = "ratelimit"
+
+# Atomically refill the bucket and take one token.
+# Returns the seconds to wait before a token is available (0 = token taken).
+_ACQUIRE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'blocked_until')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+local blocked_until = tonumber(state[3]) or 0
+if blocked_until > now then
+    return tostring(blocked_until - now)
+end
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 3600)
+return tostring(wait)
+"""
+
+# Apply what a platform response told us about our remaining budget.
+# ARGV[3] = seconds to block (or -1), ARGV[4] = remaining requests (or -1)
+_OBSERVE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local block_for = tonumber(ARGV[3])
+local remaining = tonumber(ARGV[4])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'blocked_until')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+local blocked_until = tonumber(state[3]) or 0
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+if remaining >= 0 then
+    tokens = math.min(tokens, remaining)
+end
+if block_for > 0 then
+    blocked_until = math.max(blocked_until, now + block_for)
+    tokens = 0
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now, 'blocked_until', blocked_until)
+redis.call('EXPIRE', KEYS[1], math.ceil(math.max(block_for, burst / rate)) + 3600)
+return 1
+"""
+
+
+# In-process buckets, same fields as the Redis hashes: {key: {tokens, ts, blocked_until}}
+_local_buckets = {}
+_local_lock = threading.Lock()
+
+
+def _local_bucket(key: str, burst: int, now: float) -> dict:
+    return _local_buckets.setdefault(key, {"tokens": float(burst), "ts": now, "blocked_until": 0.0})
+
+
+def _acquire_in_process(key: str, rate: float, burst: int) -> float:
+    """_ACQUIRE_SCRIPT against the in-process buckets"""
+    now = time.time()
+    with _local_lock:
+        bucket = _local_bucket(key, burst, now)
+        if bucket["blocked_until"] > now:
+            return bucket["blocked_until"] - now
+        tokens = min(burst, bucket["tokens"] + max(0.0, now - bucket["ts"]) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        bucket.update(tokens=tokens, ts=now)
+        return wait
+
+
+def _observe_in_process(key: str, rate: float, burst: int, block_for, remaining):
+    """_OBSERVE_SCRIPT against the in-process buckets"""
+    now = time.time()
+    with _local_lock:
+        bucket = _local_bucket(key, burst, now)
+        tokens = min(burst, bucket["tokens"] + max(0.0, now - bucket["ts"]) * rate)
+        if remaining is not None:
+            tokens = min(tokens, remaining)
+        if block_for is not None and block_for > 0:
+            bucket["blocked_until"] = max(bucket["blocked_until"], now + block_for)
+            tokens = 0.0
+        bucket.update(tokens=tokens, ts=now)
+
+
+def credential_fingerprint(secret: str) -> str:
+    """Stable, non-reversible identifier for an API key or access token"""
+    return hashlib.sha256((secret or "").encode()).hexdigest()[:16]
+
+
+def secret_from_headers(headers) -> str:
+    """Extract the credential a platform request was authenticated with"""
+    if headers.get("api-key"):
+        return headers["api-key"]
+    auth = headers.get("Authorization", "")
+    return auth[len("Bearer "):] if auth.startswith("Bearer ") else auth
+
+
+def bucket_key(platform: str, secret: str) -> str:
+    return f"{KEY_PREFIX}:{platform}:{credential_fingerprint(secret)}"
+
+
+def acquire(platform: str, secret: str) -> float:
+    """
+    Try to take one token from the platform/credential bucket
+
+    Args:
+        platform: Platform name ('dev.to', 'hashnode', ...)
+        secret: API key or access token the request will be sent with
+
+    Returns:
+        float: 0 if a token was taken, otherwise seconds until one is available
+    """
+    limits = PLATFORM_LIMITS.get(platform)
+    if not RATE_LIMIT_ENABLED or not limits:
+        return 0.0
+    rate, burst = limits
+    if SHARED_STATE_IN_PROCESS:
+        return _acquire_in_process(bucket_key(platform, secret), rate, burst)
+    try:
+        wait = get_redis().eval(_ACQUIRE_SCRIPT, 1, bucket_key(platform, secret), rate, burst)
+        return max(0.0, float(wait))
+    except redis.exceptions.RedisError as e:
+        print(f"⚠️ Rate limiter unavailable, allowing request: {e}")
+        return 0.0
+
+
+def wait_for_slot(platform: str, secret: str, max_wait: float = None) -> float:
+    """
+    Block until a token is taken, as long as that happens within max_wait
+
+    Returns:
+        float: 0 once a token was taken, otherwise the wait the caller should
+        reschedule for instead of sleeping
+    """
+    max_wait = RATE_LIMIT_MAX_INLINE_WAIT if max_wait is None else max_wait
+    give_up_at = time.monotonic() + max_wait
+    while True:
+        wait = acquire(platform, secret)
+        if wait <= 0:
+            return 0.0
+        if time.monotonic() + wait > give_up_at:
+            return wait
+        time.sleep(wait)
+
+
+def retry_after_seconds(response) -> float:
+    """
+    Read how long a platform asked us to back off for, if it said so
+
+    Understands Retry-After (seconds or HTTP date) and X-RateLimit-Reset /
+    RateLimit-Reset (delta seconds or epoch timestamp).
+
+    Returns:
+        float or None: Seconds to wait, None if the response carries no hint
+    """
+    headers = response.headers
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    reset = headers.get("X-RateLimit-Reset") or headers.get("RateLimit-Reset")
+    if reset:
+        try:
+            reset = float(reset)
+        except ValueError:
+            return None
+        # Large values are epoch timestamps, small ones are deltas
+        return max(0.0, reset - time.time()) if reset > 1e9 else reset
+    return None
+
+
+def _remaining_from_headers(headers):
+    remaining = headers.get("X-RateLimit-Remaining") or headers.get("RateLimit-Remaining")
+    try:
+        return int(float(remaining)) if remaining is not None else None
+    except ValueError:
+        return None
+
+
+def observe_response(platform: str, secret: str, response):
+    """Adjust the bucket from a platform response's status and rate-limit headers"""
+    limits = PLATFORM_LIMITS.get(platform)
+    if not RATE_LIMIT_ENABLED or not limits:
+        return
+
+    remaining = _remaining_from_headers(response.headers)
+    block_for = None
+    if response.status_code == 429:
+        block_for = retry_after_seconds(response)
+        # Only a 429 without any hint gets the default; an explicit Retry-After: 0 means go ahead
+        block_for = 60.0 if block_for is None else block_for
+    elif remaining == 0:
+        block_for = retry_after_seconds(response)
+
+    if block_for is None and remaining is None:
+        return
+
+    rate, burst = limits
+    if SHARED_STATE_IN_PROCESS:
+        _observe_in_process(bucket_key(platform, secret), rate, burst, block_for, remaining)
+        return
+    try:
+        get_redis().eval(
+            _OBSERVE_SCRIPT, 1, bucket_key(platform, secret),
+            rate, burst,
+            block_for if block_for is not None else -1,
+            remaining if remaining is not None else -1,
+        )
+    except redis.exceptions.RedisError as e:
+        print(f"⚠️ Rate limiter unavailable, ignoring rate-limit headers: {e}")
+
+
+async def observe_response_async(platform: str, response):
+    """httpx response hook: feed rate-limit signals back without blocking the loop"""
+    headers = response.headers
+    if response.status_code != 429 and "X-RateLimit-Remaining" not in headers and "RateLimit-Remaining" not in headers:
+        return
+    secret = secret_from_headers(response.request.headers)
+    if SHARED_STATE_IN_PROCESS:
+        observe_response(platform, secret, response)  # no I/O to move off the loop
+        return
+    await asyncio.to_thread(observe_response, platform, secret, response)
@@ -0,0 +1,30 @@
+# backend/services/redis_store.py
+"""
+Redis connection for state shared between the API and Celery workers
+(rate-limit buckets, circuit breakers). Defaults to the Celery broker Redis.
+
+With PUBLISH_EXECUTOR=local every publish runs in the API process, so unless
+SHARED_STATE_REDIS_URL is set that state is kept in process instead, and no
+Redis is needed at all.
+"""
+import os
+import redis
+
+SHARED_STATE_REDIS_URL = os.getenv("SHARED_STATE_REDIS_URL", os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"))
+SHARED_STATE_IN_PROCESS = (
+    os.getenv("PUBLISH_EXECUTOR", "celery").lower() == "local" and not os.getenv("SHARED_STATE_REDIS_URL")
+)
+
+_redis_client = None
+
+
+def get_redis():
+    """Lazily create the Redis client shared by this process"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            SHARED_STATE_REDIS_URL,
+            socket_timeout=1,
+            socket_connect_timeout=1,
+        )
+    return _redis_client
@@ -0,0 +1,118 @@
+# backend/services/renditions.py
+"""
+Per-platform renditions of a post.
+
+Each platform wants slightly different content (dev.to's 4 lowercase
+alphanumeric tags, Hashnode's {slug, name} tags, canonical URL rules...).
+A rendition is the ready-to-send keyword arguments for a platform's posting
+function, computed once per content revision and kept in an in-process LRU
+(RENDITION_CACHE_SIZE entries) keyed by content hash. Rendering is a few
+regexes over the tags, so it isn't worth a network round trip: each process
+(API, every worker) renders for itself on a miss.
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+from services.posting_service import content_fingerprint, format_hashnode_tags
+
+RENDITION_CACHE_SIZE = int(os.getenv("RENDITION_CACHE_SIZE", "512"))
+
+PLATFORMS = ["dev.to", "hashnode", "medium"]
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def canonical_url_for(post_id: int, platform_name: str = None) -> str:
+    """
+    Generate canonical URL based on environment and platform requirements.
+    For development with localhost, we skip canonical URLs for platforms that don't accept them.
+    """
+    base_url = os.getenv("FRONTEND_BASE_URL", "http://localhost:3000")
+    return apply_canonical_rules(platform_name, f"{base_url}/blog/{post_id}")
+
+
+def apply_canonical_rules(platform_name: str, canonical_url: str) -> str:
+    """Drop canonical URLs a platform would reject"""
+    # Hashnode rejects localhost URLs
+    if platform_name == "hashnode" and canonical_url and "localhost" in canonical_url:
+        return None
+    return canonical_url
+
+
+def _devto_tags(tags: list):
+    # Dev.to allows max 4 tags, lowercase alphanumeric only
+    normalized = []
+    for tag in tags or []:
+        tag = re.sub(r"[^a-z0-9]", "", tag.lower())
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized[:4] or None
+
+
+def render(platform_name: str, title: str, markdown_content: str, tags: list = None, canonical_url: str = None) -> dict:
+    """
+    Build a platform's payload without the cache
+
+    Returns:
+        dict: Keyword arguments for the platform's posting function
+    """
+    canonical_url = apply_canonical_rules(platform_name, canonical_url)
+    rendition = {
+        "title": title,
+        "markdown_content": markdown_content,
+        "canonical_url": canonical_url,
+    }
+    if platform_name == "dev.to":
+        rendition["tags"] = _devto_tags(tags)
+    elif platform_name == "hashnode":
+        rendition["tags_data"] = format_hashnode_tags(tags) or None
+    else:
+        rendition["tags"] = list(tags) if tags else None
+    return rendition
+
+
+def _cache_key(platform_name: str, fingerprint: str) -> tuple:
+    return platform_name, fingerprint
+
+
+def _remember(key: str, rendition: dict):
+    with _lock:
+        _cache[key] = rendition
+        _cache.move_to_end(key)
+        while len(_cache) > RENDITION_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def get_rendition(platform_name: str, title: str, markdown_content: str, tags: list = None, canonical_url: str = None) -> dict:
+    """
+    Get a platform's payload for this content revision, computing it at most once
+
+    Returns:
+        dict: Keyword arguments for the platform's posting function
+    """
+    key = _cache_key(platform_name, content_fingerprint(title, markdown_content, tags=tags, canonical_url=canonical_url))
+
+    with _lock:
+        rendition = _cache.get(key)
+        if rendition is not None:
+            _cache.move_to_end(key)
+            return dict(rendition)
+
+    rendition = render(platform_name, title, markdown_content, tags=tags, canonical_url=canonical_url)
+    _remember(key, rendition)
+    return dict(rendition)
+
+
+def precompute(post_id: int, title: str, markdown_content: str, platforms: list = None):
+    """
+    Render and cache every platform's payload for a freshly saved post, in this process
+
+    Uses the default canonical URL and no tags, which is what a plain
+    publish of the post will ask for.
+    """
+    for platform_name in platforms or PLATFORMS:
+        canonical_url = canonical_url_for(post_id, platform_name)
+        key = _cache_key(platform_name, content_fingerprint(title, markdown_content, canonical_url=canonical_url))
+        _remember(key, render(platform_name, title, markdown_content, canonical_url=canonical_url))
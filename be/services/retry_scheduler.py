@@ -0,0 +1,193 @@
+# backend/services/retry_scheduler.py
+"""
+Database-backed retry scheduling for publishes.
+
+A publish that fails transiently (5xx, 429, timeouts, connection errors) or
+has to wait (open circuit, exhausted rate limit) is not retried with an
+in-memory Celery countdown. Instead its PublishedPost row gets a
+next_retry_at and the task finishes, freeing its worker slot. The delay is
+exponential backoff with jitter, and never earlier than the platform's
+Retry-After. A periodic sweeper claims due rows in batches and dispatches
+them again, so scheduled retries survive worker restarts.
+"""
+import os
+import random
+from datetime import datetime, timedelta, timezone
+import httpx
+from sqlalchemy.orm import Session
+import models
+from services import rate_limiter, dead_letters
+
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "30"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "3600"))
+PUBLISH_MAX_RETRIES = int(os.getenv("PUBLISH_MAX_RETRIES", "5"))
+RETRY_SWEEP_BATCH = int(os.getenv("RETRY_SWEEP_BATCH", "200"))
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def backoff_delay(retry_count: int, retry_after: float = None) -> float:
+    """
+    Seconds to wait before retry number retry_count + 1
+
+    Exponential backoff capped at RETRY_MAX_DELAY, with "equal jitter" (half
+    fixed, half random) so failures that happened together don't retry
+    together. The platform's Retry-After is a lower bound.
+    """
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** retry_count))
+    delay = delay / 2 + random.uniform(0, delay / 2)
+    if retry_after:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def retry_hint(exc: Exception):
+    """
+    Whether a failed platform call is worth retrying, and how long the platform asked us to wait
+
+    Returns:
+        tuple: (retryable, retry_after seconds or None, HTTP status code or None)
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        status_code = exc.response.status_code
+        retryable = status_code == 429 or status_code == 408 or status_code >= 500
+        return retryable, rate_limiter.retry_after_seconds(exc.response) if retryable else None, status_code
+    if isinstance(exc, (httpx.TransportError, TimeoutError)):
+        return True, None, None
+    return False, None, None
+
+
+def _publish_row(db: Session, post_id: int, platform_name: str):
+    return db.query(models.PublishedPost).filter_by(original_post_id=post_id, platform_name=platform_name).first()
+
+
+def schedule_retry(db: Session, post_id: int, platform_name: str, task_args: dict, error_message: str,
+                   retry_after: float = None, status_code: int = None, details: dict = None):
+    """
+    Schedule the next attempt of a failed publish with backoff, or give up and dead-letter it
+
+    Args:
+        db: Database session
+        post_id, platform_name: The publish that failed
+        task_args: publish_to_platform_task arguments needed to dispatch the retry
+        error_message: What went wrong this time
+        retry_after: Platform's Retry-After in seconds, if it sent one
+        status_code: HTTP status of the failure, if any
+        details: Full error details for the dead-letter store (see dead_letters.describe_error)
+
+    Returns:
+        datetime: When the retry is due, or None if retries are exhausted (row marked failed)
+    """
+    row = _publish_row(db, post_id, platform_name)
+    if not row:
+        return None
+
+    retry_count = row.retry_count or 0
+    error_details = {
+        "error": error_message,
+        "status_code": status_code,
+        "retry_after": retry_after,
+        "attempt": retry_count + 1,
+        "failed_at": utcnow().isoformat(),
+        "task": task_args,
+    }
+    row.error_message = error_message
+    row.error_details = error_details
+
+    if retry_count >= PUBLISH_MAX_RETRIES:
+        row.status = "failed"
+        row.next_retry_at = None
+        dead_letters.record(
+            db, post_id, platform_name, task_args, error_message,
+            details=dict(details or {}, retry_after=retry_after), status_code=status_code,
+            attempts=retry_count + 1, published_post_id=row.id,
+        )
+        db.commit()
+        print(f"❌ {platform_name} publish of post {post_id} failed after {retry_count + 1} attempts")
+        return None
+
+    next_retry_at = utcnow() + timedelta(seconds=backoff_delay(retry_count, retry_after))
+    row.status = "pending"
+    row.retry_count = retry_count + 1
+    row.next_retry_at = next_retry_at
+    db.commit()
+    print(f"🔁 {platform_name} publish of post {post_id} retry {retry_count + 1}/{PUBLISH_MAX_RETRIES} at {next_retry_at.isoformat()}")
+    return next_retry_at
+
+
+def defer(db: Session, post_id: int, platform_name: str, task_args: dict, delay: float, reason: str):
+    """
+    Put a publish off without counting it as a failed attempt (open circuit, rate limit)
+
+    Returns:
+        datetime: When the publish is due again
+    """
+    next_retry_at = utcnow() + timedelta(seconds=max(1.0, delay))
+    updated = db.query(models.PublishedPost).filter_by(original_post_id=post_id, platform_name=platform_name).update({
+        "status": "pending",
+        "next_retry_at": next_retry_at,
+        "error_details": {"deferred": reason, "task": task_args},
+    }, synchronize_session=False)
+    if not updated:
+        db.add(models.PublishedPost(
+            original_post_id=post_id, platform_name=platform_name, status="pending",
+            next_retry_at=next_retry_at, error_details={"deferred": reason, "task": task_args},
+        ))
+    db.commit()
+    return next_retry_at
+
+
+def claim_due_retries(db: Session, limit: int = None, now: datetime = None) -> list:
+    """
+    Claim up to limit publishes whose retry is due, oldest first
+
+    Rows are locked with SKIP LOCKED and their next_retry_at cleared in the same
+    transaction, so concurrent sweepers never claim the same row twice.
+
+    Returns:
+        list: (published_post_id, post_id, platform_name, author_id, task_args) tuples
+    """
+    now = now or utcnow()
+    limit = limit or RETRY_SWEEP_BATCH
+    due = (
+        db.query(
+            models.PublishedPost.id,
+            models.PublishedPost.original_post_id,
+            models.PublishedPost.platform_name,
+            models.PublishedPost.error_details,
+        )
+        .filter(models.PublishedPost.next_retry_at.isnot(None), models.PublishedPost.next_retry_at <= now)
+        .order_by(models.PublishedPost.next_retry_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not due:
+        db.commit()
+        return []
+
+    ids = [row.id for row in due]
+    authors = dict(
+        db.query(models.Post.id, models.Post.author_id)
+        .filter(models.Post.id.in_({row.original_post_id for row in due}))
+        .all()
+    )
+    db.query(models.PublishedPost).filter(models.PublishedPost.id.in_(ids)).update(
+        {"next_retry_at": None}, synchronize_session=False
+    )
+    db.commit()
+    return [
+        (row.id, row.original_post_id, row.platform_name, authors.get(row.original_post_id), (row.error_details or {}).get("task") or {})
+        for row in due
+    ]
+
+
+def release(db: Session, published_post_ids: list, delay: float):
+    """Put claimed rows back on the schedule, e.g. when dispatching them failed"""
+    if published_post_ids:
+        db.query(models.PublishedPost).filter(models.PublishedPost.id.in_(published_post_ids)).update(
+            {"next_retry_at": utcnow() + timedelta(seconds=delay)}, synchronize_session=False
+        )
+        db.commit()
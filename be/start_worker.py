@@ -6,6 +6,21 @@ Run this script to start the Celery worker for background publishing tasks.
 
 Usage:
     python start_worker.py
+    python start_worker.py --profile io --concurrency 50
+    python start_worker.py --profile prefork --autoscale 16,4
+    python start_worker.py --profile io --queues hashnode          # Hashnode-only worker
+    python start_worker.py --queues dev.to,posts --lane interactive
+    python start_worker.py --beat                                  # the one worker that also runs beat
+
+Queues (see celery_utils.PLATFORM_QUEUES): without --queues a worker consumes
+every queue. Pass platform names (dev.to, hashnode, medium), 'posts' for batch
+publishes, 'default' for everything else, or literal queue names.
+
+Profiles (see celery_utils.WORKER_PROFILES, or set CELERY_WORKER_PROFILE):
+    dev      solo pool, one task at a time (default)
+    io       thread pool with high concurrency
+    asyncio  thread pool sharing one event loop per process
+    prefork  process pool with autoscaling and recycled children
 
 Make sure Redis is running before starting the worker:
     redis-server
@@ -13,6 +28,7 @@ Make sure Redis is running before starting the worker:
 The worker will process publishing tasks in the background.
 """
 
+import argparse
 import os
 import sys
 from dotenv import load_dotenv
@@ -31,8 +47,29 @@ else:
 if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
 
+# The profile is resolved when celery_utils is imported, so parse the
+# command line first and hand the choices over through the environment
+parser = argparse.ArgumentParser(description="Start the Celery publishing worker")
+parser.add_argument('--profile', choices=['dev', 'io', 'asyncio', 'prefork'], help="Worker profile (default: CELERY_WORKER_PROFILE or dev)")
+parser.add_argument('--concurrency', type=int, help="Override the profile's concurrency")
+parser.add_argument('--autoscale', help="prefork profile: max,min processes")
+parser.add_argument('--queues', help="Comma-separated platforms/queues to consume (default: all)")
+parser.add_argument('--lane', choices=['interactive', 'bulk'], help="Only consume one priority lane (needs CELERY_PRIORITY_LANES)")
+parser.add_argument('--beat', action=argparse.BooleanOptionalAction,
+                    default=os.getenv('CELERY_EMBED_BEAT', 'false').lower() in ('1', 'true', 'yes'),
+                    help="Embed Celery beat for periodic tasks such as the retry sweeper. Pass it to exactly one worker, "
+                         "or run `celery beat` on its own (default: off)")
+parser.add_argument('--loglevel', default='info')
+args, extra_celery_args = parser.parse_known_args()
+if args.profile:
+    os.environ['CELERY_WORKER_PROFILE'] = args.profile
+if args.concurrency:
+    os.environ['CELERY_WORKER_CONCURRENCY'] = str(args.concurrency)
+if args.autoscale:
+    os.environ['CELERY_AUTOSCALE'] = args.autoscale
+
 # Import the Celery app instance
-from celery_utils import celery_app  # Corrected import
+from celery_utils import celery_app, WORKER_PROFILE, worker_cli_options, resolve_queues, PLATFORM_QUEUES  # Corrected import
 
 # The worker command arguments
 # Example: celery -A your_project.celery_app worker -l info
@@ -51,8 +88,20 @@ if __name__ == '__main__':
     # The `-A` flag specifies the application instance
     argv = [
         'worker',
-        '-l', 'info',
-        # Add other options like -P eventlet for Windows if needed
-        # '-P', 'eventlet', # Uncomment if on Windows and using eventlet
+        '-l', args.loglevel,
+        *worker_cli_options(WORKER_PROFILE),
     ]
+    if args.queues or args.lane:
+        names = args.queues.split(',') if args.queues else ['default', 'posts', *PLATFORM_QUEUES]
+        queues = resolve_queues([name.strip() for name in names if name.strip()], args.lane)
+        label = (args.queues or 'all').replace(',', '-').replace('.', '')
+        # Several workers on one host need distinct node names
+        argv += ['-Q', ','.join(queues), '-n', f"publish-{label}{'-' + args.lane if args.lane else ''}@%h"]
+        print(f"📬 Consuming queues: {', '.join(queues)}")
+    if args.beat and os.name == 'nt':
+        print("⚠️ Celery can't embed beat on Windows; run `celery -A celery_utils.celery_app beat` separately")
+    elif args.beat:
+        # Every beat fires the sweeper and the scheduler, so only one process in the deployment may run it
+        argv.append('-B')
+    argv += extra_celery_args  # anything else is passed straight to Celery
     celery_app.worker_main(argv=argv) 
\ No newline at end of file
@@ -4,8 +4,12 @@ Celery tasks for cross-platform publishing
 Uses late binding to avoid circular imports with celery_utils
 """
 import asyncio
+import math
+import time
 import httpx
-from services import posting_service
+from celery import chord, states
+from celery.signals import task_postrun
+from services import posting_service, http_client, rate_limiter, circuit_breaker, renditions, publish_context, retry_scheduler, publish_scheduler, dead_letters, publish_events
 from database import SessionLocal
 import crud, models
 
@@ -21,21 +25,113 @@ def get_celery_app():
 
 # Use app instance with late binding
 celery_app = get_celery_app()
+from celery_utils import lane_of, TASK_RESULT_FORMAT, STORE_PLATFORM_RESPONSES, PUBLISH_EXECUTOR
 
 @celery_app.task(name='tasks.simple_test_task')
 def simple_test_task(name):
     """Simple test task to verify Celery is working"""
     return f"Hello {name}! Celery is working correctly."
 
+async def _send_to_platform(platform_name: str, credential, rendition: dict, publication_id: str = None, existing_post_id: str = None, resume_draft_id: str = None, on_draft_created=None):
+    """
+    Publish a post to one platform, or update it in place if it is already there
+
+    Args:
+        platform_name: Name of the platform ('dev.to', 'hashnode', 'medium')
+        credential: PlatformCredential for the platform
+        rendition: Platform payload from services.renditions (title, content, tags, canonical URL)
+        publication_id: Hashnode publication ID
+        existing_post_id: Platform ID of a previous successful publish, if any
+        resume_draft_id: Hashnode draft created by an earlier attempt, if any
+        on_draft_created: Callback(draft_id) once a Hashnode draft exists
+
+    Returns:
+        tuple: (api_response, post_data) where post_data holds the platform's id and url
+    """
+    if platform_name == "dev.to" and credential.api_key:
+        if existing_post_id:
+            try:
+                api_response = await posting_service.update_devto_article(credential.api_key, existing_post_id, **rendition)
+                return api_response, api_response
+            except posting_service.PlatformPostNotFound:
+                print(f"Dev.to article {existing_post_id} no longer exists, publishing a new one")
+
+        api_response = await posting_service.post_to_devto(credential.api_key, **rendition)
+        return api_response, api_response
+
+    elif platform_name == "hashnode" and credential.api_key:
+        if existing_post_id:
+            try:
+                api_response = await posting_service.update_hashnode_post(credential.api_key, existing_post_id, **rendition)
+                post = api_response["post"]
+                return api_response, {"id": post.get("id"), "url": post.get("url")}
+            except posting_service.PlatformPostNotFound:
+                print(f"Hashnode post {existing_post_id} no longer exists, publishing a new one")
+
+        if not publication_id:
+            raise ValueError("Hashnode Publication ID required for posting.")
+
+        api_response = await posting_service.post_to_hashnode(
+            credential.api_key,
+            publication_id,
+            draft_id=resume_draft_id,
+            on_draft_created=on_draft_created,
+            **rendition
+        )
+        return api_response, {"id": api_response.get("post_id"), "url": api_response.get("post_url")}
+
+    elif platform_name == "medium" and credential.access_token:
+        # Medium's (dummy) API has no update, so changed content is posted again
+        api_response = await posting_service.post_to_medium(
+            credential.access_token,
+            credential.platform_user_id,
+            **rendition
+        )
+        return api_response, api_response.get("data", {})
+
+    raise Exception(f"Platform '{platform_name}' not supported or misconfigured for task.")
+
+def _published_values(published_post_id: int, post_data: dict, fingerprint: str, api_response=None) -> dict:
+    """PublishedPost column values recording a successful publish"""
+    values = {
+        "id": published_post_id,
+        "platform_post_id": str(post_data.get("id")) if post_data.get("id") is not None else None,
+        "platform_post_url": post_data.get("url"),
+        "status": "success",
+        "publish_step": "published",
+        "content_hash": fingerprint,
+        "error_message": None,
+        "error_details": None,
+        "retry_count": 0,
+        "next_retry_at": None,
+    }
+    if STORE_PLATFORM_RESPONSES:
+        # Full API responses live in the database, not in the result backend
+        values["platform_response"] = api_response
+    return values
+
+def _draft_step_saver(db, published_post_id: int, post_id: int, platform_name: str, task_id: str):
+    """
+    Callback persisting each completed step, so a retry resumes from the saved
+    draft instead of creating (and orphaning) another one
+    """
+    def save_draft_step(draft_id):
+        crud.update_published_posts(db, [{
+            "id": published_post_id,
+            "platform_draft_id": draft_id,
+            "publish_step": "draft_created",
+        }])
+        db.commit()
+        _emit_progress(task_id, post_id, platform_name, "draft_created", draft_id=draft_id)
+    return save_draft_step
+
+# Failed and deferred publishes are rescheduled in the database (services/retry_scheduler.py)
+# rather than with self.retry(), so they survive worker restarts
 @celery_app.task(
     name='tasks.publish_to_platform_task',
-    bind=True, 
-    max_retries=3, 
-    default_retry_delay=60,
-    autoretry_for=(httpx.HTTPStatusError,),
-    retry_kwargs={'max_retries': 3, 'countdown': 60}
+    bind=True
 )
-def publish_to_platform_task(self, user_id: int, post_id: int, platform_name: str, canonical_url_on_your_site: str, hashnode_publication_id: str = None):
+def publish_to_platform_task(self, user_id: int, post_id: int, platform_name: str, canonical_url_on_your_site: str, hashnode_publication_id: str = None, tags: list = None):
     """
     Celery task to publish a post to a specific platform
     
@@ -46,142 +142,577 @@ def publish_to_platform_task(self, user_id: int, post_id: int, platform_name: st
         platform_name: Name of the platform ('dev.to', 'hashnode', 'medium')
         canonical_url_on_your_site: Canonical URL for the post
         hashnode_publication_id: Publication ID for Hashnode (optional)
+        tags: Tags to publish with (optional)
     
     Returns:
         dict: Task result with status and data
     """
+    started = time.perf_counter()
     db = get_db_session()
-    published_post_entry = None
+    published_post_id = None
+    # Everything the retry sweeper needs to dispatch this publish again, under the same task id
+    task_args = _platform_task_args(
+        user_id, post_id, platform_name, canonical_url_on_your_site, hashnode_publication_id, tags,
+        self.request.id, lane_of(self.request)
+    )
     
     try:
         # Validate inputs
         if not all([user_id, post_id, platform_name]):
-            return {"status": "error", "message": "Missing required parameters"}
+            return _platform_result("error", platform_name, post_id, message="Missing required parameters")
+
+        # Defer cheaply while the platform's circuit is open, before loading anything.
+        # Like rate-limit waits, this doesn't use up one of the publish's retries.
+        circuit_allowed, circuit_retry_in = circuit_breaker.allow(platform_name)
+        if not circuit_allowed:
+            print(f"Circuit open for {platform_name}, deferring post {post_id} by {circuit_retry_in:.0f}s")
+            next_retry_at = retry_scheduler.defer(db, post_id, platform_name, task_args, circuit_retry_in, "circuit_open")
+            return _retry_scheduled_result(platform_name, post_id, next_retry_at, f"Circuit open for {platform_name}")
         
-        # Get user and post from database
-        current_user = db.query(models.User).filter(models.User.id == user_id).first()
-        db_post = db.query(models.Post).filter(
-            models.Post.id == post_id, 
-            models.Post.author_id == user_id
-        ).first()
-
-        if not current_user or not db_post:
+        # User, post, credential and PublishedPost row in one query, as detached snapshots
+        context = publish_context.load_publish_context(db, user_id, post_id, [platform_name])
+        if not context:
             print(f"User or Post not found for task: user_id={user_id}, post_id={post_id}")
-            return {"status": "error", "message": "User or Post not found"}
+            return _platform_result("error", platform_name, post_id, message="User or Post not found")
 
-        # Get platform credentials
-        credential = crud.get_platform_credential(
-            db, 
-            user_id=current_user.id, 
-            platform_name=platform_name
-        )
+        credential = context.credentials.get(platform_name)
         if not credential:
             raise Exception("Platform not connected or credential not found.")
 
         # Update/Create PublishedPost entry
-        published_post_entry = db.query(models.PublishedPost).filter_by(
-            original_post_id=db_post.id,
-            platform_name=platform_name
-        ).first()
+        published_row = context.rows.get(platform_name)
+        published_post_id = published_row.id if published_row else crud.create_published_post(db, post_id, platform_name)
         
-        if not published_post_entry:
-            published_post_entry = models.PublishedPost(
-                original_post_id=db_post.id, 
-                platform_name=platform_name, 
-                status="pending"
+        # Skip the call entirely if this exact content is already live on the platform
+        fingerprint = posting_service.content_fingerprint(
+            context.post.title, context.post.content_markdown, tags=tags, canonical_url=canonical_url_on_your_site
+        )
+        if published_row and published_row.platform_post_id and published_row.content_hash == fingerprint:
+            crud.update_published_posts(db, [{"id": published_post_id, "status": "success", "error_message": None}])
+            db.commit()
+            return _platform_result(
+                "success", platform_name, post_id, elapsed=time.perf_counter() - started,
+                post_url=published_row.platform_post_url, platform_post_id=published_row.platform_post_id,
+                skipped=True, message="Content unchanged since last publish"
             )
-            db.add(published_post_entry)
-        
-        published_post_entry.status = "processing"
+
+        crud.update_published_posts(db, [{"id": published_post_id, "status": "processing", "next_retry_at": None, "task_id": self.request.id}])
         db.commit()
+        _emit_progress(self.request.id, post_id, platform_name, "started")
+        # Give the connection back to the pool for the duration of the platform call;
+        # the session checks out a fresh one for the writes that follow
+        db.close()
 
-        # Platform-specific publishing logic
-        api_response = None
-        post_data = {}
-        
-        if platform_name == "dev.to" and credential.api_key:
-            api_response = asyncio.run(posting_service.post_to_devto(
-                credential.api_key,
-                db_post.title,
-                db_post.content_markdown,
-                canonical_url=canonical_url_on_your_site
-            ))
-            post_data = api_response
-            
-        elif platform_name == "hashnode" and credential.api_key:
-            publication_id = hashnode_publication_id or credential.publication_id
-            if not publication_id:
-                raise ValueError("Hashnode Publication ID required for posting.")
-            
-            api_response = asyncio.run(posting_service.post_to_hashnode(
-                credential.api_key,
-                publication_id,
-                db_post.title,
-                db_post.content_markdown,
-                canonical_url=canonical_url_on_your_site
-            ))
-            post_data = api_response.get("data", {}).get("publishPost", {}).get("post", {})
-            
-        elif platform_name == "medium" and credential.access_token:
-            api_response = asyncio.run(posting_service.post_to_medium(
-                credential.access_token,
-                credential.platform_user_id,
-                db_post.title,
-                db_post.content_markdown,
-                canonical_url=canonical_url_on_your_site
+        # Take a token from the rate limit shared by all workers for this credential.
+        # Short waits are slept off; longer ones reschedule the publish instead of
+        # burning a request on a guaranteed 429 (and don't use up a retry).
+        rate_limit_wait = rate_limiter.wait_for_slot(platform_name, credential.secret)
+        if rate_limit_wait > 0:
+            next_retry_at = retry_scheduler.defer(db, post_id, platform_name, task_args, rate_limit_wait, "rate_limited")
+            return _retry_scheduled_result(platform_name, post_id, next_retry_at, f"Rate limited on {platform_name}")
+
+        # Platform payload, rendered once per content revision in this process
+        rendition = renditions.get_rendition(
+            platform_name, context.post.title, context.post.content_markdown, tags=tags, canonical_url=canonical_url_on_your_site
+        )
+
+        # Outcome and latency of the platform call feed the platform's circuit breaker
+        with circuit_breaker.track(platform_name):
+            api_response, post_data = http_client.run_sync(_send_to_platform(
+                platform_name,
+                credential,
+                rendition,
+                publication_id=hashnode_publication_id or credential.publication_id,
+                existing_post_id=published_row.platform_post_id if published_row else None,
+                resume_draft_id=published_row.resume_draft_id if published_row else None,
+                on_draft_created=_draft_step_saver(db, published_post_id, post_id, platform_name, self.request.id)
             ))
-            post_data = api_response.get("data", {})
-            
-        else:
-            raise Exception(f"Platform '{platform_name}' not supported or misconfigured for task.")
 
         # Update PublishedPost entry with success
-        published_post_entry.platform_post_id = str(post_data.get("id")) if post_data.get("id") is not None else None
-        published_post_entry.platform_post_url = post_data.get("url")
-        published_post_entry.status = "success"
-        published_post_entry.error_message = None
+        crud.update_published_posts(db, [_published_values(published_post_id, post_data, fingerprint, api_response)])
         db.commit()
+        crud.refresh_post_publish_status(db, post_id)
         
-        return {
-            "status": "success", 
-            "platform": platform_name, 
-            "data": api_response,
-            "post_url": post_data.get("url")
-        }
+        return _platform_result(
+            "success", platform_name, post_id, elapsed=time.perf_counter() - started,
+            post_url=post_data.get("url"), platform_post_id=post_data.get("id"), api_response=api_response
+        )
 
-    except httpx.HTTPStatusError as e:
-        error_detail = e.response.text if hasattr(e, 'response') and e.response else str(e)
-        error_message = f"API Error {e.response.status_code if hasattr(e, 'response') and e.response else 'N/A'}: {error_detail[:500]}"
-        
-        if published_post_entry:
-            published_post_entry.status = "failed"
-            published_post_entry.error_message = error_message
-            db.commit()
-        
-        # Retry for server errors (5xx) or rate limits (429)
-        if hasattr(e, 'response') and e.response and (500 <= e.response.status_code < 600 or e.response.status_code == 429):
-            raise self.retry(exc=e, countdown=60 * (self.request.retries + 1))
-        
-        return {"status": "error", "platform": platform_name, "message": error_message}
-        
     except Exception as e:
-        error_message = str(e)[:500]
-        
-        if published_post_entry:
-            published_post_entry.status = "failed"
-            published_post_entry.error_message = error_message
+        error_message = _error_message(e)
+        db.rollback()
+
+        # Server errors, 429s, timeouts and connection failures are retried later with backoff
+        retryable, retry_after, status_code = retry_scheduler.retry_hint(e)
+        if retryable:
+            next_retry_at = retry_scheduler.schedule_retry(
+                db, post_id, platform_name, task_args, error_message,
+                retry_after=retry_after, status_code=status_code, details=dead_letters.describe_error(e)
+            )
+            if next_retry_at:
+                return _retry_scheduled_result(platform_name, post_id, next_retry_at, error_message)
+        else:
+            if published_post_id:
+                crud.update_published_posts(db, [{"id": published_post_id, "status": "failed", "error_message": error_message}])
+            dead_letters.record(
+                db, post_id, platform_name, task_args, error_message,
+                details=dead_letters.describe_error(e), status_code=status_code, published_post_id=published_post_id
+            )
             db.commit()
         
         # Log the error for debugging
         print(f"Task error for {platform_name}: {error_message}")
+        crud.refresh_post_publish_status(db, post_id)
         
-        return {"status": "error", "platform": platform_name, "message": error_message}
+        return _platform_result("error", platform_name, post_id, elapsed=time.perf_counter() - started, message=error_message)
         
     finally:
         db.close()
 
+def _platform_task_args(user_id, post_id, platform_name, canonical_url, hashnode_publication_id, tags, task_id, lane) -> dict:
+    """publish_to_platform_task arguments as stored for the retry sweeper and the dead-letter store"""
+    return {
+        "user_id": user_id,
+        "post_id": post_id,
+        "platform_name": platform_name,
+        "canonical_url_on_your_site": canonical_url,
+        "hashnode_publication_id": hashnode_publication_id,
+        "tags": tags,
+        "task_id": task_id,
+        "lane": lane,
+    }
+
+def _error_message(exc: Exception) -> str:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"API Error {exc.response.status_code}: {exc.response.text[:500]}"
+    return str(exc)[:500]
+
+def _platform_result(status: str, platform_name: str, post_id: int, elapsed: float = None, post_url: str = None,
+                     platform_post_id=None, api_response=None, **extra) -> dict:
+    """
+    Result of publishing to one platform, as kept in the result backend
+
+    Compact by default (status, platform, post ids, URL, timing and a message);
+    the platform's API response is only added with TASK_RESULT_FORMAT=full.
+    """
+    result = {"status": status, "platform": platform_name, "post_id": post_id}
+    if platform_post_id is not None:
+        result["platform_post_id"] = str(platform_post_id)
+    if post_url:
+        result["post_url"] = post_url
+    if elapsed is not None:
+        result["elapsed_ms"] = round(elapsed * 1000, 1)
+    result.update(extra)
+    if api_response is not None and TASK_RESULT_FORMAT == "full":
+        result["data"] = api_response
+    return result
+
+def _retry_scheduled_result(platform_name: str, post_id: int, next_retry_at, message: str) -> dict:
+    return _platform_result(
+        "retry_scheduled", platform_name, post_id,
+        message=message, retry_at=next_retry_at.isoformat() if next_retry_at else None
+    )
+
+def _report_platform_state(task_id: str, state: str, result: dict):
+    """Store a per-platform status under the task id the API handed out for that platform"""
+    _emit_progress(
+        task_id, result.get("post_id"), result.get("platform"),
+        "started" if state == states.STARTED else result.get("status"),
+        **{key: value for key, value in result.items() if key in _PROGRESS_FIELDS}
+    )
+    if not task_id:
+        return
+    try:
+        celery_app.backend.store_result(task_id, result, state)
+    except Exception as e:
+        print(f"⚠️ Could not store status for task {task_id}: {e}")
+
+# Result fields worth passing on to live progress streams
+_PROGRESS_FIELDS = ("post_url", "platform_post_id", "message", "retry_at", "skipped", "elapsed_ms")
+
+def _emit_progress(task_id: str, post_id: int, platform_name: str, state: str, **fields):
+    """
+    Send a 'task-publish-progress' event for the API's live stream (services/publish_events.py)
+
+    Best effort: a broker hiccup must never fail a publish. Skipped when tasks
+    run eagerly, since nobody is listening then. With PUBLISH_EXECUTOR=local the
+    publish runs in the API process, so the event goes straight to its streams.
+    """
+    if post_id is None:
+        return
+    if PUBLISH_EXECUTOR == "local":
+        publish_events.publish_local(
+            post_id=post_id, platform=platform_name, state=state, platform_task_id=task_id, **fields
+        )
+        return
+    if celery_app.conf.task_always_eager or not celery_app.conf.worker_send_task_events:
+        return
+    try:
+        with celery_app.events.default_dispatcher() as dispatcher:
+            dispatcher.send(
+                "task-publish-progress", uuid=task_id, retry=False,
+                post_id=post_id, platform=platform_name, state=state, platform_task_id=task_id, **fields
+            )
+    except Exception as e:
+        print(f"⚠️ Could not send progress event for post {post_id}: {e}")
+
+@task_postrun.connect(sender=publish_to_platform_task)
+def _emit_platform_outcome(task_id=None, retval=None, **kwargs):
+    """Pass publish_to_platform_task's outcome on to live progress streams"""
+    if isinstance(retval, dict) and retval.get("platform"):
+        _emit_progress(
+            task_id, retval.get("post_id"), retval["platform"], retval.get("status"),
+            **{key: value for key, value in retval.items() if key in _PROGRESS_FIELDS}
+        )
+
+@celery_app.task(name='tasks.update_post_publish_status_task')
+def update_post_publish_status_task(post_id: int):
+    """
+    Recompute a post's aggregate publish status; runs as the chord callback
+    once every platform of a batch publish has finished
+    """
+    db = get_db_session()
+    try:
+        publish_status = crud.refresh_post_publish_status(db, post_id)
+        print(f"Post {post_id} publish status: {publish_status}")
+        return {"post_id": post_id, "publish_status": publish_status}
+    finally:
+        db.close()
+
+@celery_app.task(name='tasks.publish_post_task', bind=True)
+def publish_post_task(self, user_id: int, post_id: int, canonical_urls: dict, hashnode_publication_id: str = None, tags: list = None, platform_task_ids: dict = None):
+    """
+    Celery task to publish one post to several platforms at once
+
+    Loads the post, credentials and PublishedPost rows once, then sends to every
+    platform concurrently on one event loop. Platforms that can't be sent right
+    now (open circuit, rate limited, transient error) are handed to
+    publish_to_platform_task under the same task id, in a chord whose callback
+    updates the post's aggregate publish status.
+
+    Args:
+        self: Celery task instance (bind=True)
+        user_id: ID of the user publishing the post
+        post_id: ID of the post to publish
+        canonical_urls: {platform_name: canonical URL} for every platform to publish to
+        hashnode_publication_id: Publication ID for Hashnode if the credential has none (optional)
+        tags: Tags to publish with (optional)
+        platform_task_ids: {platform_name: task_id} handed out by the API for per-platform status
+
+    Returns:
+        dict: Aggregate status, per-platform results and the deferred platforms
+    """
+    platform_task_ids = platform_task_ids or {}
+    platforms = list(canonical_urls)
+    lane = lane_of(self.request)
+
+    def task_args_for(platform_name, publication_id=None):
+        return _platform_task_args(
+            user_id, post_id, platform_name, canonical_urls[platform_name], publication_id or hashnode_publication_id,
+            tags, platform_task_ids.get(platform_name), lane
+        )
+    for platform_name in platforms:
+        _report_platform_state(platform_task_ids.get(platform_name), states.STARTED, {"platform": platform_name, "post_id": post_id})
+
+    db = get_db_session()
+    results = {}
+    deferred = {}  # platform -> seconds until it should be retried
+    handed_off = set()  # deferred platforms whose publish_to_platform_task has been sent
+    jobs = {}  # platform -> (credential, rendition, fingerprint, existing publish row)
+    row_ids = {}  # platform -> PublishedPost id
+
+    try:
+        # Post, credentials and PublishedPost rows for every platform in one query
+        context = publish_context.load_publish_context(db, user_id, post_id, platforms)
+        if not context:
+            print(f"Post not found for batch task: user_id={user_id}, post_id={post_id}")
+            return {"status": "error", "message": "User or Post not found"}
+
+        updates = []
+        for platform_name in platforms:
+            canonical_url = canonical_urls[platform_name]
+            credential = context.credentials.get(platform_name)
+            if not credential:
+                # No credential means no joined row either; mark the platform's row by name
+                message = "Platform not connected or credential not found."
+                db.query(models.PublishedPost).filter_by(original_post_id=post_id, platform_name=platform_name).update(
+                    {"status": "failed", "error_message": message}, synchronize_session=False
+                )
+                dead_letters.record(db, post_id, platform_name, task_args_for(platform_name), message)
+                results[platform_name] = _platform_result("error", platform_name, post_id, message=message)
+                continue
+
+            published_row = context.rows.get(platform_name)
+            row_ids[platform_name] = published_row.id if published_row else crud.create_published_post(db, post_id, platform_name)
+
+            fingerprint = posting_service.content_fingerprint(
+                context.post.title, context.post.content_markdown, tags=tags, canonical_url=canonical_url
+            )
+            if published_row and published_row.platform_post_id and published_row.content_hash == fingerprint:
+                updates.append({"id": row_ids[platform_name], "status": "success", "error_message": None})
+                results[platform_name] = _platform_result(
+                    "success", platform_name, post_id,
+                    post_url=published_row.platform_post_url, platform_post_id=published_row.platform_post_id,
+                    skipped=True, message="Content unchanged since last publish"
+                )
+                continue
+
+            circuit_allowed, circuit_retry_in = circuit_breaker.allow(platform_name)
+            if not circuit_allowed:
+                updates.append({"id": row_ids[platform_name], "status": "pending"})
+                deferred[platform_name] = circuit_retry_in
+                continue
+
+            rate_limit_wait = rate_limiter.wait_for_slot(platform_name, credential.secret)
+            if rate_limit_wait > 0:
+                updates.append({"id": row_ids[platform_name], "status": "pending"})
+                deferred[platform_name] = rate_limit_wait
+                continue
+
+            updates.append({"id": row_ids[platform_name], "status": "processing", "error_message": None, "next_retry_at": None})
+            rendition = renditions.get_rendition(
+                platform_name, context.post.title, context.post.content_markdown, tags=tags, canonical_url=canonical_url
+            )
+            jobs[platform_name] = (credential, rendition, fingerprint, published_row)
+
+        crud.update_published_posts(db, updates)
+        crud.set_post_publish_status(db, post_id, "publishing")
+        db.commit()
+        # Nothing below needs the ORM until the results are written; free the connection
+        db.close()
+
+        async def send(platform_name, credential, rendition, published_row):
+            started = time.perf_counter()
+            try:
+                outcome = await _send_to_platform(
+                    platform_name,
+                    credential,
+                    rendition,
+                    publication_id=credential.publication_id or hashnode_publication_id,
+                    existing_post_id=published_row.platform_post_id if published_row else None,
+                    resume_draft_id=published_row.resume_draft_id if published_row else None,
+                    on_draft_created=_draft_step_saver(
+                        db, row_ids[platform_name], post_id, platform_name, platform_task_ids.get(platform_name)
+                    )
+                )
+                return outcome, None, time.perf_counter() - started
+            except Exception as e:
+                return None, e, time.perf_counter() - started
+
+        async def send_all():
+            outcomes = await asyncio.gather(*(
+                send(platform_name, credential, rendition, published_row)
+                for platform_name, (credential, rendition, _, published_row) in jobs.items()
+            ))
+            return dict(zip(jobs, outcomes))
+
+        outcomes = http_client.run_sync(send_all()) if jobs else {}
+
+        updates = []
+        for platform_name, (outcome, error, elapsed) in outcomes.items():
+            circuit_breaker.record(platform_name, error is not None and circuit_breaker.is_platform_failure(error), elapsed)
+            if error is None:
+                api_response, post_data = outcome
+                updates.append(_published_values(row_ids[platform_name], post_data, jobs[platform_name][2], api_response))
+                results[platform_name] = _platform_result(
+                    "success", platform_name, post_id, elapsed=elapsed,
+                    post_url=post_data.get("url"), platform_post_id=post_data.get("id"), api_response=api_response
+                )
+                continue
+
+            error_message = _error_message(error)
+            retryable, retry_after, _ = retry_scheduler.retry_hint(error)
+            retry_in = retry_scheduler.backoff_delay(0, retry_after) if retryable else None
+            if retry_in:
+                updates.append({"id": row_ids[platform_name], "status": "pending", "error_message": error_message})
+                deferred[platform_name] = retry_in
+            else:
+                print(f"Batch task error for {platform_name}: {error_message}")
+                updates.append({"id": row_ids[platform_name], "status": "failed", "error_message": error_message})
+                dead_letters.record(
+                    db, post_id, platform_name,
+                    task_args_for(platform_name, context.credentials[platform_name].publication_id),
+                    error_message, details=dead_letters.describe_error(error), published_post_id=row_ids[platform_name]
+                )
+                results[platform_name] = _platform_result(
+                    "error", platform_name, post_id, elapsed=elapsed, message=error_message
+                )
+        crud.update_published_posts(db, updates)
+        db.commit()
+
+        for platform_name, result in results.items():
+            _report_platform_state(platform_task_ids.get(platform_name), states.SUCCESS, result)
+
+        if deferred:
+            # The per-platform task reuses the id the API handed out, so status polling carries on seamlessly
+            retries = []
+            for platform_name, retry_in in deferred.items():
+                retry = publish_to_platform_task.signature(
+                    (user_id, post_id, platform_name, canonical_urls[platform_name]),
+                    {
+                        "hashnode_publication_id": context.credentials[platform_name].publication_id or hashnode_publication_id,
+                        "tags": tags,
+                    },
+                    countdown=max(1, math.ceil(retry_in)),
+                    lane=lane,  # retries of a bulk batch stay in the bulk lane
+                )
+                if platform_task_ids.get(platform_name):
+                    retry.set(task_id=platform_task_ids[platform_name])
+                retries.append(retry)
+                _emit_progress(platform_task_ids.get(platform_name), post_id, platform_name, "deferred", retry_in=round(retry_in, 1))
+            callback = update_post_publish_status_task.si(post_id)
+            callback.link_error(update_post_publish_status_task.si(post_id))
+            chord(retries)(callback)
+            handed_off.update(deferred)
+            publish_status = "publishing"
+        else:
+            publish_status = crud.refresh_post_publish_status(db, post_id)
+
+        return {
+            "status": publish_status,
+            "post_id": post_id,
+            "platforms": results,
+            "deferred": sorted(deferred),
+        }
+
+    except Exception as e:
+        db.rollback()
+        error_message = str(e)[:500]
+        print(f"Batch task error for post {post_id}: {error_message}")
+        # Don't leave rows sitting in 'processing' with nothing left to finish them. Platforms with
+        # a result are done, and those handed to the chord are finished by their own task.
+        unfinished = [
+            platform_name for platform_name in platforms
+            if platform_name not in results and platform_name not in handed_off
+        ]
+        db.query(models.PublishedPost).filter(
+            models.PublishedPost.original_post_id == post_id,
+            models.PublishedPost.platform_name.in_(unfinished),
+            models.PublishedPost.status.in_(["pending", "processing"])
+        ).update({"status": "failed", "error_message": error_message}, synchronize_session=False)
+        for platform_name in unfinished:
+            dead_letters.record(db, post_id, platform_name, task_args_for(platform_name), error_message,
+                                details=dead_letters.describe_error(e))
+        db.commit()
+        for platform_name in unfinished:
+            _report_platform_state(
+                platform_task_ids.get(platform_name), states.SUCCESS,
+                _platform_result("error", platform_name, post_id, message=error_message)
+            )
+        crud.refresh_post_publish_status(db, post_id)
+        return {"status": "error", "post_id": post_id, "message": error_message}
+
+    finally:
+        db.close()
+
+@celery_app.task(name='tasks.sweep_due_retries_task')
+def sweep_due_retries_task():
+    """
+    Dispatch every publish whose scheduled retry is due; run periodically by Celery beat
+
+    Due rows are claimed in batches (see retry_scheduler.claim_due_retries) and
+    sent over one broker connection. Each retry keeps its original task id, so
+    status polling follows it.
+    """
+    db = get_db_session()
+    dispatched = 0
+    try:
+        while True:
+            claimed = retry_scheduler.claim_due_retries(db)
+            if not claimed:
+                break
+
+            sent = []
+            try:
+                with celery_app.producer_or_acquire() as producer:
+                    for published_post_id, post_id, platform_name, author_id, task_args in claimed:
+                        options = {"producer": producer, "lane": task_args.get("lane")}
+                        if task_args.get("task_id"):
+                            options["task_id"] = task_args["task_id"]
+                        publish_to_platform_task.apply_async(
+                            args=(
+                                task_args.get("user_id") or author_id,
+                                post_id,
+                                platform_name,
+                                task_args.get("canonical_url_on_your_site", renditions.canonical_url_for(post_id, platform_name)),
+                            ),
+                            kwargs={
+                                "hashnode_publication_id": task_args.get("hashnode_publication_id"),
+                                "tags": task_args.get("tags"),
+                            },
+                            **options
+                        )
+                        sent.append(published_post_id)
+            except Exception as e:
+                # Broker trouble: put what wasn't sent back on the schedule and stop for now
+                unsent = [row[0] for row in claimed if row[0] not in sent]
+                print(f"⚠️ Retry sweep could not dispatch {len(unsent)} publishes: {e}")
+                retry_scheduler.release(db, unsent, retry_scheduler.RETRY_BASE_DELAY)
+                dispatched += len(sent)
+                break
+
+            dispatched += len(sent)
+            if len(claimed) < retry_scheduler.RETRY_SWEEP_BATCH:
+                break
+
+        if dispatched:
+            print(f"🔁 Retry sweep dispatched {dispatched} publishes")
+        return {"dispatched": dispatched}
+    finally:
+        db.close()
+
+@celery_app.task(name='tasks.dispatch_scheduled_publishes_task')
+def dispatch_scheduled_publishes_task():
+    """
+    Dispatch every scheduled publish that is due; run periodically by Celery beat
+
+    Due publishes are claimed in publish_at order (see publish_scheduler.claim_due_publishes)
+    and sent over one broker connection in the bulk lane, under the task ids handed out
+    when they were scheduled.
+    """
+    db = get_db_session()
+    dispatched = 0
+    try:
+        while True:
+            claimed = publish_scheduler.claim_due_publishes(db)
+            if not claimed:
+                break
+
+            sent = []
+            try:
+                with celery_app.producer_or_acquire() as producer:
+                    for job in claimed:
+                        publish_post_task.apply_async(
+                            args=(job["user_id"], job["post_id"], job["canonical_urls"]),
+                            kwargs={
+                                "hashnode_publication_id": job["hashnode_publication_id"],
+                                "tags": job["tags"],
+                                "platform_task_ids": job["task_ids"],
+                            },
+                            producer=producer,
+                            lane="bulk",  # scheduled drops shouldn't hold up interactive publishes
+                        )
+                        sent.append(job["id"])
+            except Exception as e:
+                # Broker trouble: put what wasn't sent back on the schedule and stop for now
+                unsent = [job["id"] for job in claimed if job["id"] not in sent]
+                print(f"⚠️ Publish scheduler could not dispatch {len(unsent)} publishes: {e}")
+                publish_scheduler.release(db, unsent, retry_scheduler.RETRY_BASE_DELAY)
+                dispatched += len(sent)
+                break
+
+            dispatched += len(sent)
+            if len(claimed) < publish_scheduler.PUBLISH_SCHEDULE_BATCH:
+                break
+
+        if dispatched:
+            print(f"🗓️ Publish scheduler dispatched {dispatched} scheduled publishes")
+        return {"dispatched": dispatched}
+    finally:
+        db.close()
+
 # Export tasks for explicit registration
-__all__ = ['simple_test_task', 'publish_to_platform_task']
+__all__ = ['simple_test_task', 'publish_to_platform_task', 'publish_post_task', 'update_post_publish_status_task', 'sweep_due_retries_task', 'dispatch_scheduled_publishes_task']
 
 # IMPORTANT: Create synchronous versions of your posting_service functions (e.g., post_to_devto_sync)
 # or use a library like `anyio` to run async code from sync Celery tasks:
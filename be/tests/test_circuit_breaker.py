@@ -0,0 +1,105 @@
+# backend/tests/test_circuit_breaker.py
+import time
+
+import httpx
+import pytest
+
+from services import circuit_breaker
+
+
+@pytest.fixture
+def breaker(shared_state, monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_BREAKER_ENABLED", True)
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_MIN_CALLS", 4)
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_FAILURE_RATIO", 0.5)
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_SLOW_CALL_SECONDS", 10.0)
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_SLOW_CALL_RATIO", 0.5)
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_WINDOW_SECONDS", 60.0)
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_OPEN_SECONDS", 0.2)
+    monkeypatch.setattr(circuit_breaker, "CIRCUIT_HALF_OPEN_PROBES", 2)
+
+
+def _trip(platform="hashnode"):
+    for failed in (True, False, True, False):
+        circuit_breaker.record(platform, failed, 0.1)
+
+
+def test_closed_until_failure_ratio_reached(breaker):
+    circuit_breaker.record("hashnode", True, 0.1)
+    circuit_breaker.record("hashnode", True, 0.1)
+    # Below CIRCUIT_MIN_CALLS nothing trips, however bad the ratio
+    assert circuit_breaker.allow("hashnode") == (True, 0.0)
+    assert circuit_breaker.get_state("hashnode")["state"] == "closed"
+
+
+def test_opens_on_failure_ratio_and_refuses_calls(breaker):
+    _trip()
+
+    allowed, retry_in = circuit_breaker.allow("hashnode")
+    state = circuit_breaker.get_state("hashnode")
+
+    assert not allowed
+    assert 0 < retry_in <= 0.2
+    assert state["state"] == "open"
+    assert state["trips"] == 1
+    assert state["trip_reason"] == "error rate 2/4"
+
+
+def test_opens_on_slow_calls(breaker):
+    for elapsed in (12, 0.1, 15, 0.1):
+        circuit_breaker.record("hashnode", False, elapsed)
+    assert circuit_breaker.get_state("hashnode")["trip_reason"] == "slow calls 2/4"
+
+
+def test_half_open_probes_close_the_circuit(breaker):
+    _trip()
+    time.sleep(0.25)
+
+    # Open period over: exactly CIRCUIT_HALF_OPEN_PROBES calls may probe
+    assert circuit_breaker.allow("hashnode")[0]
+    assert circuit_breaker.allow("hashnode")[0]
+    assert not circuit_breaker.allow("hashnode")[0]
+    assert circuit_breaker.get_state("hashnode")["state"] == "half_open"
+
+    circuit_breaker.record("hashnode", False, 0.1)
+    circuit_breaker.record("hashnode", False, 0.1)
+
+    assert circuit_breaker.get_state("hashnode")["state"] == "closed"
+    assert circuit_breaker.allow("hashnode") == (True, 0.0)
+
+
+def test_failed_probe_opens_again(breaker):
+    _trip()
+    time.sleep(0.25)
+    assert circuit_breaker.allow("hashnode")[0]
+
+    circuit_breaker.record("hashnode", True, 0.1)
+
+    state = circuit_breaker.get_state("hashnode")
+    assert state["state"] == "open"
+    assert state["trips"] == 2
+    assert state["trip_reason"] == "half-open probe failed"
+    assert not circuit_breaker.allow("hashnode")[0]
+
+
+def test_platforms_have_separate_breakers(breaker):
+    _trip("hashnode")
+    assert circuit_breaker.allow("dev.to") == (True, 0.0)
+    # Medium has no breaker at all
+    assert circuit_breaker.allow("medium") == (True, 0.0)
+
+
+def test_track_records_platform_failures_only(breaker):
+    request = httpx.Request("POST", "https://gql.hashnode.com/")
+    client_error = httpx.HTTPStatusError("bad key", request=request, response=httpx.Response(401, request=request))
+    for _ in range(4):
+        with pytest.raises(httpx.HTTPStatusError):
+            with circuit_breaker.track("hashnode"):
+                raise client_error
+    assert circuit_breaker.get_state("hashnode")["state"] == "closed"
+
+    for _ in range(4):
+        with pytest.raises(httpx.ConnectError):
+            with circuit_breaker.track("dev.to"):
+                raise httpx.ConnectError("refused", request=request)
+    assert circuit_breaker.get_state("dev.to")["state"] == "open"
@@ -0,0 +1,91 @@
+# backend/tests/test_dead_letters.py
+from datetime import timedelta
+
+import httpx
+import pytest
+
+import models
+from services import dead_letters, retry_scheduler
+
+
+@pytest.fixture
+def post(db):
+    user = models.User(email="dead@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    post = models.Post(title="Dead", content_markdown="# Dead", author_id=user.id)
+    db.add(post)
+    db.commit()
+    return post
+
+
+def _dead_letter(db, post, platform_name="hashnode", status_code=503):
+    letter = dead_letters.record(
+        db, post.id, platform_name,
+        {"post_id": post.id, "user_id": post.author_id, "platform_name": platform_name, "task_id": "task-failed"},
+        "Service Unavailable", status_code=status_code,
+    )
+    db.commit()
+    return letter
+
+
+def test_describe_error_keeps_response_details_but_not_session_headers():
+    request = httpx.Request("POST", "https://dev.to/api/articles")
+    response = httpx.Response(
+        429, request=request, text="slow down",
+        headers={"Retry-After": "30", "Set-Cookie": "session=secret"},
+    )
+    details = dead_letters.describe_error(httpx.HTTPStatusError("429", request=request, response=response))
+
+    assert details["status_code"] == 429
+    assert details["response_body"] == "slow down"
+    assert details["response_headers"]["retry-after"] == "30"
+    assert "set-cookie" not in details["response_headers"]
+
+
+def test_find_filters_and_skips_replayed(db, post):
+    hashnode = _dead_letter(db, post, "hashnode")
+    devto = _dead_letter(db, post, "dev.to", status_code=401)
+
+    assert dead_letters.find(db).all() == [hashnode, devto]
+    assert dead_letters.find(db, platform_name="dev.to").all() == [devto]
+    assert dead_letters.find(db, status_code=503).all() == [hashnode]
+
+    dead_letters.replay(db, [hashnode])
+    assert dead_letters.find(db).all() == [devto]
+    assert dead_letters.find(db, include_replayed=True).count() == 2
+
+
+def test_replay_hands_publishes_to_the_retry_sweeper_in_batches(db, post):
+    letters = [_dead_letter(db, post, platform) for platform in ("hashnode", "dev.to", "medium")]
+    now = retry_scheduler.utcnow()
+
+    replayed = dead_letters.replay(db, letters, batch_size=2, batch_interval=60, now=now)
+
+    assert replayed["batches"] == 2
+    assert replayed["last_batch_at"] == now + timedelta(seconds=60)
+    assert {row[2] for row in retry_scheduler.claim_due_retries(db, now=now)} == {"hashnode", "dev.to"}
+    claimed = retry_scheduler.claim_due_retries(db, now=now + timedelta(seconds=60))
+    row_id, post_id, platform_name, author_id, task_args = claimed[0]
+    assert (post_id, platform_name, author_id) == (post.id, "medium", post.author_id)
+    # A fresh task id, in the bulk lane
+    assert task_args["task_id"] == replayed["task_ids"][letters[2].id] != "task-failed"
+    assert task_args["lane"] == "bulk"
+
+
+def test_replay_resets_the_publish_row(db, post):
+    row = models.PublishedPost(
+        original_post_id=post.id, platform_name="hashnode", status="failed", error_message="503", retry_count=5,
+    )
+    db.add(row)
+    db.commit()
+    letter = _dead_letter(db, post)
+
+    dead_letters.replay(db, [letter])
+    db.expire_all()
+
+    assert (row.status, row.error_message, row.retry_count) == ("pending", None, 0)
+    assert row.task_id == letter.replay_task_id
+    assert letter.published_post_id == row.id
+    assert letter.replay_count == 1
+    assert db.get(models.Post, post.id).publish_status == "publishing"
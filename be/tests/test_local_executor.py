@@ -0,0 +1,91 @@
+# backend/tests/test_local_executor.py
+from datetime import timedelta
+
+import pytest
+from celery import states
+
+import models
+from services import local_executor, publish_scheduler, retry_scheduler
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    """Jobs handed to the executor's queue, with no executor running"""
+    jobs = []
+    monkeypatch.setattr(local_executor, "_enqueue", jobs.append)
+    monkeypatch.setattr(local_executor, "PUBLISH_EXECUTOR", "local")
+    local_executor._results.clear()
+    return jobs
+
+
+@pytest.fixture
+def post(db):
+    user = models.User(email="local@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    post = models.Post(title="Local", content_markdown="# Local", author_id=user.id)
+    db.add(post)
+    db.commit()
+    return post
+
+
+def _row(db, post, platform_name, status, **values):
+    row = models.PublishedPost(original_post_id=post.id, platform_name=platform_name, status=status, **values)
+    db.add(row)
+    db.commit()
+    return row
+
+
+def test_submit_persists_jobs_before_queueing_them(db, post, queued):
+    row = _row(db, post, "dev.to", "pending")
+    jobs = local_executor.platform_jobs(post.author_id, post.id, {"dev.to": "https://blog.example.com/1"}, {"dev.to": "task-1"})
+
+    local_executor.submit(db, jobs)
+    db.expire_all()
+
+    assert queued == jobs
+    assert (row.status, row.task_id) == ("pending", "task-1")
+    assert row.error_details["task"]["canonical_url_on_your_site"] == "https://blog.example.com/1"
+
+
+def test_recover_requeues_interrupted_jobs_only(db, post, queued):
+    def job(platform_name, task_id):
+        return {"error_details": {"task": {"post_id": post.id, "platform_name": platform_name, "task_id": task_id}}}
+    _row(db, post, "dev.to", "pending", **job("dev.to", "task-pending"))
+    _row(db, post, "hashnode", "processing", **job("hashnode", "task-processing"))
+    _row(db, post, "medium", "pending", next_retry_at=retry_scheduler.utcnow() + timedelta(hours=1), **job("medium", "task-retry"))
+    _row(db, post, "substack", "success", **job("substack", "task-done"))
+
+    assert local_executor._recover() == 2
+    assert sorted(job["task_id"] for job in queued) == ["task-pending", "task-processing"]
+
+
+def test_sweep_queues_due_retries_and_scheduled_publishes(db, post, queued):
+    _row(db, post, "dev.to", "pending", next_retry_at=retry_scheduler.utcnow() - timedelta(seconds=5),
+         error_details={"task": {"platform_name": "dev.to", "task_id": "task-retry"}})
+    _row(db, post, "hashnode", "scheduled")
+    publish_scheduler.schedule_publish(
+        db, post.author_id, post.id, publish_scheduler.utcnow() - timedelta(seconds=5),
+        {"hashnode": "https://blog.example.com/1"}, task_ids={"hashnode": "task-scheduled"}
+    )
+    db.commit()
+
+    assert local_executor._sweep() == 2
+    retry, scheduled = queued
+    assert (retry["task_id"], retry["user_id"]) == ("task-retry", post.author_id)
+    assert (scheduled["task_id"], scheduled["lane"]) == ("task-scheduled", "bulk")
+    assert local_executor._sweep() == 0
+
+
+def test_task_metas_survive_a_restart_through_the_rows(db, post, queued):
+    _row(db, post, "dev.to", "success", task_id="task-done", platform_post_url="https://dev.to/x", platform_post_id="7")
+    _row(db, post, "hashnode", "processing", task_id="task-running")
+    local_executor._record("task-fresh", states.STARTED)
+
+    metas = local_executor.task_metas(["task-done", "task-running", "task-fresh", "task-unknown"])
+
+    assert metas["task-done"]["status"] == states.SUCCESS
+    assert metas["task-done"]["result"]["post_url"] == "https://dev.to/x"
+    assert metas["task-running"]["status"] == states.STARTED
+    assert metas["task-fresh"]["status"] == states.STARTED
+    assert "task-unknown" not in metas
@@ -0,0 +1,102 @@
+# backend/tests/test_lookup_cache.py
+import asyncio
+
+import pytest
+
+from services.lookup_cache import AsyncTTLCache
+
+
+class Loader:
+    """Counts upstream calls; each call takes a moment so concurrent callers overlap"""
+
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return f"value-{self.calls}"
+
+
+def test_concurrent_misses_share_one_load():
+    cache, loader = AsyncTTLCache(ttl=60), Loader()
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load("key", loader) for _ in range(10)))
+
+    assert asyncio.run(main()) == ["value-1"] * 10
+    assert loader.calls == 1
+
+
+def test_hits_until_expiry():
+    cache, loader = AsyncTTLCache(ttl=0.05), Loader()
+
+    async def main():
+        first = await cache.get_or_load("key", loader)
+        second = await cache.get_or_load("key", loader)
+        await asyncio.sleep(0.06)
+        return first, second, await cache.get_or_load("key", loader)
+
+    assert asyncio.run(main()) == ("value-1", "value-1", "value-2")
+
+
+def test_failed_loads_are_shared_but_not_cached():
+    cache, loader = AsyncTTLCache(ttl=60), Loader(fail=True)
+
+    async def main():
+        results = await asyncio.gather(*(cache.get_or_load("key", loader) for _ in range(3)), return_exceptions=True)
+        loader.fail = False
+        return results, await cache.get_or_load("key", loader)
+
+    results, retried = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retried == "value-2"
+    assert loader.calls == 2
+
+
+def test_background_refresh_serves_the_stale_entry():
+    cache, loader = AsyncTTLCache(ttl=0.2, refresh_ahead=0.15), Loader()
+
+    async def main():
+        await cache.get_or_load("key", loader)
+        await asyncio.sleep(0.1)  # inside the refresh-ahead window
+        served = await cache.get_or_load("key", loader, background_refresh=True)
+        await asyncio.sleep(0.05)  # let the refresh finish
+        return served, await cache.get_or_load("key", loader)
+
+    assert asyncio.run(main()) == ("value-1", "value-2")
+    assert loader.calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_load():
+    cache, loader = AsyncTTLCache(ttl=60), Loader()
+
+    async def main():
+        impatient = asyncio.ensure_future(cache.get_or_load("key", loader))
+        patient = asyncio.ensure_future(cache.get_or_load("key", loader))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+        return await patient
+
+    assert asyncio.run(main()) == "value-1"
+    assert loader.calls == 1
+
+
+def test_lru_eviction_and_invalidate():
+    cache = AsyncTTLCache(ttl=60, maxsize=2)
+
+    async def main():
+        for key in ("a", "b", "c"):
+            await cache.get_or_load(key, Loader())
+
+    asyncio.run(main())
+    assert list(cache._entries) == ["b", "c"]
+    cache.invalidate("b")
+    assert list(cache._entries) == ["c"]
+    cache.invalidate()
+    assert not cache._entries
@@ -0,0 +1,157 @@
+# backend/tests/test_posting_service.py
+import itertools
+import json
+import time
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from services import posting_service
+
+
+class FakeHashnode:
+    """Just enough of the Hashnode GraphQL API for the draft → publish steps"""
+
+    def __init__(self):
+        self.drafts = {}
+        self.posts = []  # newest first, like the publication posts query
+        self.create_draft_requests = 0
+        self._ids = itertools.count(1)
+
+    def object_id(self, created_at: float = None) -> str:
+        """An id shaped like Hashnode's MongoDB ObjectIds: epoch seconds, then a counter"""
+        return f"{int(created_at or time.time()):08x}{next(self._ids):016x}"
+
+    def add_draft(self, created_at: float = None) -> str:
+        draft_id = self.object_id(created_at)
+        self.drafts[draft_id] = {"id": draft_id, "slug": draft_id, "title": "Resumable"}
+        return draft_id
+
+    def add_post(self, title: str, published_at: float) -> dict:
+        post = {
+            "id": self.object_id(published_at),
+            "slug": f"post-{len(self.posts)}",
+            "title": title,
+            "url": f"https://mock.hashnode.dev/{len(self.posts)}",
+            "publishedAt": datetime.fromtimestamp(published_at, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
+        }
+        self.posts.insert(0, post)
+        return post
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        query, variables = body["query"], body.get("variables") or {}
+        if "createDraft" in query:
+            self.create_draft_requests += 1
+            draft_id = self.add_draft()
+            self.drafts[draft_id]["title"] = variables["input"]["title"]
+            return httpx.Response(200, json={"data": {"createDraft": {"draft": self.drafts[draft_id]}}})
+        if "publishDraft" in query:
+            draft = self.drafts.pop(variables["input"]["draftId"], None)
+            if draft is None:
+                return httpx.Response(200, json={"errors": [{"message": "Draft not found"}]})
+            post = self.add_post(draft["title"], time.time())
+            return httpx.Response(200, json={"data": {"publishDraft": {"post": post}}})
+        if "draft(" in query:
+            draft = self.drafts.get(variables["id"])
+            if draft is None:
+                return httpx.Response(200, json={"errors": [{"message": "Not found", "extensions": {"code": "NOT_FOUND"}}]})
+            return httpx.Response(200, json={"data": {"draft": draft}})
+        if "publication(" in query:
+            edges = [{"node": post} for post in self.posts[:variables["first"]]]
+            return httpx.Response(200, json={"data": {"publication": {"posts": {"edges": edges}}}})
+        return httpx.Response(400, json={"errors": [{"message": "unknown query"}]})
+
+
+@pytest.fixture
+def hashnode(monkeypatch):
+    fake = FakeHashnode()
+    monkeypatch.setattr(
+        posting_service, "get_client",
+        lambda platform: httpx.AsyncClient(transport=httpx.MockTransport(fake.handle), base_url="https://gql.hashnode.com"),
+    )
+    return fake
+
+
+def _publish(run_async, **kwargs):
+    return run_async(posting_service.post_to_hashnode("key", "publication", "Resumable", "# Resumable", **kwargs))
+
+
+def test_new_publish_reports_its_draft_before_publishing(hashnode, run_async):
+    saved = []
+
+    def on_draft_created(draft_id):
+        saved.append(draft_id)
+        assert draft_id in hashnode.drafts  # not published yet
+
+    result = _publish(run_async, on_draft_created=on_draft_created)
+
+    assert saved == [result["draft_id"]]
+    assert result["resumed_from_draft"] is False
+    assert result["post_url"] == hashnode.posts[0]["url"]
+
+
+def test_resume_publishes_the_saved_draft(hashnode, run_async):
+    draft_id = hashnode.add_draft()
+
+    result = _publish(run_async, draft_id=draft_id)
+
+    assert result["resumed_from_draft"] is True
+    assert result["draft_id"] == draft_id
+    assert hashnode.create_draft_requests == 0
+    assert len(hashnode.posts) == 1
+
+
+def test_resume_records_a_draft_that_was_already_published(hashnode, run_async):
+    # An earlier attempt published the draft and died before saving the outcome
+    draft_id = hashnode.add_draft()
+    first = _publish(run_async, draft_id=draft_id)
+
+    result = _publish(run_async, draft_id=draft_id)
+
+    assert result["resumed_from_draft"] is True
+    assert result["post_id"] == first["post_id"]
+    assert hashnode.create_draft_requests == 0
+    assert len(hashnode.posts) == 1
+
+
+def test_resume_ignores_an_older_post_with_the_same_title(hashnode, run_async):
+    older = hashnode.add_post("Resumable", published_at=time.time() - 86400)
+    draft_id = hashnode.add_draft()
+    del hashnode.drafts[draft_id]  # deleted without being published
+
+    result = _publish(run_async, draft_id=draft_id)
+
+    assert result["resumed_from_draft"] is False
+    assert result["post_id"] != older["id"]
+    assert hashnode.create_draft_requests == 1
+
+
+def test_resume_starts_over_when_the_draft_is_gone(hashnode, run_async):
+    saved = []
+    gone = hashnode.object_id()
+
+    result = _publish(run_async, draft_id=gone, on_draft_created=saved.append)
+
+    assert result["resumed_from_draft"] is False
+    assert result["draft_id"] != gone
+    assert saved == [result["draft_id"]]
+    assert hashnode.create_draft_requests == 1
+
+
+def test_resume_does_not_duplicate_a_draft_that_still_exists(hashnode, run_async, monkeypatch):
+    draft_id = hashnode.add_draft()
+
+    async def rejected(api_key, draft_id):
+        raise posting_service.HashnodeDraftError("publishDraft rejected")
+    monkeypatch.setattr(posting_service, "publish_hashnode_draft", rejected)
+
+    with pytest.raises(posting_service.HashnodeDraftError):
+        _publish(run_async, draft_id=draft_id)
+    assert hashnode.create_draft_requests == 0
+
+
+def test_object_id_time_reads_the_embedded_timestamp():
+    assert posting_service.object_id_time("5f0000000000000000000001") == datetime.fromtimestamp(0x5f000000, tz=timezone.utc)
+    assert posting_service.object_id_time("draft-saved") is None
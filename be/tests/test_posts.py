@@ -0,0 +1,163 @@
+# backend/tests/test_posts.py
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import models
+import security
+from routers import posts
+from services import posting_service, publish_scheduler
+
+
+@pytest.fixture
+def post(db):
+    user = models.User(email="posts@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    post = models.Post(title="Hello", content_markdown="# Hello", author_id=user.id)
+    db.add(post)
+    db.flush()
+    for platform_name in ("dev.to", "hashnode"):
+        db.add(models.PlatformCredential(user_id=user.id, platform_name=platform_name, api_key="key"))
+    db.commit()
+    return post
+
+
+@pytest.fixture
+def dispatched(monkeypatch):
+    """Batch tasks sent to the broker"""
+    calls = []
+    monkeypatch.setattr(posts.publish_post_task, "apply_async", lambda args, kwargs: calls.append((args, kwargs)))
+    return calls
+
+
+@pytest.fixture
+def client(post):
+    app = FastAPI()
+    app.include_router(posts.router, prefix="/api/posts")
+    app.dependency_overrides[security.get_current_active_user] = lambda: post.author
+    return TestClient(app)
+
+
+def _published(db, post, platform_name, tags=None, **values):
+    """A PublishedPost row for content that is live on the platform as it is now"""
+    canonical_url = posts.get_canonical_url(post.id, platform_name)
+    row = models.PublishedPost(
+        original_post_id=post.id, platform_name=platform_name, status="success", platform_post_id="1",
+        content_hash=posting_service.content_fingerprint(post.title, post.content_markdown, tags=tags, canonical_url=canonical_url),
+        **values
+    )
+    db.add(row)
+    db.commit()
+    return row
+
+
+def _rows(db, post):
+    db.expire_all()
+    return {row.platform_name: row for row in db.query(models.PublishedPost).filter_by(original_post_id=post.id)}
+
+
+def test_is_already_published_compares_the_whole_fingerprint(post, db):
+    row = _published(db, post, "dev.to", tags=["python"])
+    canonical_url = posts.get_canonical_url(post.id, "dev.to")
+
+    assert posts.is_already_published(row, post, ["python"], canonical_url)
+    assert not posts.is_already_published(row, post, ["rust"], canonical_url)
+    assert not posts.is_already_published(row, post, ["python"], "https://elsewhere.example.com")
+    post.content_markdown = "# Hello again"
+    assert not posts.is_already_published(row, post, ["python"], canonical_url)
+    assert not posts.is_already_published(None, post, ["python"], canonical_url)
+
+
+def test_unchanged_platforms_are_not_dispatched(client, post, db, dispatched):
+    _published(db, post, "dev.to")
+
+    response = client.post(f"/api/posts/{post.id}/publish", json={"platforms": ["dev.to", "hashnode"]})
+
+    body = response.json()
+    assert body["skipped_platforms"] == ["dev.to"]
+    assert body["platforms_queued"] == ["hashnode"]
+    (args, kwargs), = dispatched
+    assert list(args[2]) == ["hashnode"]
+
+
+def test_nothing_is_dispatched_when_every_platform_is_unchanged(client, post, db, dispatched):
+    _published(db, post, "dev.to")
+
+    body = client.post(f"/api/posts/{post.id}/publish", json={"platforms": ["dev.to"]}).json()
+
+    assert body["task_ids"] == {}
+    assert dispatched == []
+    assert _rows(db, post)["dev.to"].status == "success"
+    assert db.get(models.Post, post.id).publish_status == "published"
+
+
+def test_dispatch_failure_fails_the_rows_and_the_post(client, post, db, monkeypatch):
+    def broker_down(args, kwargs):
+        raise ConnectionError("broker down")
+    monkeypatch.setattr(posts.publish_post_task, "apply_async", broker_down)
+
+    body = client.post(f"/api/posts/{post.id}/publish", json={"platforms": ["dev.to", "hashnode"]}).json()
+
+    assert body["task_ids"] == {}
+    rows = _rows(db, post)
+    assert {row.status for row in rows.values()} == {"failed"}
+    assert rows["dev.to"].error_message == "Task dispatch failed: broker down"
+    assert db.get(models.Post, post.id).publish_status == "failed"
+
+
+def test_publish_reports_no_queued_platforms_when_all_were_skipped(client, post, db, dispatched):
+    _published(db, post, "dev.to")
+
+    body = client.post("/api/posts/publish", json={"post_id": post.id, "platforms": ["dev.to"]}).json()
+
+    assert body["platforms_queued"] == []
+    assert body["skipped_platforms"] == ["dev.to"]
+
+
+def test_scheduled_publish_waits_for_the_dispatcher(client, post, db, dispatched):
+    publish_at = publish_scheduler.utcnow() + timedelta(hours=1)
+
+    body = client.post(f"/api/posts/{post.id}/publish", json={"platforms": ["dev.to"], "publish_at": publish_at.isoformat()}).json()
+
+    assert dispatched == []
+    assert body["platforms_queued"] == ["dev.to"]
+    assert _rows(db, post)["dev.to"].status == "scheduled"
+    assert db.get(models.Post, post.id).publish_status == "scheduled"
+    scheduled = publish_scheduler.get_pending(db, post.id)
+    assert scheduled.task_ids == body["task_ids"]
+
+
+def test_cancelling_a_schedule_restores_the_previous_rows(client, post, db, dispatched):
+    # hashnode failed earlier and kept a draft to resume; dev.to was never published
+    _published(db, post, "hashnode", task_id="task-old")
+    db.query(models.PublishedPost).update({
+        "status": "failed", "error_message": "503", "retry_count": 3, "publish_step": "draft_created", "platform_draft_id": "draft-1",
+    })
+    db.commit()
+    publish_at = (publish_scheduler.utcnow() + timedelta(hours=1)).isoformat()
+    client.post(f"/api/posts/{post.id}/publish", json={"platforms": ["dev.to", "hashnode"], "publish_at": publish_at})
+
+    response = client.delete(f"/api/posts/{post.id}/schedule")
+
+    assert response.status_code == 200
+    rows = _rows(db, post)
+    assert list(rows) == ["hashnode"]
+    hashnode = rows["hashnode"]
+    assert (hashnode.status, hashnode.error_message, hashnode.retry_count, hashnode.task_id) == ("failed", "503", 3, "task-old")
+    assert hashnode.platform_draft_id == "draft-1"
+    assert response.json()["publish_status"] == "failed"
+    assert client.delete(f"/api/posts/{post.id}/schedule").status_code == 404
+
+
+def test_new_publish_replaces_the_schedule(client, post, db, dispatched):
+    publish_at = (publish_scheduler.utcnow() + timedelta(hours=1)).isoformat()
+    client.post(f"/api/posts/{post.id}/publish", json={"platforms": ["dev.to"], "publish_at": publish_at})
+
+    client.post(f"/api/posts/{post.id}/publish", json={"platforms": ["dev.to"]})
+
+    assert publish_scheduler.get_pending(db, post.id) is None
+    assert _rows(db, post)["dev.to"].status == "pending"
+    assert len(dispatched) == 1
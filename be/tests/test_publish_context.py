@@ -0,0 +1,64 @@
+# backend/tests/test_publish_context.py
+import pytest
+from sqlalchemy import event
+
+import database
+import models
+from services.publish_context import load_publish_context
+
+
+@pytest.fixture
+def post(db):
+    user = models.User(email="context@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    post = models.Post(title="Context", content_markdown="# Context", author_id=user.id)
+    db.add(post)
+    db.flush()
+    db.add_all([
+        models.PlatformCredential(user_id=user.id, platform_name="dev.to", api_key="devto-key"),
+        models.PlatformCredential(user_id=user.id, platform_name="hashnode", access_token="hn-token", publication_id="pub"),
+        models.PublishedPost(
+            original_post_id=post.id, platform_name="hashnode", status="pending",
+            publish_step="draft_created", platform_draft_id="draft-1",
+        ),
+    ])
+    db.commit()
+    return post
+
+
+def test_loads_everything_in_one_query(post, db):
+    user_id, post_id = post.author_id, post.id
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(database.engine, "before_cursor_execute", listener)
+    try:
+        context = load_publish_context(db, user_id, post_id, ["dev.to", "hashnode", "medium"])
+    finally:
+        event.remove(database.engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 1
+    assert (context.post.id, context.post.title) == (post_id, "Context")
+    assert sorted(context.credentials) == ["dev.to", "hashnode"]
+    assert context.credentials["dev.to"].secret == "devto-key"
+    assert context.credentials["hashnode"].publication_id == "pub"
+    assert list(context.rows) == ["hashnode"]
+    assert context.rows["hashnode"].resume_draft_id == "draft-1"
+
+
+def test_other_users_post_is_not_loaded(post, db):
+    assert load_publish_context(db, post.author_id + 1, post.id, ["dev.to"]) is None
+
+
+def test_context_is_read_only(post, db):
+    context = load_publish_context(db, post.author_id, post.id, ["dev.to", "hashnode"])
+
+    with pytest.raises(AttributeError):
+        context.post.title = "Changed"
+    with pytest.raises(AttributeError):
+        context.credentials["dev.to"].api_key = "stolen"
+    with pytest.raises(TypeError):
+        context.credentials["medium"] = context.credentials["dev.to"]
+    with pytest.raises(TypeError):
+        del context.rows["hashnode"]
+    assert "devto-key" not in repr(context.credentials["dev.to"])
@@ -0,0 +1,76 @@
+# backend/tests/test_publish_events.py
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import crud
+import models
+import security
+from routers import tasks as tasks_router
+from services import publish_events
+
+
+@pytest.fixture
+def post(db):
+    user = models.User(email="stream@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    post = models.Post(title="Live", content_markdown="# Live", author_id=user.id, publish_status="publishing")
+    db.add(post)
+    db.flush()
+    db.add(models.PublishedPost(original_post_id=post.id, platform_name="dev.to", status="pending", task_id="task-devto"))
+    db.commit()
+    return post
+
+
+@pytest.fixture
+def stream(post, monkeypatch):
+    """GET the post's event stream in process; it closes on its own after a moment"""
+    monkeypatch.setattr(publish_events, "_ensure_consumer", lambda: None)  # no Celery event receiver
+    monkeypatch.setattr(tasks_router, "STREAM_MAX_SECONDS", 0.2)
+    monkeypatch.setattr(tasks_router, "STREAM_KEEPALIVE_SECONDS", 0.05)
+    app = FastAPI()
+    app.include_router(tasks_router.router, prefix="/api/tasks")
+    app.dependency_overrides[security.get_current_user_for_stream] = lambda: post.author
+
+    async def get(post_id):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as client:
+            return await client.get(f"/api/tasks/stream/post/{post_id}")
+    return get
+
+
+def _events(response):
+    return [block.split("\n", 1)[0] for block in response.text.split("\n\n") if block.startswith("event: ")]
+
+
+def test_stream_starts_with_a_snapshot(stream, post, run_async):
+    response = run_async(stream(post.id))
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert _events(response)[0] == "event: snapshot"
+    assert '"task_id": "task-devto"' in response.text
+    assert ": ping" in response.text
+
+
+def test_step_reported_while_the_snapshot_is_read_is_streamed(stream, post, run_async, monkeypatch):
+    post_id = post.id
+    get_post_async = crud.get_post_async
+
+    async def get_post_then_progress(db, post_id, user_id):
+        db_post = await get_post_async(db, post_id=post_id, user_id=user_id)
+        publish_events.publish_local(post_id=post_id, platform="dev.to", state="started", platform_task_id="task-devto")
+        return db_post
+    monkeypatch.setattr(crud, "get_post_async", get_post_then_progress)
+
+    response = run_async(stream(post_id))
+
+    assert _events(response) == ["event: snapshot", "event: progress"]
+    assert '"state": "started"' in response.text
+    assert post_id not in publish_events._subscribers
+
+
+def test_unknown_post_does_not_leave_a_subscription(stream, post, run_async):
+    response = run_async(stream(post.id + 1))
+
+    assert response.status_code == 404
+    assert post.id + 1 not in publish_events._subscribers
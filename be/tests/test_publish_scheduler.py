@@ -0,0 +1,124 @@
+# backend/tests/test_publish_scheduler.py
+from datetime import timedelta
+
+import pytest
+
+import models
+from services import publish_scheduler
+
+
+@pytest.fixture
+def post(db):
+    user = models.User(email="schedule@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    post = models.Post(title="Later", content_markdown="# Later", author_id=user.id)
+    db.add(post)
+    db.commit()
+    return post
+
+
+def _schedule(db, post, seconds, platforms=("dev.to",), **kwargs):
+    scheduled = publish_scheduler.schedule_publish(
+        db, post.author_id, post.id, publish_scheduler.utcnow() + timedelta(seconds=seconds),
+        canonical_urls={platform: f"https://blog.example.com/{post.id}" for platform in platforms}, **kwargs
+    )
+    db.commit()
+    return scheduled
+
+
+def test_due_time_publishes_near_future_now(monkeypatch):
+    monkeypatch.setattr(publish_scheduler, "PUBLISH_SCHEDULE_MIN_LEAD", 5.0)
+    now = publish_scheduler.utcnow()
+
+    assert publish_scheduler.due_time(None) is None
+    assert publish_scheduler.due_time(now + timedelta(seconds=2)) is None
+    later = now + timedelta(hours=1)
+    assert publish_scheduler.due_time(later) == later
+    # Naive datetimes are UTC
+    assert publish_scheduler.due_time(later.replace(tzinfo=None)) == later
+
+
+def test_claim_due_publishes_takes_due_rows_earliest_first(db, post):
+    later = _schedule(db, post, -10, task_ids={"dev.to": "task-later"})
+    earliest = _schedule(db, post, -60)
+    _schedule(db, post, 3600)
+
+    claimed = publish_scheduler.claim_due_publishes(db)
+
+    assert [row["id"] for row in claimed] == [earliest.id, later.id]
+    assert claimed[1]["task_ids"] == {"dev.to": "task-later"}
+    assert claimed[1]["canonical_urls"] == {"dev.to": f"https://blog.example.com/{post.id}"}
+    assert publish_scheduler.claim_due_publishes(db) == []
+    db.expire_all()
+    assert db.get(models.ScheduledPublish, earliest.id).status == "dispatched"
+
+
+def test_claim_respects_limit(db, post):
+    first, second = _schedule(db, post, -20), _schedule(db, post, -10)
+
+    assert [row["id"] for row in publish_scheduler.claim_due_publishes(db, limit=1)] == [first.id]
+    assert [row["id"] for row in publish_scheduler.claim_due_publishes(db)] == [second.id]
+
+
+def test_release_puts_claimed_publishes_back(db, post):
+    scheduled = _schedule(db, post, -10)
+    publish_scheduler.claim_due_publishes(db)
+
+    publish_scheduler.release(db, [scheduled.id], delay=30)
+
+    assert publish_scheduler.claim_due_publishes(db) == []
+    later = publish_scheduler.utcnow() + timedelta(seconds=31)
+    assert [row["id"] for row in publish_scheduler.claim_due_publishes(db, now=later)] == [scheduled.id]
+
+
+def test_cancel_pending_removes_rows_the_schedule_created(db, post):
+    db.add(models.PublishedPost(original_post_id=post.id, platform_name="dev.to", status="scheduled"))
+    scheduled = _schedule(db, post, 3600, replaced_rows={"dev.to": None})
+
+    assert publish_scheduler.cancel_pending(db, post.id) == 1
+    db.commit()
+
+    assert db.query(models.PublishedPost).count() == 0
+    assert scheduled.status == "cancelled"
+    assert publish_scheduler.get_pending(db, post.id) is None
+
+
+def test_cancel_pending_restores_rows_the_schedule_reused(db, post):
+    retry_at = publish_scheduler.utcnow() + timedelta(minutes=5)
+    failed = models.PublishedPost(
+        original_post_id=post.id, platform_name="hashnode", status="failed", error_message="503",
+        retry_count=2, next_retry_at=retry_at, task_id="task-old",
+        publish_step="draft_created", platform_draft_id="draft-1",
+    )
+    db.add(failed)
+    db.flush()
+    replaced_rows = {"hashnode": publish_scheduler.replaced_state(failed)}
+    failed.status, failed.error_message, failed.retry_count, failed.next_retry_at, failed.task_id = (
+        "scheduled", None, 0, None, "task-new"
+    )
+    db.add(models.DeadLetter(
+        published_post_id=failed.id, post_id=post.id, platform_name="hashnode",
+        task_name="publish_to_platform_task", task_args={},
+    ))
+    _schedule(db, post, 3600, platforms=("hashnode",), replaced_rows=replaced_rows)
+
+    publish_scheduler.cancel_pending(db, post.id)
+    db.commit()
+    db.expire_all()
+
+    row = db.get(models.PublishedPost, failed.id)
+    assert (row.status, row.error_message, row.retry_count, row.task_id) == ("failed", "503", 2, "task-old")
+    assert row.next_retry_at.replace(tzinfo=None) == retry_at.replace(tzinfo=None)
+    # Fields the schedule never touched survive too, so the draft can still be resumed
+    assert (row.publish_step, row.platform_draft_id) == ("draft_created", "draft-1")
+
+
+def test_cancel_pending_leaves_rows_that_were_already_dispatched(db, post):
+    db.add(models.PublishedPost(original_post_id=post.id, platform_name="dev.to", status="processing"))
+    _schedule(db, post, 3600, replaced_rows={"dev.to": None})
+
+    publish_scheduler.cancel_pending(db, post.id)
+    db.commit()
+
+    assert db.query(models.PublishedPost).one().status == "processing"
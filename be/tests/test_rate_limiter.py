@@ -0,0 +1,76 @@
+# backend/tests/test_rate_limiter.py
+import httpx
+import pytest
+
+from services import rate_limiter
+
+
+@pytest.fixture
+def limits(shared_state, monkeypatch):
+    # 10 tokens per second, bursts of 2
+    monkeypatch.setattr(rate_limiter, "PLATFORM_LIMITS", {"dev.to": (10.0, 2)})
+    monkeypatch.setattr(rate_limiter, "RATE_LIMIT_ENABLED", True)
+
+
+def _response(status_code: int, headers: dict = None) -> httpx.Response:
+    request = httpx.Request("POST", "https://dev.to/api/articles", headers={"api-key": "key-a"})
+    return httpx.Response(status_code, headers=headers or {}, request=request)
+
+
+def test_burst_then_wait_for_refill(limits):
+    assert rate_limiter.acquire("dev.to", "key-a") == 0
+    assert rate_limiter.acquire("dev.to", "key-a") == 0
+    # Bucket empty: the next token arrives after 1/rate seconds
+    assert rate_limiter.acquire("dev.to", "key-a") == pytest.approx(0.1, abs=0.02)
+
+
+def test_buckets_are_per_credential(limits):
+    for _ in range(2):
+        rate_limiter.acquire("dev.to", "key-a")
+    assert rate_limiter.acquire("dev.to", "key-a") > 0
+    assert rate_limiter.acquire("dev.to", "key-b") == 0
+
+
+def test_unlimited_platform_never_waits(limits):
+    assert all(rate_limiter.acquire("medium", "key-a") == 0 for _ in range(20))
+
+
+def test_wait_for_slot_sleeps_short_waits(limits):
+    for _ in range(2):
+        rate_limiter.acquire("dev.to", "key-a")
+    assert rate_limiter.wait_for_slot("dev.to", "key-a", max_wait=1) == 0
+
+
+def test_wait_for_slot_hands_back_long_waits(limits):
+    for _ in range(2):
+        rate_limiter.acquire("dev.to", "key-a")
+    wait = rate_limiter.wait_for_slot("dev.to", "key-a", max_wait=0)
+    assert 0 < wait <= 0.11
+
+
+def test_429_blocks_the_bucket_for_retry_after(limits):
+    rate_limiter.observe_response("dev.to", "key-a", _response(429, {"Retry-After": "30"}))
+    assert rate_limiter.acquire("dev.to", "key-a") == pytest.approx(30, abs=1)
+    assert rate_limiter.wait_for_slot("dev.to", "key-a", max_wait=1) == pytest.approx(30, abs=1)
+
+
+def test_remaining_header_shrinks_the_bucket(limits):
+    rate_limiter.observe_response("dev.to", "key-a", _response(200, {"X-RateLimit-Remaining": "1"}))
+    assert rate_limiter.acquire("dev.to", "key-a") == 0
+    assert rate_limiter.acquire("dev.to", "key-a") > 0
+
+
+def test_retry_after_seconds_reads_delta_and_epoch_headers():
+    assert rate_limiter.retry_after_seconds(_response(429, {"Retry-After": "12"})) == 12
+    assert rate_limiter.retry_after_seconds(_response(429, {"X-RateLimit-Reset": "7"})) == 7
+    assert rate_limiter.retry_after_seconds(_response(500)) is None
+
+
+def test_429_with_retry_after_zero_does_not_block(limits):
+    rate_limiter.observe_response("dev.to", "key-a", _response(429, {"Retry-After": "0"}))
+    assert rate_limiter.acquire("dev.to", "key-a") == 0
+
+
+def test_429_without_a_hint_blocks_for_a_minute(limits):
+    rate_limiter.observe_response("dev.to", "key-a", _response(429))
+    assert rate_limiter.acquire("dev.to", "key-a") == pytest.approx(60, abs=1)
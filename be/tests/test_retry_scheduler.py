@@ -0,0 +1,101 @@
+# backend/tests/test_retry_scheduler.py
+from datetime import timedelta
+
+import pytest
+
+import models
+from services import retry_scheduler
+
+
+@pytest.fixture
+def backoff(monkeypatch):
+    monkeypatch.setattr(retry_scheduler, "RETRY_BASE_DELAY", 30.0)
+    monkeypatch.setattr(retry_scheduler, "RETRY_MAX_DELAY", 3600.0)
+
+
+def test_backoff_grows_with_equal_jitter(backoff):
+    for retry_count, full_delay in ((0, 30.0), (1, 60.0), (3, 240.0)):
+        for _ in range(50):
+            assert full_delay / 2 <= retry_scheduler.backoff_delay(retry_count) <= full_delay
+
+
+def test_backoff_is_capped(backoff):
+    for _ in range(50):
+        assert 1800.0 <= retry_scheduler.backoff_delay(20) <= 3600.0
+
+
+def test_retry_after_is_a_floor(backoff):
+    # Longer than any backoff for the first retry: the platform's wait wins
+    assert retry_scheduler.backoff_delay(0, retry_after=500.0) == 500.0
+    # Retry-After above the cap still wins; the cap only bounds our own backoff
+    assert retry_scheduler.backoff_delay(20, retry_after=7200.0) == 7200.0
+
+
+def test_short_retry_after_does_not_shorten_backoff(backoff):
+    for _ in range(50):
+        assert retry_scheduler.backoff_delay(3, retry_after=1.0) >= 120.0
+
+
+def _publish_rows(db, *offsets):
+    """A post with one PublishedPost per offset (seconds from now until its retry is due, None = not scheduled)"""
+    user = models.User(email="retry@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    post = models.Post(title="Retry me", content_markdown="# Retry me", author_id=user.id)
+    db.add(post)
+    db.flush()
+    now = retry_scheduler.utcnow()
+    rows = []
+    for i, offset in enumerate(offsets):
+        row = models.PublishedPost(
+            original_post_id=post.id, platform_name=f"platform-{i}", status="pending",
+            next_retry_at=None if offset is None else now + timedelta(seconds=offset),
+            error_details={"task": {"platform_name": f"platform-{i}"}},
+        )
+        db.add(row)
+        rows.append(row)
+    db.commit()
+    return post, rows
+
+
+def test_claim_due_retries_takes_due_rows_oldest_first(db):
+    post, (later, oldest, newer, scheduled, never) = _publish_rows(db, 5, -60, -10, 3600, None)
+
+    claimed = retry_scheduler.claim_due_retries(db)
+
+    assert [row_id for row_id, *_ in claimed] == [oldest.id, newer.id]
+    row_id, post_id, platform_name, author_id, task_args = claimed[0]
+    assert (post_id, platform_name, author_id) == (post.id, "platform-1", post.author_id)
+    assert task_args == {"platform_name": "platform-1"}
+
+
+def test_claimed_rows_are_not_claimed_again(db):
+    _publish_rows(db, -60, -10)
+
+    first = retry_scheduler.claim_due_retries(db)
+    second = retry_scheduler.claim_due_retries(db)
+
+    assert len(first) == 2
+    assert second == []
+    db.expire_all()
+    assert db.query(models.PublishedPost).filter(models.PublishedPost.next_retry_at.isnot(None)).count() == 0
+
+
+def test_claim_respects_limit(db):
+    _, rows = _publish_rows(db, -30, -20, -10)
+
+    claimed = retry_scheduler.claim_due_retries(db, limit=2)
+
+    assert [row_id for row_id, *_ in claimed] == [rows[0].id, rows[1].id]
+    assert [row_id for row_id, *_ in retry_scheduler.claim_due_retries(db)] == [rows[2].id]
+
+
+def test_release_puts_claimed_rows_back_on_the_schedule(db):
+    _, rows = _publish_rows(db, -60, -10)
+    ids = [row_id for row_id, *_ in retry_scheduler.claim_due_retries(db)]
+
+    retry_scheduler.release(db, ids, delay=30)
+
+    assert retry_scheduler.claim_due_retries(db) == []
+    later = retry_scheduler.utcnow() + timedelta(seconds=31)
+    assert sorted(row_id for row_id, *_ in retry_scheduler.claim_due_retries(db, now=later)) == sorted(ids)
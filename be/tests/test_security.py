@@ -0,0 +1,100 @@
+# backend/tests/test_security.py
+import pytest
+from fastapi import HTTPException
+
+import database
+import models
+import security
+
+
+@pytest.fixture
+def user(db, monkeypatch):
+    monkeypatch.setattr(security, "AUTH_CACHE_TTL", 60.0)
+    security._principals.clear()
+    security._tokens_by_user.clear()
+    user = models.User(email="cached@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _authenticate(run_async, token):
+    async def authenticate():
+        async with database.AsyncSessionLocal() as session:
+            return await security._user_from_token(token, session)
+    return run_async(authenticate())
+
+
+def _count_queries(monkeypatch):
+    queries = []
+    original = security.crud.get_user_async
+
+    async def counting(db, user_id):
+        queries.append(user_id)
+        return await original(db, user_id=user_id)
+    monkeypatch.setattr(security.crud, "get_user_async", counting)
+    return queries
+
+
+def test_verified_token_is_cached(user, run_async, monkeypatch):
+    queries = _count_queries(monkeypatch)
+    token = security.create_user_token(user)
+
+    first = _authenticate(run_async, token)
+    second = _authenticate(run_async, token)
+
+    assert (first.id, first.email) == (user.id, "cached@example.com")
+    assert second is first
+    assert queries == [user.id]
+
+
+def test_user_update_invalidates_cached_tokens(user, db, run_async):
+    token = security.create_user_token(user)
+    _authenticate(run_async, token)
+    assert token in security._principals
+
+    user.email = "renamed@example.com"
+    db.commit()
+
+    assert token not in security._principals
+    assert user.id not in security._tokens_by_user
+    # The token names the old email, so it no longer authenticates
+    with pytest.raises(HTTPException) as error:
+        _authenticate(run_async, token)
+    assert error.value.status_code == 401
+
+
+def test_user_delete_invalidates_cached_tokens(user, db, run_async):
+    token = security.create_user_token(user)
+    _authenticate(run_async, token)
+
+    db.delete(user)
+    db.commit()
+
+    assert token not in security._principals
+    with pytest.raises(HTTPException):
+        _authenticate(run_async, token)
+
+
+def test_invalidate_user_only_drops_that_user(user, db, run_async):
+    other = models.User(email="other@example.com", hashed_password="x")
+    db.add(other)
+    db.commit()
+    token, other_token = security.create_user_token(user), security.create_user_token(other)
+    _authenticate(run_async, token)
+    _authenticate(run_async, other_token)
+
+    security.invalidate_user(user.id)
+
+    assert token not in security._principals
+    assert other_token in security._principals
+
+
+def test_cache_is_bounded(user, run_async, monkeypatch):
+    monkeypatch.setattr(security, "AUTH_CACHE_SIZE", 2)
+    tokens = [security.create_user_token(user, expires_delta=security.timedelta(minutes=minutes)) for minutes in (10, 20, 30)]
+    for token in tokens:
+        _authenticate(run_async, token)
+
+    assert list(security._principals) == tokens[1:]
+    assert security._tokens_by_user[user.id] == set(tokens[1:])
@@ -0,0 +1,94 @@
+# backend/tests/test_task_status.py
+import json
+from types import SimpleNamespace
+
+import pytest
+from celery import states
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import models
+import security
+from routers import tasks as tasks_router
+
+
+class FakeBackend:
+    """Key-value result backend answering MGET from a dict of metas"""
+
+    def __init__(self, metas: dict):
+        self.values = {self.get_key_for_task(task_id): json.dumps(meta).encode() for task_id, meta in metas.items()}
+        self.mget_calls = []
+
+    def get_key_for_task(self, task_id):
+        return f"celery-task-meta-{task_id}".encode()
+
+    def mget(self, keys):
+        self.mget_calls.append(keys)
+        return [self.values.get(key) for key in keys]
+
+    def decode_result(self, value):
+        return json.loads(value)
+
+
+@pytest.fixture
+def users(db):
+    owner = models.User(email="owner@example.com", hashed_password="x")
+    other = models.User(email="other@example.com", hashed_password="x")
+    db.add_all([owner, other])
+    db.flush()
+    posts = {}
+    for user, task_ids in ((owner, ("task-a", "task-b")), (other, ("task-other",))):
+        post = models.Post(title="Status", content_markdown="# Status", author_id=user.id)
+        db.add(post)
+        db.flush()
+        posts[user.email] = post
+        for platform_name, task_id in zip(("dev.to", "hashnode"), task_ids):
+            db.add(models.PublishedPost(original_post_id=post.id, platform_name=platform_name, status="processing", task_id=task_id))
+    db.commit()
+    return owner, posts
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = FakeBackend({
+        "task-a": {"status": states.SUCCESS, "result": {"status": "success", "platform": "dev.to", "post_url": "https://dev.to/a"}},
+        "task-other": {"status": states.SUCCESS, "result": {"status": "success", "platform": "dev.to", "data": {"secret": 1}}},
+    })
+    monkeypatch.setattr(tasks_router, "celery_app", SimpleNamespace(backend=backend))
+    return backend
+
+
+@pytest.fixture
+def client(users):
+    owner, _ = users
+    app = FastAPI()
+    app.include_router(tasks_router.router, prefix="/api/tasks")
+    app.dependency_overrides[security.get_current_active_user] = lambda: owner
+    return TestClient(app)
+
+
+def test_bulk_status_reads_every_backend_state_in_one_mget(client, backend, users):
+    _, posts = users
+    response = client.post("/api/tasks/status/bulk", json={"post_ids": [posts["owner@example.com"].id]})
+
+    assert response.status_code == 200
+    tasks = response.json()["tasks"]
+    assert sorted(tasks) == ["task-a", "task-b"]
+    assert len(backend.mget_calls) == 1
+    assert tasks["task-a"]["status"] == states.SUCCESS
+    assert tasks["task-a"]["platform_info"]["platform"] == "dev.to"
+    assert tasks["task-b"]["status"] == states.PENDING
+    assert tasks["task-b"]["published_post"]["status"] == "processing"
+
+
+def test_bulk_status_never_reads_other_users_tasks(client, backend):
+    response = client.post("/api/tasks/status/bulk", json={"task_ids": ["task-a", "task-other", "made-up"]})
+
+    body = response.json()
+    assert list(body["tasks"]) == ["task-a"]
+    assert body["unknown"] == ["task-other", "made-up"]
+    assert backend.mget_calls == [[b"celery-task-meta-task-a"]]
+
+
+def test_bulk_status_needs_ids(client, backend):
+    assert client.post("/api/tasks/status/bulk", json={}).status_code == 400
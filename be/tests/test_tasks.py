@@ -0,0 +1,217 @@
+# backend/tests/test_tasks.py
+import httpx
+import pytest
+
+import models
+import tasks
+from services import circuit_breaker, posting_service, rate_limiter
+
+
+# --- Updating already-published articles in place ---
+
+@pytest.fixture
+def devto_calls(monkeypatch):
+    calls = []
+
+    async def update(api_key, article_id, *args, **kwargs):
+        calls.append(("update", article_id))
+        if article_id == "deleted":
+            raise posting_service.PlatformPostNotFound(article_id)
+        return {"id": int(article_id), "url": f"https://dev.to/{article_id}"}
+
+    async def post(api_key, *args, **kwargs):
+        calls.append(("post", None))
+        return {"id": 99, "url": "https://dev.to/99"}
+    monkeypatch.setattr(posting_service, "update_devto_article", update)
+    monkeypatch.setattr(posting_service, "post_to_devto", post)
+    return calls
+
+
+def _send(run_async, platform_name, existing_post_id):
+    credential = models.PlatformCredential(platform_name=platform_name, api_key="key")
+    rendition = {"title": "Title", "markdown_content": "# Title"}
+    return run_async(tasks._send_to_platform(platform_name, credential, rendition, existing_post_id=existing_post_id))
+
+
+def test_published_article_is_updated_in_place(devto_calls, run_async):
+    api_response, post_data = _send(run_async, "dev.to", "42")
+
+    assert devto_calls == [("update", "42")]
+    assert post_data["url"] == "https://dev.to/42"
+
+
+def test_article_deleted_on_the_platform_is_published_again(devto_calls, run_async):
+    api_response, post_data = _send(run_async, "dev.to", "deleted")
+
+    assert devto_calls == [("update", "deleted"), ("post", None)]
+    assert post_data["id"] == 99
+
+
+def test_first_publish_creates_the_article(devto_calls, run_async):
+    _send(run_async, "dev.to", None)
+
+    assert devto_calls == [("post", None)]
+
+
+# --- One batch task per post ---
+
+class Platforms:
+    """Stand-in for the platform APIs and everything around them the batch task talks to"""
+
+    def __init__(self):
+        self.sent = []
+        self.errors = {}  # platform -> exception raised by its call
+        self.rate_limited = set()
+        self.chords = []
+        self.chord_error = None
+        self.reported = {}  # task id -> reported result
+
+    async def send(self, platform_name, credential, rendition, **kwargs):
+        self.sent.append(platform_name)
+        if platform_name in self.errors:
+            raise self.errors[platform_name]
+        return {"id": f"{platform_name}-1"}, {"id": f"{platform_name}-1", "url": f"https://{platform_name}/1"}
+
+    def chord(self, retries):
+        def dispatch(callback):
+            if self.chord_error:
+                raise self.chord_error
+            self.chords.append((retries, callback))
+        return dispatch
+
+
+@pytest.fixture
+def platforms(monkeypatch):
+    fake = Platforms()
+    monkeypatch.setattr(tasks, "_send_to_platform", fake.send)
+    monkeypatch.setattr(tasks, "chord", fake.chord)
+    monkeypatch.setattr(tasks, "_report_platform_state", lambda task_id, state, result: fake.reported.__setitem__(task_id, result))
+    monkeypatch.setattr(tasks, "_emit_progress", lambda *args, **kwargs: None)
+    monkeypatch.setattr(circuit_breaker, "allow", lambda platform_name: (True, 0.0))
+    monkeypatch.setattr(circuit_breaker, "record", lambda *args: None)
+    monkeypatch.setattr(
+        rate_limiter, "wait_for_slot",
+        lambda platform_name, secret, max_wait=None: 30.0 if platform_name in fake.rate_limited else 0.0
+    )
+    return fake
+
+
+@pytest.fixture
+def post(db):
+    user = models.User(email="batch@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    post = models.Post(title="Batch", content_markdown="# Batch", author_id=user.id)
+    db.add(post)
+    db.flush()
+    for platform_name in ("dev.to", "hashnode"):
+        db.add(models.PlatformCredential(user_id=user.id, platform_name=platform_name, api_key="key", publication_id="pub"))
+        db.add(models.PublishedPost(original_post_id=post.id, platform_name=platform_name, status="pending"))
+    db.commit()
+    return post
+
+
+def _publish(post, platform_names=("dev.to", "hashnode")):
+    canonical_urls = {platform_name: f"https://blog.example.com/{post.id}" for platform_name in platform_names}
+    task_ids = {platform_name: f"task-{platform_name}" for platform_name in platform_names}
+    return tasks.publish_post_task.apply(
+        args=(post.author_id, post.id, canonical_urls), kwargs={"platform_task_ids": task_ids}
+    ).get()
+
+
+def _statuses(db, post):
+    db.expire_all()
+    rows = db.query(models.PublishedPost).filter_by(original_post_id=post.id)
+    return {row.platform_name: row.status for row in rows}, db.get(models.Post, post.id).publish_status
+
+
+def test_batch_publishes_every_platform_in_one_task(platforms, post, db):
+    result = _publish(post)
+
+    assert sorted(platforms.sent) == ["dev.to", "hashnode"]
+    assert result["status"] == "published"
+    assert result["deferred"] == []
+    assert _statuses(db, post) == ({"dev.to": "success", "hashnode": "success"}, "published")
+    assert platforms.reported["task-hashnode"]["post_url"] == "https://hashnode/1"
+    assert platforms.chords == []
+
+
+def test_unchanged_content_is_skipped(platforms, post, db):
+    _publish(post)
+    platforms.sent.clear()
+
+    result = _publish(post)
+
+    assert platforms.sent == []
+    assert all(platform_result["skipped"] for platform_result in result["platforms"].values())
+
+
+def test_platforms_that_must_wait_go_to_a_chord(platforms, post, db):
+    platforms.rate_limited.add("hashnode")
+    platforms.errors["dev.to"] = httpx.ConnectError("refused")
+
+    result = _publish(post)
+
+    assert result["status"] == "publishing"
+    assert result["deferred"] == ["dev.to", "hashnode"]
+    (retries, callback), = platforms.chords
+    assert sorted(retry.args[2] for retry in retries) == ["dev.to", "hashnode"]
+    # Each retry keeps the task id the API handed out for its platform
+    assert sorted(retry.options["task_id"] for retry in retries) == ["task-dev.to", "task-hashnode"]
+    assert callback.task == "tasks.update_post_publish_status_task"
+    assert _statuses(db, post) == ({"dev.to": "pending", "hashnode": "pending"}, "publishing")
+
+
+def test_non_retryable_error_fails_only_that_platform(platforms, post, db):
+    request = httpx.Request("POST", "https://dev.to/api/articles")
+    platforms.errors["dev.to"] = httpx.HTTPStatusError("401", request=request, response=httpx.Response(401, request=request))
+
+    result = _publish(post)
+
+    assert result["status"] == "partial"
+    assert _statuses(db, post) == ({"dev.to": "failed", "hashnode": "success"}, "partial")
+    assert db.query(models.DeadLetter).one().platform_name == "dev.to"
+
+
+def test_crash_fails_unfinished_platforms_only(platforms, post, db):
+    platforms.rate_limited.add("hashnode")
+    platforms.chord_error = RuntimeError("broker down")
+
+    result = _publish(post)
+
+    assert result["status"] == "error"
+    # dev.to already has its result; hashnode was never handed to the chord
+    assert _statuses(db, post) == ({"dev.to": "success", "hashnode": "failed"}, "partial")
+    assert platforms.reported["task-hashnode"]["status"] == "error"
+
+
+def test_crash_leaves_rows_of_other_publishes_alone(platforms, post, db, monkeypatch):
+    platforms.rate_limited.add("hashnode")
+
+    def newer_publish_then_crash(retries):
+        def dispatch(callback):
+            # A newer request queued dev.to again before the chord could be sent
+            db.query(models.PublishedPost).filter_by(platform_name="dev.to").update({"status": "pending"})
+            db.commit()
+            raise RuntimeError("broker down")
+        return dispatch
+    monkeypatch.setattr(tasks, "chord", newer_publish_then_crash)
+
+    _publish(post)
+
+    statuses, _ = _statuses(db, post)
+    assert statuses == {"dev.to": "pending", "hashnode": "failed"}
+
+
+def test_crash_leaves_scheduled_rows_alone(platforms, post, db, monkeypatch):
+    def crash(*args, **kwargs):
+        raise RuntimeError("database went away")
+    monkeypatch.setattr(tasks.publish_context, "load_publish_context", crash)
+    # A newer request already scheduled hashnode for later
+    db.query(models.PublishedPost).filter_by(platform_name="hashnode").update({"status": "scheduled"})
+    db.commit()
+
+    _publish(post)
+
+    statuses, _ = _statuses(db, post)
+    assert statuses == {"dev.to": "failed", "hashnode": "scheduled"}
@@ -116,8 +116,6 @@ export default function PublishDialog({ isOpen, onClose, postId, postTitle }: Pu
         body: JSON.stringify(publishData),
       })
 
-      let usedDirectPublishing = false
-
       // If Celery fails, automatically fallback to direct publishing
       if (!response.ok) {
         console.log(`⚠️ Celery publishing failed (${response.status}), falling back to direct publishing...`)
@@ -134,7 +132,6 @@ export default function PublishDialog({ isOpen, onClose, postId, postTitle }: Pu
           },
           body: JSON.stringify(publishData),
         })
-        usedDirectPublishing = true
       }
 
       // Handle authentication errors
@@ -148,56 +145,40 @@ export default function PublishDialog({ isOpen, onClose, postId, postTitle }: Pu
       if (response.ok) {
         const result = await response.json()
         
-        if (usedDirectPublishing) {
-          // Handle direct publishing response
-          const successfulPlatforms = Object.entries(result.results || {})
-            .filter(([_, result]: [string, any]) => result.success)
-            .map(([platform, _]: [string, any]) => platform)
-          
-          const failedPlatforms = Object.entries(result.results || {})
-            .filter(([_, result]: [string, any]) => !result.success)
-            .map(([platform, result]: [string, any]) => ({ platform, error: result.error }))
-          
-          if (successfulPlatforms.length > 0) {
-            toast.success(
-              `✅ Successfully published to: ${successfulPlatforms.join(', ')}`,
-              { duration: 6000 }
-            )
-          }
-          
-          if (failedPlatforms.length > 0) {
-            failedPlatforms.forEach(({ platform, error }) => {
-              toast.error(`❌ Failed to publish to ${platform}: ${error}`, { duration: 8000 })
-            })
-          }
-          
-          if (result.success) {
-            toast.success(result.message, { duration: 4000 })
-            onClose() // Close dialog on success
-          }
-        } else {
-          // Handle Celery response (has task_ids)
-        if (result.task_ids) {
+        // Platforms whose content is unchanged since the last publish aren't queued again
+        if (result.skipped_platforms?.length) {
+          toast(`Already up to date on: ${result.skipped_platforms.join(', ')}`, {
+            icon: '✔️',
+            duration: 5000
+          })
+        }
+
+        // Both endpoints queue the publish and answer with a task id per queued platform;
+        // when every platform was skipped there is nothing to monitor
+        const queuedPlatforms: string[] = result.platforms_queued ?? Object.keys(result.task_ids ?? {})
+        if (result.task_ids && Object.keys(result.task_ids).length > 0) {
           setTaskIds(result.task_ids)
           setShowTaskMonitor(true)
         
-        toast.success(
-          `Publishing queued for ${selectedPlatforms.length} platform${selectedPlatforms.length > 1 ? 's' : ''}`,
-          { duration: 4000 }
-        )
+          toast.success(
+            `Publishing queued for ${queuedPlatforms.length} platform${queuedPlatforms.length > 1 ? 's' : ''}`,
+            { duration: 4000 }
+          )
         
-        toast(
-          'Publishing is happening in the background. You can monitor progress below or close this dialog.',
-          { 
-            icon: '⏳',
-            duration: 6000
-          }
-        )
-          } else {
-            // Fallback for other response formats
-            toast.success('Publishing completed successfully!')
-            onClose()
-          }
+          toast(
+            'Publishing is happening in the background. You can monitor progress below or close this dialog.',
+            { 
+              icon: '⏳',
+              duration: 6000
+            }
+          )
+        } else if (result.task_ids) {
+          // Every platform was skipped (already up to date); nothing was queued
+          onClose()
+        } else {
+          // Fallback for other response formats
+          toast.success('Publishing completed successfully!')
+          onClose()
         }
       } else {
         const errorData = await response.json()
@@ -82,16 +82,25 @@ export function useTaskStatus({
 
         retryCountRef.current++
 
-        const statusPromises = Object.entries(taskIds).map(async ([platform, taskId]) => {
-          try {
-            const response = await fetch(`http://localhost:8000/api/tasks/status/${taskId}`, {
-              headers: {
-                'Authorization': `Bearer ${localStorage.getItem('authToken')}`,
-              },
-            })
-            if (response.ok) {
-              const status: TaskStatus = await response.json()
-              
+        // One request (and one backend read) for every platform's task
+        let results: { platform: string, status: TaskStatus | null }[] = []
+        try {
+          const response = await fetch('http://localhost:8000/api/tasks/status/bulk', {
+            method: 'POST',
+            headers: {
+              'Authorization': `Bearer ${localStorage.getItem('authToken')}`,
+              'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ task_ids: Object.values(taskIds) }),
+          })
+          if (response.ok) {
+            const { tasks }: { tasks: Record<string, TaskStatus> } = await response.json()
+            results = Object.entries(taskIds).map(([platform, taskId]) => {
+              const status = tasks[taskId]
+              if (!status) {
+                return { platform, status: null }
+              }
+
               // Check for stale PENDING tasks
               if (status.status === 'PENDING') {
                 const taskElapsedTime = Date.now() - (taskStartTimesRef.current[platform] || Date.now())
@@ -111,34 +120,16 @@ export function useTaskStatus({
                   }
                 }
               }
-              
+
               return { platform, status }
-            } else if (response.status === 404) {
-              // Task not found - probably Celery not running or task expired
-              console.warn(`Task ${taskId} not found (404) - Celery may not be running`)
-              return { 
-                platform, 
-                status: {
-                  task_id: taskId,
-                  status: 'FAILURE',
-                  result: null,
-                  ready: true,
-                  successful: false,
-                  failed: true,
-                  error: 'Task not found - Celery may not be running or task expired'
-                }
-              }
-            } else {
-              console.error(`Failed to fetch status for task ${taskId}: ${response.status}`)
-              return { platform, status: null }
-            }
-          } catch (error) {
-            console.error(`Error fetching status for task ${taskId}:`, error)
-            return { platform, status: null }
+            })
+          } else {
+            console.error(`Failed to fetch task statuses: ${response.status}`)
           }
-        })
+        } catch (error) {
+          console.error('Error fetching task statuses:', error)
+        }
 
-        const results = await Promise.all(statusPromises)
         const newStatuses: Record<string, TaskStatus> = {}
 
         results.forEach(({ platform, status }) => {